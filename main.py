@@ -1,5 +1,4 @@
 import decky
-import dataclasses
 import os
 import sys
 import asyncio
@@ -23,12 +22,30 @@ add_plugin_to_path()
 
 # pylint: disable=wrong-import-order, wrong-import-position
 # ruff: noqa: E402
+from py_modules.bulk_hashing import (
+    BulkFileHasher,
+    BulkHashProgress,
+    FileHashRequest,
+)
 from py_modules.db.dao import Dao
+from py_modules.db.executor import DbExecutor
 from py_modules.db.migration import DbMigration
-from py_modules.db.sqlite_db import SqlLiteDb
-from py_modules.files import Files
+from py_modules.db.query_metrics import QueryMetrics
+from py_modules.db.sqlite_db import PragmaProfile, SqlLiteDb
+from py_modules.file_hash_cache import FileHashCache
+from py_modules.files import (
+    CHUNK_SIZE,
+    FINGERPRINT_REGION_COUNT,
+    FINGERPRINT_REGION_SIZE,
+    SHA256,
+    Files,
+)
+from py_modules.game_file_scanner import GameFileScanner
 from py_modules.games import Games
 from py_modules.helpers import parse_date
+from py_modules.schemas.common import ChecksumAlgorithm, StoredChecksumAlgorithm
+from py_modules.schemas.serializer import to_camel_case_response
+from py_modules.session_journal import SessionJournal
 from py_modules.statistics import Statistics
 from py_modules.time_tracking import TimeTracking
 from py_modules.schemas.request import (
@@ -36,100 +53,121 @@ from py_modules.schemas.request import (
     AddTimeDict,
     ApplyManualTimeCorrectionDTO,
     DailyStatisticsForPeriodDict,
+    FileHashRequestDict,
     GetFileSHA256DTO,
+    GetGameSessionsDict,
     GetGameDTO,
     RemoveAllGameChecksumsDTO,
     RemoveGameChecksumDTO,
+    ScanGameFilesDict,
+    SessionEndDict,
+    SessionHeartbeatDict,
+    SessionStartDict,
 )
 from py_modules.dto.save_game_checksum import AddGameChecksumDTO
+from py_modules.dto.scan_game_files import ScanGameFilesDTO
 from py_modules.dto.statistics.daily_statistics_for_period import (
     DailyStatisticsForPeriodDTO,
 )
+from py_modules.dto.statistics.get_game_sessions import GetGameSessionsDTO
 from py_modules.dto.time.add_time import AddTimeDTO
+from py_modules.dto.time.session import (
+    SessionEndDTO,
+    SessionHeartbeatDTO,
+    SessionStartDTO,
+)
 
 
 # pylint: enable=wrong-import-order, wrong-import-position
 
 # autopep8: on
 
-import re
-
-
-def to_camel_case(snake_str):
-    """
-    Converts a snake_case string to camelCase.
-
-    _leading_underscores are removed.
-    For example: "__my_string" -> "myString"
-    """
-    # Use a regex to find all occurrences of an underscore followed by a letter
-    # and replace it with the uppercase version of that letter.
-    # The lambda function m.group(1).upper() takes the matched group (the letter)
-    # and converts it to uppercase.
-    # Example: for "user_id", it finds "_i" and replaces it with "I".
-    camel_string = re.sub(r"_([a-zA-Z0-9])", lambda m: m.group(1).upper(), snake_str)
-
-    # Remove any leading underscores that might remain if the string started with them
-    return camel_string.lstrip("_")
-
 
-def convert_keys_to_camel_case(data):
-    """
-    Recursively converts all keys in a dictionary or a list of dictionaries
-    from snake_case to camelCase.
-
-    Args:
-        data: A dict, list, or other py_modules object.
-
-    Returns:
-        A new object with all dictionary keys converted to camelCase.
-        Non-dict and non-list items are returned as is.
-    """
-    if isinstance(data, dict):
-        # It's a dictionary, process its keys and values
-        new_dict = {}
-        for key, value in data.items():
-            # Convert the key to camelCase
-            new_key = to_camel_case(key)
-            # Recursively call the function on the value
-            new_dict[new_key] = convert_keys_to_camel_case(value)
-        return new_dict
-
-    elif isinstance(data, list):
-        # It's a list, process each item in the list
-        return [convert_keys_to_camel_case(item) for item in data]
-
-    else:
-        # It's a primitive type (str, int, etc.), return it as is
-        return data
+# 5 minutes
+WAL_CHECKPOINT_INTERVAL_S = 5 * 60
+SESSION_JOURNAL_FSYNC_INTERVAL_S = 5.0
+SLOW_QUERY_THRESHOLD_MS = 100.0
+FILES_SHA256_BULK_PROGRESS_EVENT = "files_sha256_bulk_progress"
+GAME_FILES_SCAN_PROGRESS_EVENT = "game_files_scan_progress"
 
 
 class Plugin:
-    files: Files = Files()
+    db: SqlLiteDb
+    db_executor: DbExecutor
+    query_metrics: QueryMetrics
+    session_journal: SessionJournal
+    bulk_file_hasher: BulkFileHasher
+    game_file_scanner: GameFileScanner
+    files: Files
     games: Games
     statistics: Statistics
     time_tracking: TimeTracking
+    _wal_checkpoint_task: asyncio.Task | None = None
 
     async def _main(self):
         try:
-            db = SqlLiteDb(f"{data_dir}/storage.db")
-            migration = DbMigration(db)
-            migration.migrate()
+            self.db = SqlLiteDb(f"{data_dir}/storage.db", pragmas=PragmaProfile())
+            self.db_executor = DbExecutor()
+            migration = DbMigration(self.db)
+            await self.db_executor.write(migration.migrate)
 
-            dao = Dao(db)
+            self.query_metrics = QueryMetrics(
+                slow_query_threshold_ms=SLOW_QUERY_THRESHOLD_MS, logger=decky.logger
+            )
+            dao = Dao(self.db, self.query_metrics)
 
+            self.files = Files(FileHashCache(f"{data_dir}/file_hash_cache.db"))
             self.games = Games(dao)
             self.statistics = Statistics(dao)
-            self.time_tracking = TimeTracking(dao)
+            self.bulk_file_hasher = BulkFileHasher(
+                self.files,
+                lambda dtos: self.db_executor.write(
+                    self.games.save_game_checksum_bulk, dtos
+                ),
+            )
+            self.game_file_scanner = GameFileScanner(
+                self.files,
+                lambda dtos: self.db_executor.write(
+                    self.games.replace_game_checksum_bulk, dtos
+                ),
+            )
+            self.session_journal = SessionJournal(
+                f"{data_dir}/sessions.journal",
+                fsync_interval_s=SESSION_JOURNAL_FSYNC_INTERVAL_S,
+            )
+            self.time_tracking = TimeTracking(dao, self.session_journal)
+
+            recovered = await self.db_executor.write(
+                self.time_tracking.recover_sessions
+            )
+
+            if recovered:
+                decky.logger.info("Recovered %d unfinished session(s)", recovered)
+
+            self._wal_checkpoint_task = asyncio.create_task(
+                self._checkpoint_wal_periodically()
+            )
         except Exception as e:
             decky.logger.exception("[main] Unhandled exception: %s", e)
             raise e
 
+    async def _checkpoint_wal_periodically(self):
+        while True:
+            await asyncio.sleep(WAL_CHECKPOINT_INTERVAL_S)
+
+            try:
+                await self.db_executor.write(self.db.checkpoint)
+            except Exception as e:
+                decky.logger.exception(
+                    "[checkpoint_wal_periodically] Unhandled exception: %s", e
+                )
+
     async def add_time(self, dto_dict: AddTimeDict):
         try:
             dto = AddTimeDTO.from_dict(dto_dict)
 
-            self.time_tracking.add_time(
+            await self.db_executor.write(
+                self.time_tracking.add_time,
                 dto.started_at,
                 dto.ended_at,
                 dto.game_id,
@@ -139,19 +177,63 @@ class Plugin:
             decky.logger.exception("[add_time] Unhandled exception: %s", e)
             raise e
 
+    async def add_time_bulk(self, dtos_list: List[AddTimeDict]):
+        try:
+            dtos = [AddTimeDTO.from_dict(dto_dict) for dto_dict in dtos_list]
+
+            await self.db_executor.write(self.time_tracking.add_time_bulk, dtos)
+        except Exception as e:
+            decky.logger.exception("[add_time_bulk] Unhandled exception: %s", e)
+            raise e
+
+    async def session_start(self, dto_dict: SessionStartDict) -> bool:
+        try:
+            dto = SessionStartDTO.from_dict(dto_dict)
+
+            return await asyncio.to_thread(
+                self.time_tracking.start_session,
+                dto.game_id,
+                dto.game_name,
+                dto.started_at,
+            )
+        except Exception as e:
+            decky.logger.exception("[session_start] Unhandled exception: %s", e)
+            raise e
+
+    async def session_heartbeat(self, dto_dict: SessionHeartbeatDict) -> bool:
+        try:
+            dto = SessionHeartbeatDTO.from_dict(dto_dict)
+
+            return await asyncio.to_thread(
+                self.time_tracking.heartbeat_session, dto.game_id, dto.at
+            )
+        except Exception as e:
+            decky.logger.exception("[session_heartbeat] Unhandled exception: %s", e)
+            raise e
+
+    async def session_end(self, dto_dict: SessionEndDict) -> bool:
+        try:
+            dto = SessionEndDTO.from_dict(dto_dict)
+
+            return await self.db_executor.write(
+                self.time_tracking.end_session, dto.game_id, dto.ended_at
+            )
+        except Exception as e:
+            decky.logger.exception("[session_end] Unhandled exception: %s", e)
+            raise e
+
     async def daily_statistics_for_period(self, dto_dict: DailyStatisticsForPeriodDict):
         try:
             dto = DailyStatisticsForPeriodDTO.from_dict(dto_dict)
 
-            return convert_keys_to_camel_case(
-                dataclasses.asdict(
-                    self.statistics.daily_statistics_for_period(
-                        parse_date(dto.start_date),
-                        parse_date(dto.end_date),
-                        dto.game_id,
-                    )
-                )
+            statistics = await self.db_executor.read(
+                self.statistics.daily_statistics_for_period,
+                parse_date(dto.start_date),
+                parse_date(dto.end_date),
+                dto.game_id,
             )
+
+            return to_camel_case_response(statistics)
         except Exception as e:
             decky.logger.exception(
                 "[daily_statistics_for_period] Unhandled exception: %s", e
@@ -160,8 +242,10 @@ class Plugin:
 
     async def statistics_for_last_two_weeks(self):
         try:
-            return convert_keys_to_camel_case(
-                self.statistics.get_statistics_for_last_two_weeks()
+            return to_camel_case_response(
+                await self.db_executor.read(
+                    self.statistics.get_statistics_for_last_two_weeks
+                )
             )
 
         except Exception as e:
@@ -172,8 +256,8 @@ class Plugin:
 
     async def fetch_playtime_information(self):
         try:
-            return convert_keys_to_camel_case(
-                self.statistics.fetch_playtime_information()
+            return to_camel_case_response(
+                await self.db_executor.read(self.statistics.fetch_playtime_information)
             )
 
         except Exception as e:
@@ -184,8 +268,8 @@ class Plugin:
 
     async def per_game_overall_statistics(self):
         try:
-            return convert_keys_to_camel_case(
-                self.statistics.per_game_overall_statistic()
+            return to_camel_case_response(
+                await self.db_executor.read(self.statistics.per_game_overall_statistic)
             )
         except Exception as e:
             decky.logger.exception(
@@ -193,23 +277,46 @@ class Plugin:
             )
             raise e
 
-    async def short_per_game_overall_statistics(self):
+    async def per_game_overall_statistics_short(self):
         try:
-            return convert_keys_to_camel_case(
-                self.statistics.per_game_overall_statistic()
+            return to_camel_case_response(
+                await self.db_executor.read(
+                    self.statistics.per_game_overall_statistic_short
+                )
             )
         except Exception as e:
             decky.logger.exception(
-                "[per_game_overall_statistics] Unhandled exception: %s", e
+                "[per_game_overall_statistics_short] Unhandled exception: %s", e
             )
             raise e
 
+    async def short_per_game_overall_statistics(self):
+        return await self.per_game_overall_statistics_short()
+
+    async def get_game_sessions(self, dto_dict: GetGameSessionsDict):
+        try:
+            dto = GetGameSessionsDTO.from_dict(dto_dict)
+
+            page = await self.db_executor.read(
+                self.statistics.get_game_sessions,
+                dto.game_id,
+                dto.cursor_key(),
+                dto.limit,
+            )
+
+            return to_camel_case_response(page)
+        except Exception as e:
+            decky.logger.exception("[get_game_sessions] Unhandled exception: %s", e)
+            raise e
+
     async def apply_manual_time_correction(
         self, list_of_game_stats: ApplyManualTimeCorrectionDTO
     ):
         try:
-            return self.time_tracking.apply_manual_time_for_games(
-                list_of_game_stats=list_of_game_stats, source="manually-changed"
+            return await self.db_executor.write(
+                self.time_tracking.apply_manual_time_for_games,
+                list_of_game_stats=list_of_game_stats,
+                source="manually-changed",
             )
         except Exception as e:
             decky.logger.exception(
@@ -219,12 +326,12 @@ class Plugin:
 
     async def get_game(self, game_id: GetGameDTO):
         try:
-            game_by_id = self.games.get_by_id(game_id)
+            game_by_id = await self.db_executor.read(self.games.get_by_id, game_id)
 
             if game_by_id is None:
                 return None
 
-            return convert_keys_to_camel_case(dataclasses.asdict(game_by_id))
+            return to_camel_case_response(game_by_id)
         except Exception as e:
             decky.logger.exception("[get_game] Unhandled exception: %s", e)
             raise e
@@ -242,9 +349,100 @@ class Plugin:
             decky.logger.exception("[get_file_sha256] Unhandled exception: %s", e)
             raise e
 
+    async def get_file_digest(
+        self,
+        path: GetFileSHA256DTO,
+        algorithm: ChecksumAlgorithm = SHA256,
+        chunk_size: int = CHUNK_SIZE,
+    ):
+        try:
+            return await asyncio.to_thread(
+                self.files.get_file_digest, path, algorithm, chunk_size
+            )
+        except Exception as e:
+            decky.logger.exception("[get_file_digest] Unhandled exception: %s", e)
+            raise e
+
+    async def get_file_fingerprint(
+        self,
+        path: GetFileSHA256DTO,
+        region_count: int = FINGERPRINT_REGION_COUNT,
+        region_size: int = FINGERPRINT_REGION_SIZE,
+    ):
+        try:
+            return await asyncio.to_thread(
+                self.files.get_file_fingerprint, path, region_count, region_size
+            )
+        except Exception as e:
+            decky.logger.exception("[get_file_fingerprint] Unhandled exception: %s", e)
+            raise e
+
+    async def get_files_sha256_bulk(
+        self,
+        files: List[FileHashRequestDict],
+        algorithm: StoredChecksumAlgorithm = SHA256,
+        chunk_size: int | None = None,
+        region_count: int = FINGERPRINT_REGION_COUNT,
+        job_id: str | None = None,
+    ):
+        try:
+            summary = await self.bulk_file_hasher.hash_files(
+                [FileHashRequest(file["game_id"], file["path"]) for file in files],
+                algorithm,
+                chunk_size,
+                on_progress=self._emit_files_sha256_bulk_progress,
+                region_count=region_count,
+                job_id=job_id,
+            )
+
+            return to_camel_case_response(summary)
+        except Exception as e:
+            decky.logger.exception("[get_files_sha256_bulk] Unhandled exception: %s", e)
+            raise e
+
+    async def cancel_files_sha256_bulk(self, job_id: str | None = None):
+        self.bulk_file_hasher.cancel(job_id)
+
+    async def _emit_files_sha256_bulk_progress(self, progress: BulkHashProgress):
+        await decky.emit(
+            FILES_SHA256_BULK_PROGRESS_EVENT, to_camel_case_response(progress)
+        )
+
+    async def scan_game_files(self, dto_dict: ScanGameFilesDict):
+        try:
+            dto = ScanGameFilesDTO.from_dict(dto_dict)
+
+            summary = await self.game_file_scanner.scan(
+                dto.roots,
+                dto.game_ids_by_path,
+                dto.extensions,
+                dto.min_size,
+                dto.max_size,
+                dto.algorithm,
+                dto.chunk_size,
+                dto.region_count,
+                on_progress=self._emit_game_files_scan_progress,
+                job_id=dto.job_id,
+            )
+
+            return to_camel_case_response(summary)
+        except Exception as e:
+            decky.logger.exception("[scan_game_files] Unhandled exception: %s", e)
+            raise e
+
+    async def cancel_game_files_scan(self, job_id: str | None = None):
+        self.game_file_scanner.cancel(job_id)
+
+    async def _emit_game_files_scan_progress(self, progress: BulkHashProgress):
+        await decky.emit(
+            GAME_FILES_SCAN_PROGRESS_EVENT, to_camel_case_response(progress)
+        )
+
     async def get_games_dictionary(self):
         try:
-            return convert_keys_to_camel_case(self.games.get_dictionary())
+            return to_camel_case_response(
+                await self.db_executor.read(self.games.get_dictionary)
+            )
         except Exception as e:
             decky.logger.exception("[get_games_dictionary] Unhandled exception: %s", e)
             raise e
@@ -253,13 +451,15 @@ class Plugin:
         try:
             dto = AddGameChecksumDTO.from_dict(dto_dict)
 
-            return self.games.save_game_checksum(
+            return await self.db_executor.write(
+                self.games.save_game_checksum,
                 dto.game_id,
                 dto.checksum,
                 dto.algorithm,
                 dto.chunk_size,
                 dto.created_at,
                 dto.updated_at,
+                dto.region_count,
             )
         except Exception as e:
             decky.logger.exception("[save_game_checksum] Unhandled exception: %s", e)
@@ -269,7 +469,9 @@ class Plugin:
         try:
             dtos = [AddGameChecksumDTO.from_dict(dto_dict) for dto_dict in dtos_list]
 
-            return self.games.save_game_checksum_bulk(dtos)
+            return await self.db_executor.write(
+                self.games.save_game_checksum_bulk, dtos
+            )
         except Exception as e:
             decky.logger.exception(
                 "[save_game_checksum_bulk] Unhandled exception: %s", e
@@ -278,8 +480,10 @@ class Plugin:
 
     async def remove_game_checksum(self, dto: RemoveGameChecksumDTO):
         try:
-            return convert_keys_to_camel_case(
-                self.games.remove_game_checksum(dto["game_id"], dto["checksum"])
+            return to_camel_case_response(
+                await self.db_executor.write(
+                    self.games.remove_game_checksum, dto["game_id"], dto["checksum"]
+                )
             )
         except Exception as e:
             decky.logger.exception("[remove_game_checksum] Unhandled exception: %s", e)
@@ -287,8 +491,10 @@ class Plugin:
 
     async def remove_all_game_checksum(self, game_id: RemoveAllGameChecksumsDTO):
         try:
-            return convert_keys_to_camel_case(
-                self.games.remove_all_game_checksums(game_id)
+            return to_camel_case_response(
+                await self.db_executor.write(
+                    self.games.remove_all_game_checksums, game_id
+                )
             )
         except Exception as e:
             decky.logger.exception("[remove_game_checksum] Unhandled exception: %s", e)
@@ -296,7 +502,7 @@ class Plugin:
 
     async def remove_all_checksums(self):
         try:
-            return self.games.remove_all_checksums()
+            return await self.db_executor.write(self.games.remove_all_checksums)
         except Exception as e:
             decky.logger.exception("[remove_all_checksums] Unhandled exception: %s", e)
             raise e
@@ -305,7 +511,9 @@ class Plugin:
         self,
     ):
         try:
-            return convert_keys_to_camel_case(self.games.get_games_checksum())
+            return to_camel_case_response(
+                await self.db_executor.read(self.games.get_games_checksum)
+            )
         except Exception as e:
             decky.logger.exception("[get_games_checksum] Unhandled exception: %s", e)
             raise e
@@ -314,8 +522,10 @@ class Plugin:
         self, child_game_id: str, parent_game_id: str
     ):
         try:
-            return self.games.link_game_to_game_with_checksum(
-                child_game_id, parent_game_id
+            return await self.db_executor.write(
+                self.games.link_game_to_game_with_checksum,
+                child_game_id,
+                parent_game_id,
             )
         except Exception as e:
             decky.logger.exception(
@@ -323,6 +533,22 @@ class Plugin:
             )
             raise e
 
+    async def get_statistics_cache_metrics(self):
+        try:
+            return to_camel_case_response(self.statistics.cache.metrics())
+        except Exception as e:
+            decky.logger.exception(
+                "[get_statistics_cache_metrics] Unhandled exception: %s", e
+            )
+            raise e
+
+    async def get_db_metrics(self):
+        try:
+            return to_camel_case_response(self.query_metrics.snapshot())
+        except Exception as e:
+            decky.logger.exception("[get_db_metrics] Unhandled exception: %s", e)
+            raise e
+
     async def get_decky_home(self):
         try:
             return decky_user_home
@@ -334,6 +560,21 @@ class Plugin:
 
 
     async def _unload(self):
+        if self._wal_checkpoint_task is not None:
+            self._wal_checkpoint_task.cancel()
+
+        if hasattr(self, "db_executor"):
+            self.db_executor.shutdown()
+
+        if hasattr(self, "session_journal"):
+            self.session_journal.close()
+
+        if hasattr(self, "files") and self.files.hash_cache is not None:
+            self.files.hash_cache.close()
+
+        if hasattr(self, "db"):
+            self.db.close()
+
         decky.logger.info("Goodnight, World!")
 
     async def _uninstall(self):
@@ -0,0 +1,165 @@
+"""
+Seeded generator of a synthetic play history, shared by the benchmarks.
+
+The same `PlayHistoryProfile` always produces the same games, sessions,
+checksums and manual corrections, relative to `profile.end`.
+"""
+
+import itertools
+import math
+import random
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Tuple
+
+from py_modules.db.dao import Dao
+
+# 16MB, default chunk size of `Files.get_file_sha256`
+CHECKSUM_CHUNK_SIZE = 16 * 1024 * 1024
+MANUAL_CORRECTION_SOURCE = "manually-changed"
+# NOTE: Sessions are saved per batch of days, one transaction each
+DAYS_PER_BATCH = 30
+MIN_SESSION_S = 60
+MAX_SESSION_S = 6 * 60 * 60
+MEDIAN_SESSION_S = 45 * 60
+
+
+@dataclass(frozen=True)
+class PlayHistoryProfile:
+    games: int = 300
+    years: int = 3
+    sessions_per_day: float = 3.0
+    # Groups of `cluster_size` games sharing one checksum, e.g. the same
+    # executable added as several non-Steam shortcuts
+    alias_clusters: int = 30
+    cluster_size: int = 3
+    # Games without an alias get a checksum of their own with this probability
+    checksum_ratio: float = 0.5
+    manual_corrections: int = 20
+    seed: int = 42
+    end: date = field(default_factory=date.today)
+
+
+@dataclass
+class GeneratedPlayHistory:
+    game_ids: List[str]
+    start: date
+    end: date
+    sessions: int
+    checksums: int
+    manual_corrections: int
+
+
+def generate_play_history(
+    dao: Dao, profile: PlayHistoryProfile
+) -> GeneratedPlayHistory:
+    """
+    Saves the history through `Dao`, so `overall_time`, `play_time_daily` and
+    `game_component` are maintained exactly like for real sessions.
+    """
+    if profile.cluster_size * profile.alias_clusters > profile.games:
+        raise ValueError("alias clusters need more games than the profile has")
+
+    rnd = random.Random(profile.seed)
+    game_ids = [str(1_000_000 + index) for index in range(profile.games)]
+    game_names = {game_id: f"Game {game_id}" for game_id in game_ids}
+
+    # NOTE: Zipf-like popularity, a few games get most of the play time
+    cum_weights = list(
+        itertools.accumulate(1 / (rank + 1) for rank in range(profile.games))
+    )
+    popularity = rnd.sample(game_ids, len(game_ids))
+
+    start = profile.end - timedelta(days=round(365.25 * profile.years))
+    days = (profile.end - start).days + 1
+    sessions = 0
+
+    dao.save_play_time_bulk(game_names, [])
+
+    for batch_start in range(0, days, DAYS_PER_BATCH):
+        play_times: List[Tuple[datetime, int, str]] = []
+
+        for day_offset in range(batch_start, min(batch_start + DAYS_PER_BATCH, days)):
+            day_start = datetime.combine(start + timedelta(days=day_offset), time.min)
+            count = _poisson(rnd, profile.sessions_per_day)
+
+            for game_id in rnd.choices(popularity, cum_weights=cum_weights, k=count):
+                duration = _session_duration(rnd)
+                started_at = day_start + timedelta(
+                    seconds=rnd.randrange(24 * 60 * 60 - duration)
+                )
+                play_times.append((started_at, duration, game_id))
+
+        if play_times:
+            dao.save_play_time_bulk({}, play_times)
+            sessions += len(play_times)
+
+    checksums = _checksums(rnd, game_ids, profile)
+    dao.save_game_checksum_bulk(checksums)
+
+    corrected_games = rnd.sample(game_ids, profile.manual_corrections)
+    corrected_at = datetime.combine(profile.end, time(12, 0))
+
+    for game_id in corrected_games:
+        dao.apply_manual_time_for_game(
+            corrected_at - timedelta(days=rnd.randrange(days)),
+            game_id,
+            game_names[game_id],
+            rnd.randrange(1, 500) * 60 * 60,
+            MANUAL_CORRECTION_SOURCE,
+        )
+
+    return GeneratedPlayHistory(
+        game_ids=game_ids,
+        start=start,
+        end=profile.end,
+        sessions=sessions,
+        checksums=len(checksums),
+        manual_corrections=len(corrected_games),
+    )
+
+
+def _checksums(
+    rnd: random.Random, game_ids: List[str], profile: PlayHistoryProfile
+) -> List[Tuple[str, str, str, int, None, None, None]]:
+    shuffled = rnd.sample(game_ids, len(game_ids))
+    clustered = profile.alias_clusters * profile.cluster_size
+    checksums_by_game: Dict[str, str] = {}
+
+    for cluster_start in range(0, clustered, profile.cluster_size):
+        checksum = _random_checksum(rnd)
+
+        for game_id in shuffled[cluster_start : cluster_start + profile.cluster_size]:
+            checksums_by_game[game_id] = checksum
+
+    for game_id in shuffled[clustered:]:
+        if rnd.random() < profile.checksum_ratio:
+            checksums_by_game[game_id] = _random_checksum(rnd)
+
+    return [
+        (game_id, checksum, "SHA256", CHECKSUM_CHUNK_SIZE, None, None, None)
+        for game_id, checksum in checksums_by_game.items()
+    ]
+
+
+def _random_checksum(rnd: random.Random) -> str:
+    return f"{rnd.getrandbits(256):064x}"
+
+
+def _session_duration(rnd: random.Random) -> int:
+    duration = int(rnd.lognormvariate(math.log(MEDIAN_SESSION_S), 0.8))
+
+    return max(MIN_SESSION_S, min(duration, MAX_SESSION_S))
+
+
+def _poisson(rnd: random.Random, mean: float) -> int:
+    # NOTE: Knuth's algorithm, fine for the small means used here
+    limit = math.exp(-mean)
+    count = 0
+    product = rnd.random()
+
+    while product > limit:
+        count += 1
+        product *= rnd.random()
+
+    return count
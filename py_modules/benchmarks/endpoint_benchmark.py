@@ -0,0 +1,297 @@
+"""
+Times the read endpoints of `Plugin` against a seeded synthetic play history
+and writes the results as JSON, so runs can be compared across commits.
+
+`main.py` needs `decky`, which only exists inside Decky Loader, so every
+endpoint is replayed the same way `Plugin` serves it: DTO parsing, the
+`DbExecutor` read pool, `Statistics`/`Games` and `to_camel_case_response`.
+
+`cold` runs start with an empty `ResponseCache`, `warm` runs are served from
+it like repeated requests without writes in between.
+
+Run from the repository root:
+    python -m py_modules.benchmarks.endpoint_benchmark --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import tempfile
+import time
+from dataclasses import asdict
+from datetime import date, datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from py_modules.benchmarks.data_generator import (
+    PlayHistoryProfile,
+    generate_play_history,
+)
+from py_modules.db.dao import Dao
+from py_modules.db.executor import DbExecutor
+from py_modules.db.migration import DbMigration
+from py_modules.db.sqlite_db import PragmaProfile, SqlLiteDb
+from py_modules.dto.statistics.daily_statistics_for_period import (
+    DailyStatisticsForPeriodDTO,
+)
+from py_modules.games import Games
+from py_modules.helpers import DATE_FORMAT, end_of_week, parse_date, start_of_week
+from py_modules.response_cache import ResponseCache
+from py_modules.schemas.serializer import to_camel_case_response
+from py_modules.statistics import Statistics
+
+COLD_ITERATIONS = 20
+WARM_ITERATIONS = 200
+
+Endpoint = Callable[[], Awaitable[Any]]
+
+
+class EndpointReplay:
+    def __init__(self, db: SqlLiteDb, executor: DbExecutor) -> None:
+        dao = Dao(db)
+        self.executor = executor
+        self.statistics = Statistics(dao)
+        self.games = Games(dao)
+
+    async def daily_statistics_for_period(self, start: date, end: date):
+        dto = DailyStatisticsForPeriodDTO.from_dict(
+            {
+                "start_date": start.strftime(DATE_FORMAT),
+                "end_date": end.strftime(DATE_FORMAT),
+            }
+        )
+
+        return to_camel_case_response(
+            await self.executor.read(
+                self.statistics.daily_statistics_for_period,
+                parse_date(dto.start_date),
+                parse_date(dto.end_date),
+                dto.game_id,
+            )
+        )
+
+    async def per_game_overall_statistics(self):
+        return to_camel_case_response(
+            await self.executor.read(self.statistics.per_game_overall_statistic)
+        )
+
+    async def fetch_playtime_information(self):
+        return to_camel_case_response(
+            await self.executor.read(self.statistics.fetch_playtime_information)
+        )
+
+    async def statistics_for_last_two_weeks(self):
+        return to_camel_case_response(
+            await self.executor.read(self.statistics.get_statistics_for_last_two_weeks)
+        )
+
+    async def get_games_dictionary(self):
+        return to_camel_case_response(
+            await self.executor.read(self.games.get_dictionary)
+        )
+
+
+def _endpoints(replay: EndpointReplay, end: date) -> Dict[str, Endpoint]:
+    week = (start_of_week(end), end_of_week(end))
+    month_start = end.replace(day=1)
+    month = (
+        month_start,
+        (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1),
+    )
+    year = (end.replace(month=1, day=1), end.replace(month=12, day=31))
+
+    return {
+        "daily_statistics_for_period[week]": lambda: (
+            replay.daily_statistics_for_period(*week)
+        ),
+        "daily_statistics_for_period[month]": lambda: (
+            replay.daily_statistics_for_period(*month)
+        ),
+        "daily_statistics_for_period[year]": lambda: (
+            replay.daily_statistics_for_period(*year)
+        ),
+        "per_game_overall_statistics": replay.per_game_overall_statistics,
+        "fetch_playtime_information": replay.fetch_playtime_information,
+        "statistics_for_last_two_weeks": replay.statistics_for_last_two_weeks,
+        "get_games_dictionary": replay.get_games_dictionary,
+    }
+
+
+async def _measure(
+    endpoint: Endpoint, iterations: int, before_each: Callable[[], None]
+) -> Tuple[List[float], int]:
+    timings = []
+    response_size = 0
+
+    for _ in range(iterations):
+        before_each()
+        started = time.perf_counter()
+        response = await endpoint()
+        timings.append(time.perf_counter() - started)
+
+    response_size = len(json.dumps(response))
+
+    return timings, response_size
+
+
+def _summary(timings: List[float]) -> Dict[str, float]:
+    values = sorted(timings)
+
+    def percentile(p: float) -> float:
+        return values[min(int(len(values) * p), len(values) - 1)] * 1000
+
+    return {
+        "iterations": len(values),
+        "min_ms": values[0] * 1000,
+        "p50_ms": percentile(0.5),
+        "p95_ms": percentile(0.95),
+        "max_ms": values[-1] * 1000,
+        "mean_ms": sum(values) / len(values) * 1000,
+    }
+
+
+def _git_revision() -> Dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = bool(
+            subprocess.run(
+                ["git", "status", "--porcelain", "--untracked-files=no"],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout.strip()
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+    return {"commit": commit, "dirty": dirty}
+
+
+async def run(
+    profile: PlayHistoryProfile, cold_iterations: int, warm_iterations: int
+) -> Dict[str, Any]:
+    with tempfile.TemporaryDirectory() as directory:
+        db = SqlLiteDb(f"{directory}/storage.db", pragmas=PragmaProfile())
+        executor = DbExecutor()
+
+        try:
+            DbMigration(db).migrate()
+
+            generated_at = time.perf_counter()
+            history = generate_play_history(Dao(db), profile)
+            generation_s = time.perf_counter() - generated_at
+
+            replay = EndpointReplay(db, executor)
+            results = {}
+
+            def reset_cache() -> None:
+                replay.statistics.cache = ResponseCache()
+
+            for name, endpoint in _endpoints(replay, profile.end).items():
+                cold, response_size = await _measure(
+                    endpoint, cold_iterations, reset_cache
+                )
+                warm, _ = await _measure(endpoint, warm_iterations, lambda: None)
+                results[name] = {
+                    "response_bytes": response_size,
+                    "cold": _summary(cold),
+                    "warm": _summary(warm),
+                }
+
+            database_bytes = os.path.getsize(f"{directory}/storage.db")
+        finally:
+            executor.shutdown()
+            db.close()
+
+    profile_dict = asdict(profile)
+    profile_dict["end"] = profile.end.isoformat()
+
+    return {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        **_git_revision(),
+        "environment": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "machine": platform.machine(),
+        },
+        "profile": profile_dict,
+        "dataset": {
+            "games": len(history.game_ids),
+            "sessions": history.sessions,
+            "checksums": history.checksums,
+            "manual_corrections": history.manual_corrections,
+            "database_bytes": database_bytes,
+            "generation_s": generation_s,
+        },
+        "endpoints": results,
+    }
+
+
+def _print_table(report: Dict[str, Any]) -> None:
+    dataset = report["dataset"]
+    print(
+        f"{dataset['games']} games, {dataset['sessions']} sessions,"
+        f" {dataset['checksums']} checksums, commit {report['commit']}"
+    )
+    print(f"{'endpoint':<36} {'cold p50':>9} {'cold p95':>9} {'warm p50':>9}")
+
+    for name, result in report["endpoints"].items():
+        print(
+            f"{name:<36} {result['cold']['p50_ms']:>9.2f}"
+            f" {result['cold']['p95_ms']:>9.2f} {result['warm']['p50_ms']:>9.3f}"
+        )
+
+
+def main() -> None:
+    defaults = PlayHistoryProfile()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--games", type=int, default=defaults.games)
+    parser.add_argument("--years", type=int, default=defaults.years)
+    parser.add_argument(
+        "--sessions-per-day", type=float, default=defaults.sessions_per_day
+    )
+    parser.add_argument("--alias-clusters", type=int, default=defaults.alias_clusters)
+    parser.add_argument("--cluster-size", type=int, default=defaults.cluster_size)
+    parser.add_argument(
+        "--manual-corrections", type=int, default=defaults.manual_corrections
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument(
+        "--end",
+        type=date.fromisoformat,
+        default=defaults.end,
+        help="last day of the history, defaults to today",
+    )
+    parser.add_argument("--cold-iterations", type=int, default=COLD_ITERATIONS)
+    parser.add_argument("--warm-iterations", type=int, default=WARM_ITERATIONS)
+    parser.add_argument(
+        "--output", default="endpoint_benchmark.json", help="JSON result file"
+    )
+    args = parser.parse_args()
+
+    profile = PlayHistoryProfile(
+        games=args.games,
+        years=args.years,
+        sessions_per_day=args.sessions_per_day,
+        alias_clusters=args.alias_clusters,
+        cluster_size=args.cluster_size,
+        manual_corrections=args.manual_corrections,
+        seed=args.seed,
+        end=args.end,
+    )
+    report = asyncio.run(run(profile, args.cold_iterations, args.warm_iterations))
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    _print_table(report)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
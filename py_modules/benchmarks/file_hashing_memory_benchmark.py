@@ -0,0 +1,102 @@
+"""
+Compares peak memory of head/tail hashing through `f.read` copies with the
+`mmap` + `memoryview` path of `Files.get_file_digest`, with several files
+hashed in parallel like `get_files_sha256_bulk` does.
+
+Every variant runs in a fresh interpreter, so `ru_maxrss` is not shared.
+Python heap allocations are tracked separately with `tracemalloc`, because
+mapped file pages also count towards RSS while they are resident.
+
+Run from the repository root:
+    python -m py_modules.benchmarks.file_hashing_memory_benchmark
+"""
+
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+with patch.dict(
+    "os.environ", {"DECKY_PLUGIN_RUNTIME_DIR": os.environ.get("TMPDIR", "/tmp")}
+):
+    from py_modules.files import CHUNK_SIZE, Files
+
+WORKERS = 4
+FILE_SIZE = 3 * CHUNK_SIZE
+VARIANTS = ("read", "mmap")
+
+
+def _run_variant(variant: str, paths: list) -> dict:
+    files = Files()
+
+    if variant == "read":
+        patcher = patch("py_modules.files.mmap.mmap", side_effect=OSError("disabled"))
+        patcher.start()
+
+    baseline_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        digests = list(pool.map(files.get_file_sha256, paths))
+
+    _, traced_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "variant": variant,
+        "digests": digests,
+        "rss_growth_mib": (
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_kib
+        )
+        / 1024,
+        "python_heap_peak_mib": traced_peak / 1024 / 1024,
+    }
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+
+        for index in range(WORKERS):
+            path = os.path.join(directory, f"game-{index}.bin")
+
+            with open(path, "wb") as f:
+                for _ in range(FILE_SIZE // CHUNK_SIZE):
+                    f.write(os.urandom(CHUNK_SIZE))
+
+            paths.append(path)
+
+        results = [
+            json.loads(
+                subprocess.run(
+                    [sys.executable, "-m", __spec__.name, variant, *paths],
+                    check=True,
+                    capture_output=True,
+                    text=True,
+                ).stdout
+            )
+            for variant in VARIANTS
+        ]
+
+    assert results[0]["digests"] == results[1]["digests"]
+
+    print(f"{WORKERS} files of {FILE_SIZE // 1024 // 1024} MiB hashed in parallel")
+    print(f"{'variant':<8} {'peak RSS growth MiB':>20} {'Python heap peak MiB':>21}")
+
+    for result in results:
+        print(
+            f"{result['variant']:<8} {result['rss_growth_mib']:>20.1f}"
+            f" {result['python_heap_peak_mib']:>21.1f}"
+        )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in VARIANTS:
+        print(json.dumps(_run_variant(sys.argv[1], sys.argv[2:])))
+    else:
+        main()
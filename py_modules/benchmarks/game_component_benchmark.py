@@ -0,0 +1,176 @@
+"""
+Compares the recursive `ComponentLeaders` CTE with the `game_component` join.
+
+Run from the repository root:
+    python -m py_modules.benchmarks.game_component_benchmark
+"""
+
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from py_modules.db.dao import Dao
+from py_modules.db.game_components import rebuild_game_components
+from py_modules.db.migration import DbMigration
+from py_modules.db.sqlite_db import SqlLiteDb
+
+GAMES = 1_000
+CHECKSUM_LINKS = 5_000
+SESSIONS = 20_000
+CLUSTER_SIZE = 3
+CHECKSUMS_PER_CLUSTER = 8
+ITERATIONS = 5
+SEED = 42
+
+RECURSIVE_CTE_QUERY = """
+    WITH RECURSIVE
+    AliasPairs (id1, id2) AS (
+        SELECT DISTINCT gfc1.game_id, gfc2.game_id
+        FROM game_file_checksum gfc1
+        JOIN game_file_checksum gfc2
+          ON gfc1.checksum = gfc2.checksum AND gfc1.algorithm = gfc2.algorithm
+        WHERE gfc1.game_id < gfc2.game_id
+    ),
+    ComponentLeaders (game_id, leader_id) AS (
+        SELECT game_id, game_id FROM game_dict
+        UNION
+        SELECT ap.id2, cl.leader_id FROM ComponentLeaders cl JOIN AliasPairs ap ON cl.game_id = ap.id1
+        UNION
+        SELECT ap.id1, cl.leader_id FROM ComponentLeaders cl JOIN AliasPairs ap ON cl.game_id = ap.id2
+    ),
+    ComponentMapping AS (
+        SELECT game_id, MIN(leader_id) as component_leader_id
+        FROM ComponentLeaders
+        GROUP BY game_id
+    ),
+    IndividualGameStats AS (
+        SELECT
+            gd.game_id,
+            gd.name,
+            COALESCE(ot.duration, 0) AS total_duration,
+            pt_agg.last_played_date
+        FROM game_dict gd
+        LEFT JOIN overall_time ot ON gd.game_id = ot.game_id
+        LEFT JOIN (
+            SELECT game_id, MAX(date_time) as last_played_date
+            FROM play_time
+            GROUP BY game_id
+        ) pt_agg ON gd.game_id = pt_agg.game_id
+    )
+    SELECT
+        cm.component_leader_id as game_id,
+        SUM(igs.total_duration) AS total_time,
+        MAX(igs.last_played_date) AS last_played_date,
+        GROUP_CONCAT(DISTINCT igs.name) AS game_name,
+        NULLIF(GROUP_CONCAT(DISTINCT CASE WHEN igs.game_id <> cm.component_leader_id THEN igs.game_id END), '') AS aliases_id
+    FROM ComponentMapping cm
+    JOIN IndividualGameStats igs ON cm.game_id = igs.game_id
+    GROUP BY cm.component_leader_id
+    ORDER BY last_played_date DESC, game_id DESC;
+"""
+
+
+def _seed(db: SqlLiteDb, rnd: random.Random) -> None:
+    game_ids = [str(100_000 + index) for index in range(GAMES)]
+    started_at = datetime(2022, 1, 1)
+
+    with db.transactional() as connection:
+        connection.executemany(
+            "INSERT INTO game_dict (game_id, name) VALUES (?, ?)",
+            [(game_id, f"Game {game_id}") for game_id in game_ids],
+        )
+        connection.executemany(
+            "INSERT INTO play_time (date_time, duration, game_id) VALUES (?, ?, ?)",
+            [
+                (
+                    (started_at + timedelta(minutes=rnd.randint(0, 1_000_000))).isoformat(),
+                    rnd.randint(60, 7200),
+                    rnd.choice(game_ids),
+                )
+                for _ in range(SESSIONS)
+            ],
+        )
+        connection.execute(
+            """
+            INSERT INTO overall_time (game_id, duration)
+            SELECT game_id, SUM(duration) FROM play_time GROUP BY game_id
+            """
+        )
+        connection.executemany(
+            """
+            INSERT OR IGNORE INTO game_file_checksum (game_id, checksum, algorithm, chunk_size)
+            VALUES (?, ?, 'SHA256', 16777216)
+            """,
+            [_random_link(rnd) for _ in range(CHECKSUM_LINKS)],
+        )
+        rebuild_game_components(connection)
+
+
+def _random_link(rnd: random.Random):
+    # Games are grouped in clusters of `CLUSTER_SIZE` copies of the same title,
+    # every link picks one of the few checksums known for its cluster
+    game_index = rnd.randrange(GAMES)
+    cluster = game_index // CLUSTER_SIZE
+    checksum = f"{cluster:060x}{rnd.randrange(CHECKSUMS_PER_CLUSTER):04x}"
+
+    return (str(100_000 + game_index), checksum)
+
+
+def _measure(fn: Callable[[], object]) -> List[float]:
+    samples = []
+
+    for _ in range(ITERATIONS):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    return sorted(samples)
+
+
+def _report(name: str, samples: List[float]) -> None:
+    print(
+        f"{name:<44} median {samples[len(samples) // 2]:9.2f} ms"
+        f"   min {samples[0]:9.2f} ms"
+    )
+
+
+def main() -> None:
+    rnd = random.Random(SEED)
+
+    with tempfile.TemporaryDirectory() as directory:
+        db = SqlLiteDb(os.path.join(directory, "benchmark.db"))
+        DbMigration(db).migrate()
+        _seed(db, rnd)
+        dao = Dao(db)
+
+        def recursive_cte():
+            with db.readonly() as connection:
+                connection.execute(RECURSIVE_CTE_QUERY).fetchall()
+
+        def full_rebuild():
+            with db.transactional() as connection:
+                rebuild_game_components(connection)
+
+        def incremental_save():
+            game_id, checksum = _random_link(rnd)
+            dao.save_game_checksum_bulk(
+                [(game_id, checksum, "SHA256", 16777216, None, None)]
+            )
+
+        print(f"{GAMES} games, {CHECKSUM_LINKS} checksum links, {SESSIONS} sessions")
+        _report("fetch_playtime_information (recursive CTE)", _measure(recursive_cte))
+        _report(
+            "fetch_playtime_information (game_component)",
+            _measure(dao.fetch_playtime_information),
+        )
+        _report("rebuild_game_components", _measure(full_rebuild))
+        _report("save_game_checksum (incremental refresh)", _measure(incremental_save))
+
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Measures hashing throughput of every `ChecksumAlgorithm` supported by
+`Files.get_file_digest`, both on an in-memory buffer (pure CPU cost) and on a
+head/tail digest of a file served from the page cache.
+
+Run from the repository root:
+    python -m py_modules.benchmarks.hash_algorithm_benchmark
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+from typing import Callable, List, Tuple
+from unittest.mock import patch
+
+with patch.dict(
+    "os.environ", {"DECKY_PLUGIN_RUNTIME_DIR": os.environ.get("TMPDIR", "/tmp")}
+):
+    from py_modules.files import CHUNK_SIZE, SHAKE_DIGEST_SIZES, Files
+    from py_modules.schemas.common import CHECKSUM_ALGORITHMS
+
+BUFFER_SIZE = 64 * 1024 * 1024
+FILE_SIZE = 3 * CHUNK_SIZE
+ITERATIONS = 5
+
+
+def _median_seconds(fn: Callable[[], object]) -> float:
+    timings = []
+
+    for _ in range(ITERATIONS):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+
+    return sorted(timings)[len(timings) // 2]
+
+
+def _hash_buffer(algorithm: str, buffer: memoryview) -> str:
+    hasher = hashlib.new(algorithm.lower(), buffer)
+
+    if algorithm in SHAKE_DIGEST_SIZES:
+        return hasher.hexdigest(SHAKE_DIGEST_SIZES[algorithm])
+
+    return hasher.hexdigest()
+
+
+def main() -> None:
+    buffer = memoryview(os.urandom(BUFFER_SIZE))
+    files = Files()
+    rows: List[Tuple[str, float, float]] = []
+
+    with tempfile.NamedTemporaryFile() as f:
+        f.write(buffer[: FILE_SIZE // 2])
+        f.write(buffer[: FILE_SIZE - FILE_SIZE // 2])
+        f.flush()
+
+        # NOTE: Warm the page cache, so the file column measures hashing only
+        files.get_file_digest(f.name, "SHA256")
+
+        for algorithm in CHECKSUM_ALGORITHMS:
+            buffer_s = _median_seconds(lambda: _hash_buffer(algorithm, buffer))
+            file_s = _median_seconds(lambda: files.get_file_digest(f.name, algorithm))
+            rows.append((algorithm, buffer_s, file_s))
+
+    mib = 1024 * 1024
+    print(f"{'algorithm':<12} {'MiB/s':>10} {'head+tail ms':>14}")
+
+    for algorithm, buffer_s, file_s in sorted(rows, key=lambda row: row[1]):
+        throughput = BUFFER_SIZE / mib / buffer_s
+        print(f"{algorithm:<12} {throughput:>10.1f} {file_s * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
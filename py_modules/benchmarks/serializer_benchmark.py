@@ -0,0 +1,102 @@
+"""
+Compares `dataclasses.asdict` followed by the regex key conversion with
+`to_camel_case_response` on a `per_game_overall_statistics` sized payload.
+
+Run from the repository root:
+    python -m py_modules.benchmarks.serializer_benchmark
+"""
+
+import dataclasses
+import random
+import re
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, List
+
+from py_modules.schemas.response import Game, GamePlaytimeDetails, SessionInformation
+from py_modules.schemas.serializer import to_camel_case_response
+
+GAMES = 200
+SESSIONS = 10_000
+ITERATIONS = 20
+SEED = 42
+
+
+def _regex_to_camel_case(snake_str: str) -> str:
+    camel_string = re.sub(r"_([a-zA-Z0-9])", lambda m: m.group(1).upper(), snake_str)
+
+    return camel_string.lstrip("_")
+
+
+def _regex_convert_keys(data: Any) -> Any:
+    if isinstance(data, dict):
+        return {
+            _regex_to_camel_case(key): _regex_convert_keys(value)
+            for key, value in data.items()
+        }
+
+    if isinstance(data, list):
+        return [_regex_convert_keys(item) for item in data]
+
+    return data
+
+
+def _build_payload() -> List[GamePlaytimeDetails]:
+    random_generator = random.Random(SEED)
+    started = datetime(2020, 1, 1)
+    sessions_by_game: List[List[SessionInformation]] = [[] for _ in range(GAMES)]
+
+    for index in range(SESSIONS):
+        sessions_by_game[random_generator.randrange(GAMES)].append(
+            SessionInformation(
+                date=(started + timedelta(hours=index)).isoformat(),
+                duration=random_generator.randint(60, 7200),
+                migrated=None,
+                checksum=None,
+            )
+        )
+
+    return [
+        GamePlaytimeDetails(
+            game=Game(str(index), f"Game {index}"),
+            total_time=sum(s.duration for s in sessions),
+            sessions=sessions,
+            last_session=sessions[-1] if sessions else None,
+        )
+        for index, sessions in enumerate(sessions_by_game)
+    ]
+
+
+def _measure(fn: Callable[[], Any]) -> float:
+    timings = []
+
+    for _ in range(ITERATIONS):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+
+    return sorted(timings)[len(timings) // 2] * 1000
+
+
+def main() -> None:
+    payload = _build_payload()
+
+    def legacy():
+        return _regex_convert_keys([dataclasses.asdict(game) for game in payload])
+
+    def precompiled():
+        return to_camel_case_response(payload)
+
+    assert legacy() == precompiled()
+
+    legacy_ms = _measure(legacy)
+    precompiled_ms = _measure(precompiled)
+
+    print(f"{GAMES} games, {SESSIONS} sessions, median of {ITERATIONS} runs")
+    print(f"asdict + regex:         {legacy_ms:8.2f} ms")
+    print(f"to_camel_case_response: {precompiled_ms:8.2f} ms")
+    print(f"speedup:                {legacy_ms / precompiled_ms:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
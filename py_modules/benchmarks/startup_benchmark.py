@@ -0,0 +1,117 @@
+"""
+Measures the cold start of the storage part of `Plugin._main` on an
+up-to-date database: opening the pool, `DbMigration.migrate`, the hash cache,
+the session journal and session recovery. `decky` is only available inside
+Decky Loader, so `main.py` itself is not imported.
+
+Every iteration starts with a fresh `SqlLiteDb`, like a plugin (re)load.
+
+Run from the repository root:
+    python -m py_modules.benchmarks.startup_benchmark
+"""
+
+import os
+import sqlite3
+import tempfile
+import time
+from unittest.mock import patch
+
+from py_modules.db.dao import Dao
+from py_modules.db.migration import DbMigration
+from py_modules.db.sqlite_db import PragmaProfile, SqlLiteDb
+from py_modules.file_hash_cache import FileHashCache
+from py_modules.games import Games
+from py_modules.session_journal import SessionJournal
+from py_modules.statistics import Statistics
+from py_modules.time_tracking import TimeTracking
+
+with patch.dict(
+    "os.environ", {"DECKY_PLUGIN_RUNTIME_DIR": os.environ.get("TMPDIR", "/tmp")}
+):
+    from py_modules.files import Files
+
+ITERATIONS = 200
+
+
+class StatementCountingSqlLiteDb(SqlLiteDb):
+    statements = 0
+    connections = 0
+
+    def _connect(self, query_only: bool = False) -> sqlite3.Connection:
+        StatementCountingSqlLiteDb.connections += 1
+        connection = super()._connect(query_only)
+        connection.set_trace_callback(self._count_statement)
+
+        return connection
+
+    @staticmethod
+    def _count_statement(statement: str) -> None:
+        if not statement.startswith("PRAGMA") or "user_version" in statement:
+            StatementCountingSqlLiteDb.statements += 1
+
+
+def _start(data_dir: str, db_class=SqlLiteDb) -> SqlLiteDb:
+    db = db_class(f"{data_dir}/storage.db", pragmas=PragmaProfile())
+    DbMigration(db).migrate()
+
+    dao = Dao(db)
+    files = Files(FileHashCache(f"{data_dir}/file_hash_cache.db"))
+    Games(dao)
+    Statistics(dao)
+    journal = SessionJournal(f"{data_dir}/sessions.journal")
+    TimeTracking(dao, journal).recover_sessions()
+
+    journal.close()
+    files.hash_cache.close()
+
+    return db
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as data_dir:
+        # NOTE: First start creates the schema, it is not measured
+        _start(data_dir).close()
+
+        timings = []
+
+        for _ in range(ITERATIONS):
+            started = time.perf_counter()
+            db = _start(data_dir)
+            timings.append(time.perf_counter() - started)
+            db.close()
+
+        migration_timings = []
+
+        for _ in range(ITERATIONS):
+            db = SqlLiteDb(f"{data_dir}/storage.db", pragmas=PragmaProfile())
+            started = time.perf_counter()
+            DbMigration(db).migrate()
+            migration_timings.append(time.perf_counter() - started)
+            db.close()
+
+        StatementCountingSqlLiteDb.statements = 0
+        StatementCountingSqlLiteDb.connections = 0
+        db = StatementCountingSqlLiteDb(
+            f"{data_dir}/storage.db", pragmas=PragmaProfile()
+        )
+        DbMigration(db).migrate()
+        db.close()
+
+    timings.sort()
+    migration_timings.sort()
+
+    print(f"{'':<16} {'p50 ms':>8} {'p99 ms':>8}")
+
+    for name, values in (("cold start", timings), ("migrate", migration_timings)):
+        p50 = values[len(values) // 2] * 1000
+        p99 = values[int(len(values) * 0.99)] * 1000
+        print(f"{name:<16} {p50:>8.3f} {p99:>8.3f}")
+
+    print(
+        f"migrate on current schema: {StatementCountingSqlLiteDb.statements}"
+        f" statement(s), {StatementCountingSqlLiteDb.connections} connection(s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Literal, Tuple
+
+from py_modules.dto.save_game_checksum import AddGameChecksumDTO
+from py_modules.files import (
+    CHUNK_SIZE,
+    FINGERPRINT_REGION_COUNT,
+    FINGERPRINT_REGION_SIZE,
+    SHA256,
+    Files,
+)
+from py_modules.schemas.common import (
+    SAMPLED_CHECKSUM_ALGORITHMS,
+    STORED_CHECKSUM_ALGORITHMS,
+    StoredChecksumAlgorithm,
+)
+
+logger = logging.getLogger()
+
+StorageType = Literal["nvme", "ssd", "sd_card", "rotational", "unknown"]
+
+# NOTE: SD cards and spinning disks slow down with parallel random reads,
+# flash behind NVMe keeps scaling with the queue depth
+WORKERS_BY_STORAGE_TYPE: Dict[StorageType, int] = {
+    "nvme": 8,
+    "ssd": 4,
+    "sd_card": 2,
+    "rotational": 1,
+    "unknown": 2,
+}
+SAVE_BATCH_SIZE = 64
+
+
+class _HashingCancelled(Exception):
+    pass
+
+
+@dataclass
+class FileHashRequest:
+    # NOTE: Files without a game are hashed, but their checksum is not saved
+    game_id: str | None
+    path: str
+    previous_checksum: str | None = None
+
+
+@dataclass
+class FileHashResult:
+    game_id: str | None
+    path: str
+    checksum: str | None
+    error: str | None
+
+
+@dataclass
+class BulkHashProgress:
+    done: int
+    total: int
+    result: FileHashResult
+    job_id: str | None = None
+
+
+@dataclass
+class BulkHashSummary:
+    total: int
+    hashed: int
+    missing: int
+    failed: int
+    cancelled: bool
+    results: List[FileHashResult]
+
+
+def detect_storage_type(path: str, sys_root: str = "/sys") -> StorageType:
+    """
+    Resolves the block device behind `path` through sysfs. Partitions are
+    mapped to their disk, so `mmcblk0p1` is reported as an SD card.
+    """
+    try:
+        device = os.stat(path).st_dev
+        device_dir = os.path.realpath(
+            f"{sys_root}/dev/block/{os.major(device)}:{os.minor(device)}"
+        )
+    except OSError:
+        return "unknown"
+
+    if os.path.exists(os.path.join(device_dir, "partition")):
+        device_dir = os.path.dirname(device_dir)
+
+    name = os.path.basename(device_dir)
+
+    if name.startswith("nvme"):
+        return "nvme"
+
+    if name.startswith("mmcblk"):
+        return "sd_card"
+
+    try:
+        with open(os.path.join(device_dir, "queue", "rotational")) as rotational:
+            return "rotational" if rotational.read().strip() == "1" else "ssd"
+    except OSError:
+        return "unknown"
+
+
+def default_chunk_size(algorithm: StoredChecksumAlgorithm) -> int:
+    if algorithm in SAMPLED_CHECKSUM_ALGORITHMS:
+        return FINGERPRINT_REGION_SIZE
+
+    return CHUNK_SIZE
+
+
+def workers_for_paths(paths: List[str], sys_root: str = "/sys") -> int:
+    """
+    Picks the pool size of the slowest storage among the parent directories
+    of `paths`. Every device is only probed once.
+    """
+    workers_by_device: Dict[int, int] = {}
+
+    for path in paths:
+        directory = os.path.dirname(path) or "."
+
+        try:
+            device = os.stat(directory).st_dev
+        except OSError:
+            continue
+
+        if device not in workers_by_device:
+            workers_by_device[device] = WORKERS_BY_STORAGE_TYPE[
+                detect_storage_type(directory, sys_root)
+            ]
+
+    return min(workers_by_device.values(), default=WORKERS_BY_STORAGE_TYPE["unknown"])
+
+
+class BulkFileHasher:
+    """
+    Hashes many files on a bounded thread pool and saves the checksums in
+    batches through `save_checksums`. Progress is reported per finished file,
+    in completion order. `cancel` stops the batch started with the same
+    `job_id`, or every running batch without one: queued files are dropped
+    and results of files that are still being read are discarded, checksums
+    collected so far are saved.
+
+    With a sampled algorithm `chunk_size` is the region size of
+    `Files.get_file_fingerprint`.
+    """
+
+    def __init__(
+        self,
+        files: Files,
+        save_checksums: Callable[[List[AddGameChecksumDTO]], Awaitable[None]],
+        save_batch_size: int = SAVE_BATCH_SIZE,
+    ) -> None:
+        self._files = files
+        self._save_checksums = save_checksums
+        self._save_batch_size = save_batch_size
+        self._cancel_events: List[Tuple[str | None, threading.Event]] = []
+
+    def cancel(self, job_id: str | None = None) -> None:
+        for event_job_id, event in list(self._cancel_events):
+            if job_id is None or event_job_id == job_id:
+                event.set()
+
+    async def hash_files(
+        self,
+        requests: List[FileHashRequest],
+        algorithm: StoredChecksumAlgorithm = SHA256,
+        chunk_size: int | None = None,
+        on_progress: Callable[[BulkHashProgress], Awaitable[None]] | None = None,
+        max_workers: int | None = None,
+        region_count: int = FINGERPRINT_REGION_COUNT,
+        job_id: str | None = None,
+    ) -> BulkHashSummary:
+        if algorithm not in STORED_CHECKSUM_ALGORITHMS:
+            raise ValueError(
+                f'"algorithm" must be one of: {", ".join(STORED_CHECKSUM_ALGORITHMS)}'
+            )
+
+        sampled = algorithm in SAMPLED_CHECKSUM_ALGORITHMS
+        chunk_size = chunk_size or default_chunk_size(algorithm)
+
+        if job_id is not None and any(
+            event_job_id == job_id for event_job_id, _ in self._cancel_events
+        ):
+            raise ValueError(f'Job "{job_id}" is already running')
+
+        cancelled = threading.Event()
+        cancel_entry = (job_id, cancelled)
+        self._cancel_events.append(cancel_entry)
+
+        try:
+            # NOTE: Probing the storage reads sysfs, keep it off the event loop
+            workers = max_workers or await asyncio.to_thread(
+                workers_for_paths, [r.path for r in requests]
+            )
+        except BaseException:
+            self._cancel_events.remove(cancel_entry)
+            raise
+
+        pool = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="playtime-file-hasher"
+        )
+        loop = asyncio.get_running_loop()
+
+        results: List[FileHashResult] = []
+        pending_checksums: List[AddGameChecksumDTO] = []
+
+        def hash_file(path: str) -> str | None:
+            # NOTE: Queued work may start right before `cancel` drains the pool
+            if cancelled.is_set():
+                raise _HashingCancelled()
+
+            if sampled:
+                return self._files.get_file_fingerprint(path, region_count, chunk_size)
+
+            return self._files.get_file_digest(path, algorithm, chunk_size)
+
+        pending: Dict[asyncio.Future, FileHashRequest] = {
+            loop.run_in_executor(pool, hash_file, request.path): request
+            for request in requests
+        }
+
+        try:
+            while pending and not cancelled.is_set():
+                done, _ = await asyncio.wait(
+                    pending.keys(), return_when=asyncio.FIRST_COMPLETED
+                )
+
+                for future in done:
+                    request = pending.pop(future)
+
+                    if future.cancelled() or isinstance(
+                        future.exception(), _HashingCancelled
+                    ):
+                        continue
+
+                    result = self._to_result(request, future)
+                    results.append(result)
+
+                    if result.checksum is not None and result.game_id is not None:
+                        pending_checksums.append(
+                            AddGameChecksumDTO(
+                                game_id=result.game_id,
+                                checksum=result.checksum,
+                                algorithm=algorithm,
+                                chunk_size=chunk_size,
+                                region_count=region_count if sampled else None,
+                                previous_checksum=request.previous_checksum,
+                            )
+                        )
+
+                    if on_progress is not None:
+                        await on_progress(
+                            BulkHashProgress(
+                                len(results), len(requests), result, job_id
+                            )
+                        )
+
+                if len(pending_checksums) >= self._save_batch_size:
+                    await self._save_checksums(pending_checksums)
+                    pending_checksums = []
+        finally:
+            for future in pending:
+                future.cancel()
+
+            pool.shutdown(wait=False, cancel_futures=True)
+            self._cancel_events.remove(cancel_entry)
+
+        # NOTE: Saved outside `finally`, a failing save must not replace the
+        # error that stopped hashing. A cancel still saves what was collected
+        if pending_checksums:
+            await self._save_checksums(pending_checksums)
+
+        return BulkHashSummary(
+            total=len(requests),
+            hashed=sum(1 for r in results if r.checksum is not None),
+            missing=sum(1 for r in results if r.checksum is None and r.error is None),
+            failed=sum(1 for r in results if r.error is not None),
+            cancelled=cancelled.is_set(),
+            results=results,
+        )
+
+    @staticmethod
+    def _to_result(request: FileHashRequest, future: asyncio.Future) -> FileHashResult:
+        error = future.exception()
+
+        if error is not None:
+            logger.warning("Can not hash %s: %s", request.path, error)
+            return FileHashResult(request.game_id, request.path, None, str(error))
+
+        return FileHashResult(request.game_id, request.path, future.result(), None)
@@ -1,12 +1,16 @@
 from dataclasses import dataclass
+import contextlib
 import datetime
 import logging
 import sqlite3
-from typing import Tuple, List, Dict, Optional, Collection
+from typing import Tuple, List, Dict, Optional, Collection, Generator
 from collections import defaultdict
 
+from py_modules.db.game_components import refresh_game_components
+from py_modules.db.query_metrics import QueryMetrics
 from py_modules.db.sqlite_db import SqlLiteDb
-from py_modules.schemas.common import ChecksumAlgorithm
+from py_modules.helpers import format_date, to_day_key, to_epoch
+from py_modules.schemas.common import StoredChecksumAlgorithm
 
 logger = logging.getLogger()
 
@@ -47,6 +51,22 @@ class OverallGamesTimeDto:
     total_sessions: int
 
 
+@dataclass
+class GameOverallSummaryDto:
+    game_id: str
+    game_name: str
+    time: int
+    checksum: str | None
+    total_sessions: int
+    last_session: SessionInformation | None
+
+
+@dataclass
+class GameSessionDto:
+    id: int
+    session: SessionInformation
+
+
 @dataclass
 class GameInformationDto:
     game_id: str
@@ -60,8 +80,9 @@ class FileChecksum:
     game_id: str
     game_name: str
     checksum: str
-    algorithm: ChecksumAlgorithm
+    algorithm: StoredChecksumAlgorithm
     chunk_size: int
+    region_count: None | int
     created_at: None | str
     updated_at: None | str
 
@@ -72,18 +93,35 @@ class GameDictionary:
     name: str
 
 
+@dataclass
+class GameDictionaryWithChecksums:
+    id: str
+    name: str
+    files: List[FileChecksum]
+
+
 @dataclass
 class GamesChecksum:
     checksum_id: str
     game_id: str
     game_name: None | str
     checksum: str
-    algorithm: ChecksumAlgorithm
+    algorithm: StoredChecksumAlgorithm
     chunk_size: int
+    region_count: None | int
     created_at: None | str
     updated_at: None | str
 
 
+@dataclass
+class DailyStatisticsSnapshot:
+    daily_reports: List[DailyGameTimeDto]
+    sessions_by_day_and_game: Dict[str, Dict[str, List[SessionInformation]]]
+    last_sessions: Dict[str, SessionInformation]
+    has_prev: bool
+    has_next: bool
+
+
 @dataclass
 class PlaytimeInformation:
     game_id: str
@@ -94,13 +132,30 @@ class PlaytimeInformation:
 
 
 class Dao:
-    def __init__(self, db: SqlLiteDb):
+    def __init__(self, db: SqlLiteDb, metrics: QueryMetrics | None = None):
         self._db = db
+        self.metrics = metrics if metrics is not None else QueryMetrics()
+
+    @property
+    def write_generation(self) -> int:
+        return self._db.write_generation
+
+    @contextlib.contextmanager
+    def _mutation(self) -> Generator[sqlite3.Connection, None, None]:
+        with self._db.transactional() as connection:
+            changes_before = connection.total_changes
+            yield connection
+            changed = connection.total_changes != changes_before
+
+        # NOTE: Bump only after commit. Otherwise a concurrent reader could cache
+        # pre-commit data under the new generation.
+        if changed:
+            self._db.bump_write_generation()
 
     def save_game_dict(self, game_id: str, game_name: str) -> None:
         connection: sqlite3.Connection
 
-        with self._db.transactional() as connection:
+        with self._mutation() as connection:
             self._save_game_dict(connection, game_id, game_name)
 
     def save_play_time(
@@ -110,9 +165,86 @@ class Dao:
         game_id: str,
         source: str | None = None,
     ) -> None:
-        with self._db.transactional() as connection:
+        with self._mutation() as connection:
             self._save_play_time(connection, start, time_s, game_id, source)
 
+    def save_play_time_bulk(
+        self,
+        game_names: Dict[str, str],
+        play_times: List[Tuple[datetime.datetime, int, str]],
+    ) -> None:
+        """
+        Saves `game_names` and `(start, time_s, game_id)` play times in one
+        transaction. `overall_time` and `play_time_daily` receive one upsert per
+        game and per (day, game) instead of one per play time.
+        """
+        overall_deltas: Dict[str, float] = defaultdict(float)
+        daily_deltas: Dict[Tuple[str, str], List[float]] = {}
+
+        for start, time_s, game_id in play_times:
+            overall_deltas[game_id] += time_s
+            daily_delta = daily_deltas.setdefault((format_date(start), game_id), [0, 0])
+            daily_delta[0] += time_s
+            daily_delta[1] += 1
+
+        with self._mutation() as connection:
+            self.metrics.execute_many(
+                connection,
+                "save_play_time_bulk.game_dict",
+                """
+                INSERT INTO game_dict (game_id, name)
+                VALUES (?, ?)
+                ON CONFLICT (game_id) DO UPDATE SET name = excluded.name
+                WHERE name != excluded.name
+                """,
+                game_names.items(),
+            )
+            self.metrics.execute_many(
+                connection,
+                "save_play_time_bulk.play_time",
+                """
+                INSERT INTO play_time(date_time, duration, game_id, migrated, started_at_epoch, day_key)
+                VALUES (?, ?, ?, NULL, ?, ?)
+                """,
+                [
+                    (
+                        start.isoformat(),
+                        time_s,
+                        game_id,
+                        to_epoch(start),
+                        to_day_key(start),
+                    )
+                    for start, time_s, game_id in play_times
+                ],
+            )
+            self.metrics.execute_many(
+                connection,
+                "save_play_time_bulk.overall_time",
+                """
+                INSERT INTO overall_time (game_id, duration)
+                VALUES (?, ?)
+                ON CONFLICT (game_id)
+                    DO UPDATE SET duration = duration + excluded.duration
+                """,
+                overall_deltas.items(),
+            )
+            self.metrics.execute_many(
+                connection,
+                "save_play_time_bulk.play_time_daily",
+                """
+                INSERT INTO play_time_daily (date, game_id, duration, sessions)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (date, game_id)
+                    DO UPDATE SET
+                        duration = duration + excluded.duration,
+                        sessions = sessions + excluded.sessions
+                """,
+                [
+                    (date, game_id, duration, sessions)
+                    for (date, game_id), (duration, sessions) in daily_deltas.items()
+                ],
+            )
+
     def apply_manual_time_for_game(
         self,
         create_at: datetime.datetime,
@@ -121,11 +253,14 @@ class Dao:
         new_overall_time: float,
         source: str,
     ) -> None:
-        with self._db.transactional() as connection:
+        with self._mutation() as connection:
             self._save_game_dict(connection, game_id, game_name)
-            current_time = connection.execute(
-                "SELECT sum(duration) FROM play_time WHERE game_id = ?", (game_id,)
-            ).fetchone()[0]
+            current_time = self.metrics.fetch_one(
+                connection,
+                "apply_manual_time_for_game.current_time",
+                "SELECT sum(duration) FROM play_time WHERE game_id = ?",
+                (game_id,),
+            )[0]
             delta_time = new_overall_time - (
                 current_time if current_time is not None else 0
             )
@@ -138,21 +273,69 @@ class Dao:
         end: datetime.datetime,
         game_id: str | None = None,
     ) -> List[DailyGameTimeDto]:
-        with self._db.transactional() as connection:
+        with self._db.readonly() as connection:
             return self._fetch_per_day_time_report(connection, begin, end, game_id)
 
+    def fetch_daily_statistics_for_period(
+        self,
+        begin: datetime.datetime,
+        end: datetime.datetime,
+        game_id: str | None = None,
+    ) -> DailyStatisticsSnapshot:
+        """
+        Every read of a daily statistics page in one read transaction, so a
+        session saved meanwhile can not show up in only some of them.
+        """
+        with self._db.snapshot() as connection:
+            daily_reports = self._fetch_per_day_time_report(
+                connection, begin, end, game_id
+            )
+            sessions_by_day_and_game = self._fetch_sessions_for_period(
+                connection, begin, end, game_id
+            )
+            last_sessions = self._fetch_last_sessions_for_games(
+                connection, {report.game_id for report in daily_reports}
+            )
+            has_prev, has_next = self._has_data_around(
+                connection, begin, end, game_id
+            )
+
+        return DailyStatisticsSnapshot(
+            daily_reports=daily_reports,
+            sessions_by_day_and_game=sessions_by_day_and_game,
+            last_sessions=last_sessions,
+            has_prev=has_prev,
+            has_next=has_next,
+        )
+
     def has_data_before(
         self, date: datetime.datetime, game_id: str | None = None
     ) -> bool:
-        with self._db.transactional() as connection:
+        with self._db.readonly() as connection:
             return self._has_data_before(connection, date, game_id)
 
     def has_data_after(
         self, date: datetime.datetime, game_id: str | None = None
     ) -> bool:
-        with self._db.transactional() as connection:
+        with self._db.readonly() as connection:
             return self._has_data_after(connection, date, game_id)
 
+    def has_play_time_started_at(
+        self, game_id: str, started_at: datetime.datetime
+    ) -> bool:
+        with self._db.readonly() as connection:
+            return (
+                self.metrics.fetch_one(
+                    connection,
+                    "has_play_time_started_at",
+                    """
+                    SELECT EXISTS(SELECT 1 FROM play_time pt WHERE pt.game_id = ? AND pt.started_at_epoch = ?)
+                    """,
+                    (game_id, to_epoch(started_at)),
+                )[0]
+                == 1
+            )
+
     def _has_data_before(
         self,
         connection: sqlite3.Connection,
@@ -161,25 +344,31 @@ class Dao:
     ) -> bool:
         if game_id:
             return (
-                connection.execute(
+                self.metrics.fetch_one(
+                    connection,
+                    "has_data_before.game",
                     """
-                    SELECT EXISTS(SELECT 1 FROM play_time pt WHERE date_time < ? AND pt.game_id = ?)
+                    SELECT EXISTS(SELECT 1 FROM play_time pt WHERE pt.game_id = ? AND pt.started_at_epoch < ?)
                     """,
                     (
-                        date.isoformat(),
                         game_id,
+                        to_epoch(date),
                     ),
-                ).fetchone()[0]
+                )[0]
                 == 1
             )
 
         return (
-            connection.execute(
+            self.metrics.fetch_one(
+                connection,
+                "has_data_before",
                 """
-                SELECT EXISTS(SELECT 1 FROM play_time pt WHERE date_time < ?)
+                SELECT EXISTS(
+                    SELECT 1 FROM play_time pt WHERE pt.day_key <= ? AND pt.started_at_epoch < ?
+                )
                 """,
-                (date.isoformat(),),
-            ).fetchone()[0]
+                (to_day_key(date), to_epoch(date)),
+            )[0]
             == 1
         )
 
@@ -191,32 +380,90 @@ class Dao:
     ) -> bool:
         if game_id:
             return (
-                connection.execute(
+                self.metrics.fetch_one(
+                    connection,
+                    "has_data_after.game",
                     """
-                    SELECT EXISTS(SELECT 1 FROM play_time pt WHERE date_time > ? AND pt.game_id = ?)
+                    SELECT EXISTS(SELECT 1 FROM play_time pt WHERE pt.game_id = ? AND pt.started_at_epoch > ?)
                     """,
                     (
-                        date.isoformat(),
                         game_id,
+                        to_epoch(date),
                     ),
-                ).fetchone()[0]
+                )[0]
                 == 1
             )
 
         return (
-            connection.execute(
+            self.metrics.fetch_one(
+                connection,
+                "has_data_after",
                 """
-                    SELECT EXISTS(SELECT 1 FROM play_time pt WHERE date_time > ?)
-            """,
-                (date.isoformat(),),
-            ).fetchone()[0]
+                SELECT EXISTS(
+                    SELECT 1 FROM play_time pt WHERE pt.day_key >= ? AND pt.started_at_epoch > ?
+                )
+                """,
+                (to_day_key(date), to_epoch(date)),
+            )[0]
             == 1
         )
 
+    def _has_data_around(
+        self,
+        connection: sqlite3.Connection,
+        begin: datetime.datetime,
+        end: datetime.datetime,
+        game_id: str | None = None,
+    ) -> Tuple[bool, bool]:
+        """
+        `_has_data_before(begin)` and `_has_data_after(end)` in one query.
+        """
+        connection.row_factory = None
+
+        if game_id:
+            row = self.metrics.fetch_one(
+                connection,
+                "has_data_around.game",
+                """
+                SELECT
+                    EXISTS(SELECT 1 FROM play_time pt WHERE pt.game_id = :game_id AND pt.started_at_epoch < :begin),
+                    EXISTS(SELECT 1 FROM play_time pt WHERE pt.game_id = :game_id AND pt.started_at_epoch > :end)
+                """,
+                {
+                    "game_id": game_id,
+                    "begin": to_epoch(begin),
+                    "end": to_epoch(end),
+                },
+            )
+        else:
+            row = self.metrics.fetch_one(
+                connection,
+                "has_data_around",
+                """
+                SELECT
+                    EXISTS(
+                        SELECT 1 FROM play_time pt WHERE pt.day_key <= :begin_day AND pt.started_at_epoch < :begin
+                    ),
+                    EXISTS(
+                        SELECT 1 FROM play_time pt WHERE pt.day_key >= :end_day AND pt.started_at_epoch > :end
+                    )
+                """,
+                {
+                    "begin_day": to_day_key(begin),
+                    "begin": to_epoch(begin),
+                    "end_day": to_day_key(end),
+                    "end": to_epoch(end),
+                },
+            )
+
+        return row[0] == 1, row[1] == 1
+
     def _save_game_dict(
         self, connection: sqlite3.Connection, game_id: str, game_name: str
     ):
-        connection.execute(
+        self.metrics.execute(
+            connection,
+            "save_game_dict",
             """
                 INSERT INTO game_dict (game_id, name)
                 VALUES (:game_id, :game_name)
@@ -227,7 +474,7 @@ class Dao:
         )
 
     def fetch_overall_playtime(self) -> List[GameTimeDto]:
-        with self._db.transactional() as connection:
+        with self._db.readonly() as connection:
             return self._fetch_overall_playtime(connection)
 
     def _save_play_time(
@@ -238,21 +485,35 @@ class Dao:
         game_id: str,
         source: str | None = None,
     ):
-        connection.execute(
+        self.metrics.execute(
+            connection,
+            "save_play_time",
             """
-                INSERT INTO play_time(date_time, duration, game_id, migrated)
-                VALUES (?,?,?,?)
+                INSERT INTO play_time(date_time, duration, game_id, migrated, started_at_epoch, day_key)
+                VALUES (?,?,?,?,?,?)
                 """,
-            (start.isoformat(), time_s, game_id, source),
+            (
+                start.isoformat(),
+                time_s,
+                game_id,
+                source,
+                to_epoch(start),
+                to_day_key(start),
+            ),
         )
         self._append_overall_time(connection, game_id, time_s)
 
+        if source is None:
+            self._append_daily_time(connection, start, game_id, time_s)
+
     # TODO: Add `_remove_play_time`
 
     def _append_overall_time(
         self, connection: sqlite3.Connection, game_id: str, delta_time_s: float
     ):
-        connection.execute(
+        self.metrics.execute(
+            connection,
+            "append_overall_time",
             """
                 INSERT INTO overall_time (game_id, duration)
                 VALUES (:game_id, :delta_time_s)
@@ -262,6 +523,31 @@ class Dao:
             {"game_id": game_id, "delta_time_s": delta_time_s},
         )
 
+    def _append_daily_time(
+        self,
+        connection: sqlite3.Connection,
+        start: datetime.datetime,
+        game_id: str,
+        delta_time_s: float,
+    ):
+        self.metrics.execute(
+            connection,
+            "append_daily_time",
+            """
+                INSERT INTO play_time_daily (date, game_id, duration, sessions)
+                VALUES (:date, :game_id, :delta_time_s, 1)
+                ON CONFLICT (date, game_id)
+                    DO UPDATE SET
+                        duration = duration + :delta_time_s,
+                        sessions = sessions + 1
+            """,
+            {
+                "date": format_date(start),
+                "game_id": game_id,
+                "delta_time_s": delta_time_s,
+            },
+        )
+
     def _fetch_overall_playtime(
         self,
         connection: sqlite3.Connection,
@@ -273,7 +559,9 @@ class Dao:
             checksum=row[3],
         )
 
-        return connection.execute(
+        return self.metrics.fetch_all(
+            connection,
+            "fetch_overall_playtime",
             """
             SELECT
                 ot.game_id,
@@ -290,10 +578,130 @@ class Dao:
                 GROUP BY game_id
             ) gfc ON ot.game_id = gfc.game_id;
             """
-        ).fetchall()
+        )
+
+    def fetch_overall_playtime_summary(self) -> List[GameOverallSummaryDto]:
+        with self._db.readonly() as connection:
+            return self._fetch_overall_playtime_summary(connection)
+
+    def _fetch_overall_playtime_summary(
+        self,
+        connection: sqlite3.Connection,
+    ) -> List[GameOverallSummaryDto]:
+        connection.row_factory = lambda c, row: GameOverallSummaryDto(
+            game_id=row[0],
+            game_name=row[1],
+            time=row[2],
+            checksum=row[3],
+            total_sessions=row[4],
+            last_session=(
+                SessionInformation(
+                    date=row[5], duration=row[6], migrated=row[7], checksum=row[3]
+                )
+                if row[5] is not None
+                else None
+            ),
+        )
+
+        return self.metrics.fetch_all(
+            connection,
+            "fetch_overall_playtime_summary",
+            """
+            SELECT
+                ot.game_id,
+                gd.name AS game_name,
+                ot.duration,
+                gfc.checksum,
+                COALESCE(last_pt.sessions, 0) AS total_sessions,
+                last_pt.date_time,
+                last_pt.duration,
+                last_pt.migrated
+            FROM
+                overall_time ot
+            JOIN
+                game_dict gd ON ot.game_id = gd.game_id
+            LEFT JOIN (
+                SELECT game_id, MIN(checksum) AS checksum
+                FROM game_file_checksum
+                GROUP BY game_id
+            ) gfc ON ot.game_id = gfc.game_id
+            LEFT JOIN (
+                SELECT
+                    game_id,
+                    date_time,
+                    duration,
+                    migrated,
+                    COUNT(*) OVER (PARTITION BY game_id) AS sessions,
+                    ROW_NUMBER() OVER (
+                        PARTITION BY game_id ORDER BY started_at_epoch DESC, date_time DESC
+                    ) AS rn
+                FROM play_time
+            ) last_pt ON last_pt.game_id = ot.game_id AND last_pt.rn = 1;
+            """
+        )
+
+    def fetch_game_sessions(
+        self,
+        game_id: str,
+        cursor: Tuple[str, int] | None,
+        limit: int,
+    ) -> List[GameSessionDto]:
+        with self._db.readonly() as connection:
+            return self._fetch_game_sessions(connection, game_id, cursor, limit)
+
+    def _fetch_game_sessions(
+        self,
+        connection: sqlite3.Connection,
+        game_id: str,
+        cursor: Tuple[str, int] | None,
+        limit: int,
+    ) -> List[GameSessionDto]:
+        """
+        Keyset pagination over `play_time_game_id_date_time_idx`, newest first.
+        `cursor` is the `(date_time, rowid)` of the last session of the previous page.
+        """
+        connection.row_factory = lambda c, row: GameSessionDto(
+            id=row[0],
+            session=SessionInformation(
+                date=row[1], duration=row[2], migrated=row[3], checksum=row[4]
+            ),
+        )
+
+        params = {"game_id": game_id, "limit": limit}
+        cursor_filter = ""
+
+        if cursor is not None:
+            cursor_filter = "AND (pt.date_time, pt.rowid) < (:cursor_date_time, :cursor_id)"
+            params["cursor_date_time"], params["cursor_id"] = cursor
+
+        return self.metrics.fetch_all(
+            connection,
+            "fetch_game_sessions",
+            f"""
+            SELECT
+                pt.rowid,
+                pt.date_time,
+                pt.duration,
+                pt.migrated,
+                (
+                    SELECT MIN(gfc.checksum)
+                    FROM game_file_checksum gfc
+                    WHERE gfc.game_id = pt.game_id
+                ) AS checksum
+            FROM
+                play_time pt
+            WHERE
+                pt.game_id = :game_id
+                {cursor_filter}
+            ORDER BY
+                pt.date_time DESC, pt.rowid DESC
+            LIMIT :limit;
+            """,
+            params,
+        )
 
     def fetch_playtime_information(self) -> List[PlaytimeInformation]:
-        with self._db.transactional() as connection:
+        with self._db.readonly() as connection:
             return self._fetch_playtime_information(connection)
 
     def _fetch_playtime_information(
@@ -308,52 +716,25 @@ class Dao:
             aliases_id=row[4],
         )
 
-        return connection.execute(
+        return self.metrics.fetch_all(
+            connection,
+            "fetch_playtime_information",
             """
-            WITH RECURSIVE
-            -- Step 1: Find all direct alias pairs, simplified and optimized.
-            -- We only need pairs where game_id_1 < game_id_2 to make the graph directed
-            -- and reduce the number of pairs by half. This is a major optimization.
-            AliasPairs (id1, id2) AS (
-                SELECT DISTINCT gfc1.game_id, gfc2.game_id
-                FROM game_file_checksum gfc1
-                JOIN game_file_checksum gfc2 
-                  ON gfc1.checksum = gfc2.checksum AND gfc1.algorithm = gfc2.algorithm
-                WHERE gfc1.game_id < gfc2.game_id
-            ),
-            -- Step 2: Recursively find the component leader for each game.
-            -- The "leader" is the smallest game_id in a connected component.
-            ComponentLeaders (game_id, leader_id) AS (
-                -- Anchor: Every game starts as its own leader.
-                SELECT game_id, game_id FROM game_dict
-                UNION -- In recursion, UNION is appropriate as it implicitly handles duplicates across iterations.
-                -- Recursive part: Propagate the smallest leader_id across connections.
-                -- If game 'c.game_id' has a leader 'c.leader_id', and it's connected to another
-                -- game via an alias pair, propagate that leader.
-                -- We check both directions of the edge.
-                SELECT
-                    ap.id2,           -- The game receiving the new leader
-                    cl.leader_id      -- The leader being propagated
-                FROM ComponentLeaders cl
-                JOIN AliasPairs ap ON cl.game_id = ap.id1
-                UNION
-                SELECT
-                    ap.id1,           -- The game receiving the new leader
-                    cl.leader_id      -- The leader being propagated
-                FROM ComponentLeaders cl
-                JOIN AliasPairs ap ON cl.game_id = ap.id2
-            ),
-            -- Step 3: Find the definitive leader for each group.
-            -- After recursion, a game might have been assigned multiple potential leaders.
-            -- The true leader is the smallest one (the MIN).
+            WITH
+            -- Step 1: Map every game to its component leader.
+            -- `game_component` only lists games which share a checksum with another
+            -- game, every other game is its own component. The leader is the smallest
+            -- `game_id` of the component which is present in `game_dict`.
             ComponentMapping AS (
                 SELECT
-                    game_id,
-                    MIN(leader_id) as component_leader_id
-                FROM ComponentLeaders
-                GROUP BY game_id
+                    gd.game_id,
+                    MIN(gd.game_id) OVER (
+                        PARTITION BY COALESCE(gc.leader_id, gd.game_id)
+                    ) AS component_leader_id
+                FROM game_dict gd
+                LEFT JOIN game_component gc ON gc.game_id = gd.game_id
             ),
-            -- Step 4: Aggregate raw stats for each individual game_id.
+            -- Step 2: Aggregate raw stats for each individual game_id.
             -- This CTE remains largely the same as it's clear and efficient.
             IndividualGameStats AS (
                 SELECT
@@ -382,14 +763,14 @@ class Dao:
             GROUP BY cm.component_leader_id
             ORDER BY last_played_date DESC, game_id DESC;
             """
-        ).fetchall()
+        )
 
     def fetch_playtime_information_for_period(
         self,
         start_time: datetime.datetime,
         end_time: datetime.datetime,
     ) -> List[PlaytimeInformation]:
-        with self._db.transactional() as connection:
+        with self._db.readonly() as connection:
             return self._fetch_playtime_information_for_period(
                 connection, start_time, end_time
             )
@@ -407,65 +788,58 @@ class Dao:
             game_name=row[3],
             aliases_id=row[4],
         )
-        return connection.execute(
+        return self.metrics.fetch_all(
+            connection,
+            "fetch_playtime_information_for_period",
             """
-            WITH RECURSIVE
-            AliasPairs (id1, id2) AS (
-                SELECT DISTINCT gfc1.game_id, gfc2.game_id
-                FROM game_file_checksum gfc1
-                JOIN game_file_checksum gfc2
-                    ON gfc1.checksum = gfc2.checksum AND gfc1.algorithm = gfc2.algorithm
-                WHERE gfc1.game_id < gfc2.game_id
-            ),
-            ComponentLeaders (game_id, leader_id) AS (
-                SELECT game_id, game_id FROM game_dict
-                UNION
-                SELECT ap.id2, cl.leader_id FROM ComponentLeaders cl JOIN AliasPairs ap ON cl.game_id = ap.id1
-                UNION
-                SELECT ap.id1, cl.leader_id FROM ComponentLeaders cl JOIN AliasPairs ap ON cl.game_id = ap.id2
-            ),
+            WITH
             ComponentMapping AS (
                 SELECT
-                    game_id,
-                    MIN(leader_id) as component_leader_id
-                FROM ComponentLeaders
-                GROUP BY game_id
+                    gd.game_id,
+                    MIN(gd.game_id) OVER (
+                        PARTITION BY COALESCE(gc.leader_id, gd.game_id)
+                    ) AS component_leader_id
+                FROM game_dict gd
+                LEFT JOIN game_component gc ON gc.game_id = gd.game_id
             ),
-            GameStats AS (
-                SELECT
-                    game_id,
-                    -- Sum duration ONLY for sessions within the specified period.
-                    SUM(CASE WHEN date_time >= :start AND date_time < :end THEN duration ELSE 0 END) AS period_duration,
-                    -- Get the absolute last played date for the game across all time.
-                    MAX(date_time) AS last_played_date
+            -- Sessions of the period only, found through the day_key index.
+            PeriodTime AS (
+                SELECT game_id, SUM(duration) AS period_duration
                 FROM play_time
+                WHERE day_key BETWEEN :start_day AND :end_day
+                    AND started_at_epoch BETWEEN :start AND :end
                 GROUP BY game_id
+            ),
+            -- This ensures we only see groups with playtime > 0 in the selected period.
+            PeriodComponents AS (
+                SELECT cm.component_leader_id, SUM(ptp.period_duration) AS total_time
+                FROM PeriodTime ptp
+                JOIN ComponentMapping cm ON cm.game_id = ptp.game_id
+                GROUP BY cm.component_leader_id
+                HAVING SUM(ptp.period_duration) > 0
             )
-            -- Join all data, aggregate by group, and filter using HAVING.
             SELECT
-                cm.component_leader_id AS game_id,
-                SUM(gs.period_duration) AS total_time,
-                MAX(gs.last_played_date) AS last_played_date,
-                MAX(CASE WHEN gd.game_id = cm.component_leader_id THEN gd.name END) AS game_name,
-                NULLIF(GROUP_CONCAT(DISTINCT CASE WHEN gd.game_id <> cm.component_leader_id THEN gd.game_id END), '') AS aliases_id
-            FROM ComponentMapping cm
-            -- Join to get the calculated stats for each game. INNER JOIN naturally filters out
-            -- games that have never been played at all.
-            JOIN GameStats gs ON cm.game_id = gs.game_id
-            -- Join to get the names of the games.
-            JOIN game_dict gd ON cm.game_id = gd.game_id
-            -- Optional filter for a specific game group
-            GROUP BY cm.component_leader_id
-            -- HAVING clause filters the results AFTER grouping.
-            -- This ensures we only see groups with playtime > 0 in the selected period.
-            HAVING SUM(gs.period_duration) > 0
+                pc.component_leader_id AS game_id,
+                pc.total_time,
+                -- The absolute last played date of the group across all time.
+                MAX((SELECT MAX(lp.date_time) FROM play_time lp WHERE lp.game_id = cm.game_id)) AS last_played_date,
+                MAX(CASE WHEN gd.game_id = pc.component_leader_id THEN gd.name END) AS game_name,
+                NULLIF(GROUP_CONCAT(DISTINCT CASE WHEN gd.game_id <> pc.component_leader_id THEN gd.game_id END), '') AS aliases_id
+            FROM PeriodComponents pc
+            JOIN ComponentMapping cm ON cm.component_leader_id = pc.component_leader_id
+            JOIN game_dict gd ON gd.game_id = cm.game_id
+            -- Games that have never been played at all are not part of the group.
+            WHERE EXISTS (SELECT 1 FROM play_time ep WHERE ep.game_id = cm.game_id)
+            GROUP BY pc.component_leader_id
             ORDER BY last_played_date DESC, game_id DESC;
         """,
             {
-                "start": start_time.isoformat(),
-                "end": end_time.isoformat(),
+                "start": to_epoch(start_time),
+                "end": to_epoch(end_time),
+                "start_day": to_day_key(start_time),
+                "end_day": to_day_key(end_time),
             },
-        ).fetchall()
+        )
 
     def _fetch_per_day_time_report(
         self,
@@ -474,6 +848,14 @@ class Dao:
         end: datetime.datetime,
         game_id: str | None = None,
     ) -> List[DailyGameTimeDto]:
+        """
+        Reads per-day totals from the `play_time_daily` rollup, so the cost
+        depends on the number of (day, game) pairs instead of sessions.
+        `begin` and `end` are truncated to whole days.
+
+        Games sharing a checksum are merged into one row per day, under the
+        first game of the day: by id, or by name for a `game_id` report.
+        """
         connection.row_factory = lambda c, row: DailyGameTimeDto(
             date=row[0],
             game_id=row[1],
@@ -483,88 +865,31 @@ class Dao:
             checksum=row[5],
         )
 
-        if game_id:
-            return connection.execute(
-                """
-                SELECT
-                    STRFTIME('%Y-%m-%d', pt.date_time) AS date,
-                    pt.game_id,
-                    gd.name AS game_name,
-                    SUM(pt.duration) AS total_time,
-                    COUNT(*) AS sessions,
-                    gfc.checksum
-                FROM
-                    play_time pt
-                    LEFT JOIN game_dict gd ON pt.game_id = gd.game_id
-                    LEFT JOIN game_file_checksum gfc ON gfc.game_id = pt.game_id
-                WHERE
-                    EXISTS (SELECT 1 FROM game_file_checksum WHERE game_id = :game_id)
-                    AND pt.game_id IN (
-                        SELECT DISTINCT gfc_alias.game_id
-                        FROM game_file_checksum gfc_alias
-                        WHERE gfc_alias.checksum IN (
-                            SELECT gfc_base.checksum
-                            FROM game_file_checksum gfc_base
-                            WHERE gfc_base.game_id = :game_id
-                        )
-                    )
-                    AND pt.date_time BETWEEN :begin AND :end
-                    AND pt.migrated IS NULL
-                GROUP BY
-                    date, pt.game_id, gd.name, gfc.checksum
-                UNION ALL
-                SELECT
-                    STRFTIME('%Y-%m-%d', pt.date_time) AS date,
-                    pt.game_id,
-                    gd.name AS game_name,
-                    SUM(pt.duration) AS total_time,
-                    COUNT(*) AS sessions,
-                    NULL AS checksum -- Checksum is guaranteed to be NULL in this case
-                FROM
-                    play_time pt
-                    LEFT JOIN game_dict gd ON pt.game_id = gd.game_id
-                WHERE
-                    NOT EXISTS (SELECT 1 FROM game_file_checksum WHERE game_id = :game_id)
-                    AND pt.game_id = :game_id
-                    AND pt.date_time BETWEEN :begin AND :end
-                    AND pt.migrated IS NULL
-                GROUP BY
-                    date, pt.game_id, gd.name
-                ORDER BY
-                    date, game_name;
-            """,
-                {
-                    "begin": begin.isoformat(),
-                    "end": end.isoformat(),
-                    "game_id": game_id,
-                },
-            ).fetchall()
-
-        result = connection.execute(
-            """
+        return self.metrics.fetch_all(
+            connection,
+            (
+                "fetch_per_day_time_report.game"
+                if game_id
+                else "fetch_per_day_time_report"
+            ),
+            f"""
+            {_day_groups_cte(game_id)}
             SELECT
-                STRFTIME('%Y-%m-%d', pt.date_time) AS date,
-                pt.game_id,
-                gd.name AS game_name,
-                SUM(pt.duration) AS total_time,
-                COUNT(*) AS sessions,
-                gfc.checksum
-            FROM play_time pt
-            LEFT JOIN game_dict gd ON pt.game_id = gd.game_id
-            LEFT JOIN game_file_checksum gfc ON gfc.game_id = pt.game_id
-            WHERE pt.date_time BETWEEN :begin AND :end
-                AND pt.migrated IS NULL
-            GROUP BY
-                STRFTIME('%Y-%m-%d', pt.date_time),
-                pt.game_id,
-                gfc.checksum;
+                dg.date,
+                dg.game_id,
+                dg.game_name,
+                dg.total_time,
+                dg.sessions,
+                dg.checksum
+            FROM DayGroups dg
+            WHERE dg.position = 1
+            ORDER BY dg.date, {_representative_order(game_id, "dg")};
             """,
-            {"begin": begin.isoformat(), "end": end.isoformat()},
-        ).fetchall()
-        return result
+            _day_groups_params(begin, end, game_id),
+        )
 
     def fetch_all_game_sessions_report(self) -> List[tuple[str, SessionInformation]]:
-        with self._db.transactional() as connection:
+        with self._db.readonly() as connection:
             connection.row_factory = lambda c, row: (
                 row[0],  # game_id
                 SessionInformation(
@@ -572,7 +897,9 @@ class Dao:
                 ),
             )
 
-            return connection.execute(
+            return self.metrics.fetch_all(
+                connection,
+                "fetch_all_game_sessions_report",
                 """
                 SELECT
                     pt.game_id,
@@ -587,14 +914,14 @@ class Dao:
                 ON
                     pt.game_id = gfc.game_id
                 ORDER BY
-                    pt.game_id, pt.date_time;
+                    pt.game_id, pt.started_at_epoch, pt.date_time;
             """
-            ).fetchall()
+            )
 
     def fetch_all_last_playtime_session_information(
         self,
     ) -> Dict[str, SessionInformation]:
-        with self._db.transactional() as connection:
+        with self._db.readonly() as connection:
             connection.row_factory = lambda c, row: (
                 row[0],  # game_id
                 SessionInformation(
@@ -606,7 +933,9 @@ class Dao:
             )
 
             return dict(
-                connection.execute(
+                self.metrics.fetch_all(
+                    connection,
+                    "fetch_all_last_playtime_session_information",
                     """
                 SELECT
                     pt.game_id,
@@ -617,13 +946,15 @@ class Dao:
                 FROM (
                     SELECT
                         *,
-                        ROW_NUMBER() OVER (PARTITION BY game_id ORDER BY date_time DESC) AS rn
+                        ROW_NUMBER() OVER (
+                            PARTITION BY game_id ORDER BY started_at_epoch DESC, date_time DESC
+                        ) AS rn
                     FROM play_time
                 ) pt
                 LEFT JOIN game_file_checksum gfc ON gfc.game_id = pt.game_id
                 WHERE pt.rn = 1;
                 """
-                ).fetchall()
+                )
             )
 
     def fetch_sessions_for_period(
@@ -632,7 +963,7 @@ class Dao:
         end_time: datetime.datetime,
         game_id: Optional[str] = None,
     ) -> Dict[str, Dict[str, List[SessionInformation]]]:
-        with self._db.transactional() as connection:
+        with self._db.readonly() as connection:
             return self._fetch_sessions_for_period(
                 connection,
                 start_time,
@@ -647,67 +978,17 @@ class Dao:
         end_time: datetime.datetime,
         game_id: Optional[str] = None,
     ) -> Dict[str, Dict[str, List[SessionInformation]]]:
-        query = ""
-
-        if game_id is not None:
-            query = """
-            WITH TargetChecksums AS (
-                SELECT DISTINCT checksum
-                FROM game_file_checksum
-                WHERE game_id = :game_id
-            )
-            SELECT
-                strftime('%Y-%m-%d', pt.date_time) as session_date,
-                pt.game_id,
-                pt.date_time,
-                pt.duration,
-                pt.migrated,
-                gfc.checksum
-            FROM
-                play_time pt
-            LEFT JOIN
-                game_file_checksum gfc ON pt.game_id = gfc.game_id
-            WHERE
-                pt.date_time >= :start AND pt.date_time < :end
-                AND (
-                    pt.game_id = :game_id
-                    OR
-                    gfc.checksum IN (SELECT checksum FROM TargetChecksums)
-                )
-            ORDER BY
-                session_date, pt.game_id, pt.date_time;
-            """
-        else:
-            query = """
-            SELECT
-                strftime('%Y-%m-%d', pt.date_time) as session_date,
-                pt.game_id,
-                pt.date_time,
-                pt.duration,
-                pt.migrated,
-                gfc.checksum
-            FROM
-                play_time pt
-            LEFT JOIN
-                game_file_checksum gfc ON pt.game_id = gfc.game_id
-            WHERE
-                pt.date_time >= :start AND pt.date_time < :end
-            ORDER BY
-                session_date, pt.game_id, pt.date_time;
-            """
-
+        """
+        Sessions by day and by the game `_fetch_per_day_time_report` reports
+        their checksum group under. Sessions of a merged component are newest
+        first, sessions of a single game oldest first.
+        """
         params = {
-            "start": start_time.isoformat(),
-            "end": end_time.isoformat(),
+            **_day_groups_params(start_time, end_time, game_id),
+            "start_epoch": to_epoch(start_time),
+            "end_epoch": to_epoch(end_time),
         }
 
-        game_id_filter = ""
-        if game_id is not None:
-            game_id_filter = "AND pt.game_id = :game_id"
-            params["game_id"] = game_id
-
-        query = query.format(game_id_filter=game_id_filter)
-
         sessions_by_day_and_game: Dict[str, Dict[str, List[SessionInformation]]] = (
             defaultdict(lambda: defaultdict(list))
         )
@@ -723,7 +1004,44 @@ class Dao:
             ),
         )
 
-        rows = connection.execute(query, params).fetchall()
+        rows = self.metrics.fetch_all(
+            connection,
+            (
+                "fetch_sessions_for_period.game"
+                if game_id
+                else "fetch_sessions_for_period"
+            ),
+            f"""
+            {_day_groups_cte(game_id)}
+            SELECT
+                dg.date AS session_date,
+                representative.game_id,
+                pt.date_time,
+                pt.duration,
+                pt.migrated,
+                dg.checksum
+            FROM
+                play_time pt
+            JOIN DayGroups dg
+                ON dg.day_key = pt.day_key
+                AND dg.game_id = pt.game_id
+            JOIN DayGroups representative
+                ON representative.date = dg.date
+                AND representative.checksum IS dg.checksum
+                AND representative.ungrouped_game_id IS dg.ungrouped_game_id
+                AND representative.position = 1
+            WHERE
+                -- NOTE: Unary `+` keeps the planner on (day_key, game_id) lookups
+                +pt.started_at_epoch BETWEEN :start_epoch AND :end_epoch
+            ORDER BY
+                pt.day_key,
+                representative.game_id,
+                CASE WHEN dg.games > 1 THEN pt.date_time END DESC,
+                pt.started_at_epoch,
+                pt.date_time;
+            """,
+            params,
+        )
 
         for session_date, game_id_val, session_info in rows:
             sessions_by_day_and_game[session_date][game_id_val].append(session_info)
@@ -734,7 +1052,7 @@ class Dao:
         self,
         game_ids: Collection[str],
     ) -> Dict[str, SessionInformation]:
-        with self._db.transactional() as connection:
+        with self._db.readonly() as connection:
             return self._fetch_last_sessions_for_games(
                 connection,
                 game_ids,
@@ -768,7 +1086,9 @@ class Dao:
             FROM (
                 SELECT
                     *,
-                    ROW_NUMBER() OVER (PARTITION BY game_id ORDER BY date_time DESC) AS rn
+                    ROW_NUMBER() OVER (
+                        PARTITION BY game_id ORDER BY started_at_epoch DESC, date_time DESC
+                    ) AS rn
                 FROM play_time
                 WHERE game_id IN ({placeholders})
             ) pt
@@ -776,12 +1096,14 @@ class Dao:
             WHERE pt.rn = 1;
         """
 
-        rows = connection.execute(query, game_ids_list).fetchall()
+        rows = self.metrics.fetch_all(
+            connection, "fetch_last_sessions_for_games", query, game_ids_list
+        )
 
         return dict(rows)
 
     def get_game(self, game_id: str) -> GameInformationDto | None:
-        with self._db.transactional() as connection:
+        with self._db.readonly() as connection:
             return self._get_game(connection, game_id)
 
     def _get_game(
@@ -791,7 +1113,9 @@ class Dao:
             game_id=row[0], name=row[1], time=row[2]
         )
 
-        return connection.execute(
+        return self.metrics.fetch_one(
+            connection,
+            "get_game",
             """
             SELECT
                 gd.game_id,
@@ -805,10 +1129,10 @@ class Dao:
                 gd.game_id = ?
             """,
             (game_id,),
-        ).fetchone()
+        )
 
     def get_games_dictionary(self) -> List[GameDictionary]:
-        with self._db.transactional() as connection:
+        with self._db.readonly() as connection:
             return self._get_games_dictionary(connection)
 
     def _get_games_dictionary(
@@ -819,7 +1143,9 @@ class Dao:
             name=row[1],
         )
 
-        return connection.execute(
+        return self.metrics.fetch_all(
+            connection,
+            "get_games_dictionary",
             """
             SELECT
                 gd.game_id,
@@ -827,20 +1153,80 @@ class Dao:
             FROM
                 game_dict gd;
             """,
-        ).fetchall()
+        )
+
+    def get_games_dictionary_with_checksums(
+        self,
+    ) -> List[GameDictionaryWithChecksums]:
+        with self._db.readonly() as connection:
+            return self._get_games_dictionary_with_checksums(connection)
+
+    def _get_games_dictionary_with_checksums(
+        self, connection: sqlite3.Connection
+    ) -> List[GameDictionaryWithChecksums]:
+        """
+        Single ordered `LEFT JOIN`, rows of the same game are adjacent so they are
+        grouped in one pass.
+        """
+        result: List[GameDictionaryWithChecksums] = []
+        current: GameDictionaryWithChecksums | None = None
+
+        for row in self.metrics.fetch_all(
+            connection,
+            "get_games_dictionary_with_checksums",
+            """
+            SELECT
+                gd.game_id,
+                gd.name,
+                gfc.checksum_id,
+                gfc.checksum,
+                gfc.algorithm,
+                gfc.chunk_size,
+                gfc.region_count,
+                gfc.created_at,
+                gfc.updated_at
+            FROM
+                game_dict gd
+            LEFT JOIN game_file_checksum gfc ON gfc.game_id = gd.game_id
+            ORDER BY
+                gd.rowid, gfc.checksum, gfc.algorithm;
+            """
+        ):
+            if current is None or current.id != row[0]:
+                current = GameDictionaryWithChecksums(id=row[0], name=row[1], files=[])
+                result.append(current)
+
+            if row[2] is not None:
+                current.files.append(
+                    FileChecksum(
+                        row[2],
+                        row[0],
+                        row[1],
+                        row[3],
+                        row[4],
+                        row[5],
+                        row[6],
+                        row[7],
+                        row[8],
+                    )
+                )
+
+        return result
 
     def get_game_files_checksum(self, game_id: str) -> List[FileChecksum]:
-        with self._db.transactional() as connection:
+        with self._db.readonly() as connection:
             return self._get_game_files_checksum(connection, game_id)
 
     def _get_game_files_checksum(
         self, connection: sqlite3.Connection, game_id: str
     ) -> List[FileChecksum]:
         connection.row_factory = lambda c, row: FileChecksum(
-            row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7]
+            row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8]
         )
 
-        return connection.execute(
+        return self.metrics.fetch_all(
+            connection,
+            "get_game_files_checksum",
             """
             SELECT
                 gfc.checksum_id,
@@ -849,6 +1235,7 @@ class Dao:
                 gfc.checksum,
                 gfc.algorithm,
                 gfc.chunk_size,
+                gfc.region_count,
                 gfc.created_at,
                 gfc.updated_at
             FROM
@@ -858,7 +1245,7 @@ class Dao:
                 gfc.game_id = ?
             """,
             (game_id,),
-        ).fetchall()
+        )
 
     def save_game_checksum(
         self,
@@ -868,8 +1255,9 @@ class Dao:
         hash_chunk_size: int,
         hash_created_at: None | str,
         hash_updated_at: None | str,
+        hash_region_count: None | int = None,
     ) -> None:
-        with self._db.transactional() as connection:
+        with self._mutation() as connection:
             self._save_game_checksum(
                 connection,
                 game_id,
@@ -878,6 +1266,7 @@ class Dao:
                 hash_chunk_size,
                 hash_created_at,
                 hash_updated_at,
+                hash_region_count,
             )
 
     def _save_game_checksum(
@@ -889,11 +1278,14 @@ class Dao:
         hash_chunk_size: int,
         hash_created_at: None | str,
         hash_updated_at: None | str,
+        hash_region_count: None | int = None,
     ):
-        connection.execute(
+        self.metrics.execute(
+            connection,
+            "save_game_checksum",
             """
-                INSERT INTO game_file_checksum(game_id, checksum, algorithm, chunk_size, created_at, updated_at)
-                VALUES (?, ?, ?, ?, IFNULL(?, CURRENT_TIMESTAMP), IFNULL(?, CURRENT_TIMESTAMP))
+                INSERT INTO game_file_checksum(game_id, checksum, algorithm, chunk_size, created_at, updated_at, region_count)
+                VALUES (?, ?, ?, ?, IFNULL(?, CURRENT_TIMESTAMP), IFNULL(?, CURRENT_TIMESTAMP), ?)
                 """,
             (
                 game_id,
@@ -902,35 +1294,99 @@ class Dao:
                 hash_chunk_size,
                 hash_created_at,
                 hash_updated_at,
+                hash_region_count,
             ),
         )
+        refresh_game_components(connection, [game_id])
 
     def save_game_checksum_bulk(
         self,
-        checksums_data: List[Tuple[str, str, str, int, Optional[str], Optional[str]]],
+        checksums_data: List[
+            Tuple[str, str, str, int, Optional[str], Optional[str], Optional[int]]
+        ],
     ) -> None:
-        with self._db.transactional() as connection:
+        with self._mutation() as connection:
             self._save_game_checksum_bulk(connection, checksums_data)
 
     def _save_game_checksum_bulk(
         self,
         connection: sqlite3.Connection,
-        checksums_data: List[Tuple[str, str, str, int, Optional[str], Optional[str]]],
+        checksums_data: List[
+            Tuple[str, str, str, int, Optional[str], Optional[str], Optional[int]]
+        ],
     ):
-        connection.executemany(
+        inserted = self.metrics.execute_many(
+            connection,
+            "save_game_checksum_bulk",
             """
-            INSERT OR IGNORE INTO game_file_checksum(game_id, checksum, algorithm, chunk_size, created_at, updated_at)
-            VALUES (?, ?, ?, ?, IFNULL(?, CURRENT_TIMESTAMP), IFNULL(?, CURRENT_TIMESTAMP))
+            INSERT OR IGNORE INTO game_file_checksum(game_id, checksum, algorithm, chunk_size, created_at, updated_at, region_count)
+            VALUES (?, ?, ?, ?, IFNULL(?, CURRENT_TIMESTAMP), IFNULL(?, CURRENT_TIMESTAMP), ?)
             """,
             checksums_data,
-        )
+        ).rowcount
+
+        # NOTE: Checksums that are already stored leave the components as they are
+        if inserted > 0:
+            refresh_game_components(connection, {row[0] for row in checksums_data})
+
+    def replace_game_checksum_bulk(
+        self,
+        checksums_data: List[
+            Tuple[str, str, str, int, Optional[str], Optional[str], Optional[int]]
+        ],
+        replaced_checksums: List[Tuple[str, str, str, int, Optional[int]]],
+    ) -> None:
+        """
+        Saves `checksums_data` and removes the `(game_id, checksum, algorithm,
+        chunk_size, region_count)` rows they replace, in one transaction.
+        Other checksums of the same games, like linked aliases, are kept.
+        """
+        with self._mutation() as connection:
+            self._replace_game_checksum_bulk(
+                connection, checksums_data, replaced_checksums
+            )
+
+    def _replace_game_checksum_bulk(
+        self,
+        connection: sqlite3.Connection,
+        checksums_data: List[
+            Tuple[str, str, str, int, Optional[str], Optional[str], Optional[int]]
+        ],
+        replaced_checksums: List[Tuple[str, str, str, int, Optional[int]]],
+    ):
+        removed = self.metrics.execute_many(
+            connection,
+            "replace_game_checksum_bulk.remove",
+            """
+            DELETE FROM game_file_checksum
+            WHERE game_id = ? AND checksum = ? AND algorithm = ? AND chunk_size = ? AND region_count IS ?
+            """,
+            replaced_checksums,
+        ).rowcount
+        inserted = self.metrics.execute_many(
+            connection,
+            "replace_game_checksum_bulk.save",
+            """
+            INSERT OR IGNORE INTO game_file_checksum(game_id, checksum, algorithm, chunk_size, created_at, updated_at, region_count)
+            VALUES (?, ?, ?, ?, IFNULL(?, CURRENT_TIMESTAMP), IFNULL(?, CURRENT_TIMESTAMP), ?)
+            """,
+            checksums_data,
+        ).rowcount
+
+        # NOTE: Rescans of unchanged files only list checksums that are stored
+        if removed + inserted > 0:
+            refresh_game_components(
+                connection,
+                {row[0] for row in checksums_data}
+                | {row[0] for row in replaced_checksums},
+            )
 
     def remove_game_checksum(
         self,
         game_id: str,
         checksum: str,
     ) -> None:
-        with self._db.transactional() as connection:
+        with self._mutation() as connection:
             self._remove_game_checksum(
                 connection,
                 game_id,
@@ -943,7 +1399,9 @@ class Dao:
         game_id: str,
         checksum: str,
     ):
-        connection.execute(
+        self.metrics.execute(
+            connection,
+            "remove_game_checksum",
             """
                 DELETE FROM game_file_checksum WHERE game_id = ? AND checksum = ?
                 """,
@@ -952,12 +1410,13 @@ class Dao:
                 checksum,
             ),
         )
+        refresh_game_components(connection, [game_id])
 
     def remove_all_game_checksums(
         self,
         game_id: str,
     ) -> None:
-        with self._db.transactional() as connection:
+        with self._mutation() as connection:
             self._remove_all_game_checksums(
                 connection,
                 game_id,
@@ -968,17 +1427,20 @@ class Dao:
         connection: sqlite3.Connection,
         game_id: str,
     ):
-        connection.execute(
+        self.metrics.execute(
+            connection,
+            "remove_all_game_checksums",
             """
                 DELETE FROM game_file_checksum WHERE game_id = ?
                 """,
             (game_id,),
         )
+        refresh_game_components(connection, [game_id])
 
     def get_games_checksum(
         self,
     ) -> List[GamesChecksum]:
-        with self._db.transactional() as connection:
+        with self._db.readonly() as connection:
             return self._get_games_checksum(
                 connection,
             )
@@ -988,10 +1450,12 @@ class Dao:
         connection: sqlite3.Connection,
     ) -> List[GamesChecksum]:
         connection.row_factory = lambda c, row: GamesChecksum(
-            row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7]
+            row[0], row[1], row[2], row[3], row[4], row[5], row[6], row[7], row[8]
         )
 
-        return connection.execute(
+        return self.metrics.fetch_all(
+            connection,
+            "get_games_checksum",
             """
             SELECT
                 checksum_id,
@@ -1000,6 +1464,7 @@ class Dao:
                 checksum,
                 algorithm,
                 chunk_size,
+                region_count,
                 created_at,
                 updated_at
             FROM
@@ -1008,12 +1473,12 @@ class Dao:
                 game_dict gd
             ON gfc.game_id = gd.game_id;
             """,
-        ).fetchall()
+        )
 
     def remove_all_checksums(
         self,
     ) -> int:
-        with self._db.transactional() as connection:
+        with self._mutation() as connection:
             return self._remove_all_checksums(
                 connection,
             )
@@ -1022,20 +1487,27 @@ class Dao:
         self,
         connection: sqlite3.Connection,
     ) -> int:
-        cursor = connection.execute(
+        cursor = self.metrics.execute(
+            connection,
+            "remove_all_checksums",
             """
             DELETE
             FROM
                 game_file_checksum;
             """,
         )
+        self.metrics.execute(
+            connection,
+            "remove_all_checksums.game_component",
+            "DELETE FROM game_component",
+        )
 
         return cursor.rowcount
 
     def link_game_to_game_with_checksum(
         self, child_game_id: str, parent_game_id: str
     ) -> None:
-        with self._db.transactional() as connection:
+        with self._mutation() as connection:
             self._link_game_to_game_with_checksum(
                 connection, child_game_id, parent_game_id
             )
@@ -1046,14 +1518,17 @@ class Dao:
         child_game_id,
         parent_game_id,
     ):
-        return connection.execute(
+        cursor = self.metrics.execute(
+            connection,
+            "link_game_to_game_with_checksum",
             """
-                INSERT INTO game_file_checksum(game_id, checksum, algorithm, chunk_size)
+                INSERT INTO game_file_checksum(game_id, checksum, algorithm, chunk_size, region_count)
                 SELECT
                     ?,
                     gfc.checksum,
                     gfc.algorithm,
-                    gfc.chunk_size
+                    gfc.chunk_size,
+                    gfc.region_count
                 FROM
                     game_file_checksum AS gfc
                 WHERE
@@ -1065,3 +1540,92 @@ class Dao:
                 parent_game_id,
             ),
         )
+        refresh_game_components(connection, [child_game_id])
+
+        return cursor
+
+
+def _day_groups_cte(game_id: str | None) -> str:
+    """
+    `DayGroups`: every game played on a day of `:begin`..`:end` with the
+    totals of the games sharing its checksum on that day. A game is grouped
+    by its smallest checksum, games without one are never grouped. `position`
+    1 marks the game the group is reported under. With `game_id`, only the
+    game and the games sharing one of its checksums directly.
+    """
+    game_filter = ""
+
+    if game_id:
+        game_filter = """
+                AND (
+                    ptd.game_id = :game_id
+                    OR ptd.game_id IN (
+                        SELECT alias.game_id
+                        FROM game_file_checksum target
+                        JOIN game_file_checksum alias
+                            ON alias.checksum = target.checksum
+                        WHERE target.game_id = :game_id
+                    )
+                )"""
+
+    return f"""
+            WITH
+            DayGames AS (
+                SELECT
+                    ptd.date,
+                    CAST(strftime('%s', ptd.date) AS INTEGER) / 86400 AS day_key,
+                    ptd.game_id,
+                    gd.name AS game_name,
+                    ptd.duration,
+                    ptd.sessions,
+                    (
+                        SELECT MIN(gfc.checksum)
+                        FROM game_file_checksum gfc
+                        WHERE gfc.game_id = ptd.game_id
+                    ) AS checksum
+                FROM play_time_daily ptd
+                LEFT JOIN game_dict gd ON gd.game_id = ptd.game_id
+                WHERE ptd.date BETWEEN :begin AND :end{game_filter}
+            ),
+            DayGroups AS (
+                SELECT
+                    date,
+                    day_key,
+                    game_id,
+                    game_name,
+                    checksum,
+                    CASE WHEN checksum IS NULL THEN game_id END AS ungrouped_game_id,
+                    SUM(duration) OVER day_group AS total_time,
+                    SUM(sessions) OVER day_group AS sessions,
+                    COUNT(*) OVER day_group AS games,
+                    ROW_NUMBER() OVER (
+                        day_group ORDER BY {_representative_order(game_id)}
+                    ) AS position
+                FROM DayGames
+                WINDOW day_group AS (
+                    PARTITION BY
+                        date,
+                        checksum,
+                        CASE WHEN checksum IS NULL THEN game_id END
+                )
+            )"""
+
+
+def _representative_order(game_id: str | None, alias: str | None = None) -> str:
+    prefix = f"{alias}." if alias else ""
+
+    if game_id:
+        return f"{prefix}game_name, {prefix}game_id"
+
+    return f"{prefix}game_id"
+
+
+def _day_groups_params(
+    begin: datetime.datetime, end: datetime.datetime, game_id: str | None
+) -> Dict[str, str]:
+    params = {"begin": format_date(begin), "end": format_date(end)}
+
+    if game_id:
+        params["game_id"] = game_id
+
+    return params
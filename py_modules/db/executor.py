@@ -0,0 +1,49 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from py_modules.db.sqlite_db import DEFAULT_READERS
+
+T = TypeVar("T")
+
+
+class DbExecutor:
+    """
+    Runs blocking `Dao` work off the asyncio event loop.
+
+    Writes go through a single worker thread, so they are applied one after
+    another in submission order. Reads are spread over `readers` threads and
+    run concurrently with each other and with the writer.
+    """
+
+    def __init__(self, readers: int = DEFAULT_READERS) -> None:
+        self._writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="playtime-db-writer"
+        )
+        self._readers = ThreadPoolExecutor(
+            max_workers=readers, thread_name_prefix="playtime-db-reader"
+        )
+
+    async def read(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await self._run(self._readers, fn, *args, **kwargs)
+
+    async def write(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await self._run(self._writer, fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._readers.shutdown(wait=wait, cancel_futures=True)
+        self._writer.shutdown(wait=wait)
+
+    @staticmethod
+    async def _run(
+        executor: ThreadPoolExecutor,
+        fn: Callable[..., T],
+        *args: Any,
+        **kwargs: Any,
+    ) -> T:
+        loop = asyncio.get_running_loop()
+
+        return await loop.run_in_executor(
+            executor, functools.partial(fn, *args, **kwargs)
+        )
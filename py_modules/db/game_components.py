@@ -0,0 +1,188 @@
+import sqlite3
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+# NOTE: Stay well below SQLITE_MAX_VARIABLE_NUMBER on older SQLite builds
+_MAX_QUERY_PARAMETERS = 900
+
+
+class _DisjointSet:
+    """
+    Union-find where the root of every set is its smallest game id, so the
+    root doubles as the component leader.
+    """
+
+    def __init__(self) -> None:
+        self._parent: Dict[str, str] = {}
+
+    def add(self, item: str) -> None:
+        self._parent.setdefault(item, item)
+
+    def find(self, item: str) -> str:
+        root = item
+
+        while self._parent[root] != root:
+            root = self._parent[root]
+
+        while self._parent[item] != root:
+            self._parent[item], item = root, self._parent[item]
+
+        return root
+
+    def union(self, first: str, second: str) -> None:
+        first_root, second_root = self.find(first), self.find(second)
+
+        if first_root == second_root:
+            return
+
+        if second_root < first_root:
+            first_root, second_root = second_root, first_root
+
+        self._parent[second_root] = first_root
+
+    def components(self) -> Dict[str, List[str]]:
+        result: Dict[str, List[str]] = defaultdict(list)
+
+        for item in self._parent:
+            result[self.find(item)].append(item)
+
+        return result
+
+
+def rebuild_game_components(connection: sqlite3.Connection) -> None:
+    """
+    Recomputes `game_component` from scratch. Used to backfill the table.
+    """
+    rows = connection.execute(
+        "SELECT game_id, checksum, algorithm FROM game_file_checksum"
+    ).fetchall()
+
+    connection.execute("DELETE FROM game_component")
+    _save_components(connection, _union_by_checksum(rows))
+
+
+def refresh_game_components(
+    connection: sqlite3.Connection, game_ids: Iterable[str]
+) -> None:
+    """
+    Recomputes only the components touched by a checksum change of `game_ids`.
+
+    The affected nodes are the changed games, every game that shared a
+    component with them before the change and everything reachable from
+    those through checksums after the change. Components that are not
+    connected to a changed game are left untouched.
+    """
+    seeds = set(game_ids)
+
+    if not seeds:
+        return
+
+    affected = seeds | _previous_component_members(connection, seeds)
+    rows, reachable = _reachable_checksum_rows(connection, affected)
+
+    _delete_components(connection, affected | reachable)
+    _save_components(connection, _union_by_checksum(rows))
+
+
+def _union_by_checksum(
+    rows: Iterable[Tuple[str, str, str]],
+) -> Dict[str, List[str]]:
+    disjoint_set = _DisjointSet()
+    first_game_by_checksum: Dict[Tuple[str, str], str] = {}
+
+    for game_id, checksum, algorithm in rows:
+        disjoint_set.add(game_id)
+        key = (checksum, algorithm)
+
+        if key in first_game_by_checksum:
+            disjoint_set.union(first_game_by_checksum[key], game_id)
+        else:
+            first_game_by_checksum[key] = game_id
+
+    return disjoint_set.components()
+
+
+def _previous_component_members(
+    connection: sqlite3.Connection, game_ids: Set[str]
+) -> Set[str]:
+    members: Set[str] = set()
+
+    for chunk in _chunks(list(game_ids)):
+        placeholders = ", ".join("?" for _ in chunk)
+        members.update(
+            row[0]
+            for row in connection.execute(
+                f"""
+                SELECT game_id
+                FROM game_component
+                WHERE leader_id IN (
+                    SELECT leader_id FROM game_component WHERE game_id IN ({placeholders})
+                )
+                """,
+                chunk,
+            ).fetchall()
+        )
+
+    return members
+
+
+def _reachable_checksum_rows(
+    connection: sqlite3.Connection, game_ids: Set[str]
+) -> Tuple[List[Tuple[str, str, str]], Set[str]]:
+    visited: Set[str] = set()
+    rows: Set[Tuple[str, str, str]] = set()
+    frontier = set(game_ids)
+
+    while frontier:
+        visited |= frontier
+        discovered: Set[str] = set()
+
+        for chunk in _chunks(list(frontier)):
+            placeholders = ", ".join("?" for _ in chunk)
+
+            for row in connection.execute(
+                f"""
+                SELECT gfc.game_id, gfc.checksum, gfc.algorithm
+                FROM game_file_checksum gfc
+                WHERE (gfc.checksum, gfc.algorithm) IN (
+                    SELECT checksum, algorithm
+                    FROM game_file_checksum
+                    WHERE game_id IN ({placeholders})
+                )
+                """,
+                chunk,
+            ).fetchall():
+                rows.add(row)
+                discovered.add(row[0])
+
+        frontier = discovered - visited
+
+    return list(rows), visited
+
+
+def _delete_components(connection: sqlite3.Connection, game_ids: Set[str]) -> None:
+    for chunk in _chunks(list(game_ids)):
+        placeholders = ", ".join("?" for _ in chunk)
+        connection.execute(
+            f"DELETE FROM game_component WHERE game_id IN ({placeholders})", chunk
+        )
+
+
+def _save_components(
+    connection: sqlite3.Connection, components: Dict[str, List[str]]
+) -> None:
+    # NOTE: Games without aliases are not stored, queries fall back to their own id
+    connection.executemany(
+        "INSERT INTO game_component (game_id, leader_id) VALUES (?, ?)",
+        [
+            (game_id, leader_id)
+            for leader_id, members in components.items()
+            if len(members) > 1
+            for game_id in members
+        ],
+    )
+
+
+def _chunks(items: List[str]) -> Iterable[List[str]]:
+    for index in range(0, len(items), _MAX_QUERY_PARAMETERS):
+        yield items[index : index + _MAX_QUERY_PARAMETERS]
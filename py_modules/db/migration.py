@@ -1,5 +1,7 @@
+import sqlite3
 from dataclasses import dataclass
-from typing import List
+from typing import Callable, List
+from py_modules.db.game_components import rebuild_game_components
 from py_modules.db.sqlite_db import SqlLiteDb
 
 
@@ -7,6 +9,9 @@ from py_modules.db.sqlite_db import SqlLiteDb
 class Migration:
     version: int
     statements: List[str]
+    # Runs after `statements` in the same transaction, for data backfills
+    # which can not be expressed in plain SQL
+    procedure: Callable[[sqlite3.Connection], None] | None = None
 
 
 _migrations = [
@@ -116,38 +121,195 @@ _migrations = [
             """,
         ],
     ),
+    Migration(
+        7,
+        [
+            """
+            CREATE TABLE play_time_daily(
+                date TEXT NOT NULL,
+                game_id TEXT NOT NULL,
+                duration INT NOT NULL DEFAULT 0,
+                sessions INT NOT NULL DEFAULT 0,
+                PRIMARY KEY (date, game_id)
+            ) WITHOUT ROWID;
+            """,
+            """
+            INSERT INTO play_time_daily(date, game_id, duration, sessions)
+            SELECT
+                STRFTIME('%Y-%m-%d', date_time),
+                game_id,
+                SUM(duration),
+                COUNT(*)
+            FROM
+                play_time
+            WHERE
+                migrated IS NULL
+            GROUP BY
+                STRFTIME('%Y-%m-%d', date_time), game_id;
+            """,
+        ],
+    ),
+    Migration(
+        8,
+        [
+            """
+            CREATE TABLE game_component(
+                game_id TEXT PRIMARY KEY,
+                leader_id TEXT NOT NULL
+            ) WITHOUT ROWID;
+            """,
+            """
+            CREATE INDEX game_component_leader_id_idx ON game_component(leader_id);
+            """,
+        ],
+        rebuild_game_components,
+    ),
+    Migration(
+        9,
+        [
+            """
+            ALTER TABLE play_time ADD COLUMN started_at_epoch INTEGER;
+            """,
+            """
+            ALTER TABLE play_time ADD COLUMN day_key INTEGER;
+            """,
+            # NOTE: One set-based backfill, the whole migration is a single
+            # transaction, so batches would bound neither locks nor the WAL
+            """
+            UPDATE play_time
+            SET
+                started_at_epoch = CAST(STRFTIME('%s', date_time) AS INTEGER),
+                day_key = CAST(STRFTIME('%s', date_time) AS INTEGER) / 86400;
+            """,
+        ],
+    ),
+    Migration(
+        10,
+        [
+            """
+            CREATE INDEX IF NOT EXISTS
+                play_time_game_id_started_at_epoch_idx
+            ON
+                play_time(game_id, started_at_epoch);
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS
+                play_time_day_key_game_id_idx
+            ON
+                play_time(day_key, game_id);
+            """,
+        ],
+    ),
+    Migration(
+        11,
+        [
+            # NOTE: SQLite can not alter a CHECK constraint, rebuild the table
+            """
+            CREATE TABLE game_file_checksum_new(
+                checksum_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                game_id TEXT NOT NULL,
+                checksum TEXT NOT NULL,
+                algorithm TEXT NOT NULL CHECK(algorithm IN (
+                    'BLAKE2B', 'BLAKE2S',
+                    'SHA224', 'SHA256', 'SHA384', 'SHA512', 'SHA512_224', 'SHA512_256',
+                    'SHA3_224', 'SHA3_256', 'SHA3_384', 'SHA3_512',
+                    'SHAKE_128', 'SHAKE_256',
+                    'SAMPLED_SHA256'
+                )),
+                chunk_size INTEGER NOT NULL,
+                region_count INTEGER CHECK(
+                    (algorithm = 'SAMPLED_SHA256') = (region_count IS NOT NULL)
+                ),
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (game_id) REFERENCES game_dict(game_id),
+                UNIQUE (game_id, checksum, algorithm)
+            );
+            """,
+            """
+            INSERT INTO game_file_checksum_new(
+                checksum_id, game_id, checksum, algorithm, chunk_size,
+                created_at, updated_at
+            )
+            SELECT
+                checksum_id, game_id, checksum, algorithm, chunk_size,
+                created_at, updated_at
+            FROM
+                game_file_checksum;
+            """,
+            """
+            DROP TABLE game_file_checksum;
+            """,
+            """
+            ALTER TABLE game_file_checksum_new RENAME TO game_file_checksum;
+            """,
+            """
+            CREATE INDEX
+                game_file_checksum_checksum_algorithm_idx
+            ON
+                game_file_checksum(checksum, algorithm);
+            """,
+        ],
+    ),
 ]
 
 
+LATEST_VERSION = max(migration.version for migration in _migrations)
+
+
 class DbMigration:
+    """
+    Applies `_migrations` in order. Every applied version is recorded in the
+    `migration` table, `PRAGMA user_version` mirrors the latest one so a start
+    with an up-to-date schema costs a single pragma read.
+    """
+
     def __init__(self, db: SqlLiteDb):
         self.db = db
 
-    def _current_migration_version(self):
-        with self.db.transactional() as con:
-            con.execute("CREATE TABLE IF NOT EXISTS migration (id INT PRIMARY KEY);")
-            return con.execute(
-                "SELECT coalesce(max(id), 0) as max_id FROM migration"
-            ).fetchone()[0]
+    def migrate(self):
+        with self.db.transactional() as connection:
+            if self._schema_version(connection) == LATEST_VERSION:
+                return
+
+            # NOTE: `sqlite3` does not open a transaction before DDL on its own,
+            # without an explicit one a failed migration would be half applied
+            connection.execute("BEGIN IMMEDIATE")
+
+            version = self._recorded_version(connection)
+            self._check_not_newer(version)
+
+            for migration in _migrations:
+                if migration.version > version:
+                    self._apply(connection, migration)
 
-    def _migration(self, migration: Migration):
-        version = self._current_migration_version()
-        latest_version_in_migration = max(_migrations, key=lambda m: m.version).version
+            connection.execute(f"PRAGMA user_version = {LATEST_VERSION}")
 
-        if latest_version_in_migration < version:
+    @staticmethod
+    def _schema_version(connection: sqlite3.Connection) -> int:
+        return connection.execute("PRAGMA user_version").fetchone()[0]
+
+    @staticmethod
+    def _recorded_version(connection: sqlite3.Connection) -> int:
+        connection.execute("CREATE TABLE IF NOT EXISTS migration (id INT PRIMARY KEY);")
+
+        return connection.execute(
+            "SELECT coalesce(max(id), 0) as max_id FROM migration"
+        ).fetchone()[0]
+
+    @staticmethod
+    def _check_not_newer(version: int) -> None:
+        if LATEST_VERSION < version:
             raise Exception(
                 "Database have been updated with latest version. Please update plugin"
             )
 
-        if migration.version > version:
-            with self.db.transactional() as connection:
-                for stm in migration.statements:
-                    connection.execute(stm)
+    @staticmethod
+    def _apply(connection: sqlite3.Connection, migration: Migration) -> None:
+        for stm in migration.statements:
+            connection.execute(stm)
 
-                connection.execute(
-                    "INSERT INTO migration (id) VALUES (?)", [migration.version]
-                )
+        if migration.procedure is not None:
+            migration.procedure(connection)
 
-    def migrate(self):
-        for migration in _migrations:
-            self._migration(migration)
+        connection.execute("INSERT INTO migration (id) VALUES (?)", [migration.version])
@@ -0,0 +1,247 @@
+import dataclasses
+import logging
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List
+
+# 100ms, well above any report query on a Steam Deck
+DEFAULT_SLOW_QUERY_THRESHOLD_MS = 100.0
+# NOTE: Percentiles are computed over the most recent samples of each query
+DEFAULT_SAMPLES_PER_QUERY = 1024
+
+Parameters = Dict[str, Any] | Iterable[Any]
+
+
+@dataclasses.dataclass
+class QueryStatistics:
+    name: str
+    count: int
+    total_ms: float
+    mean_ms: float
+    p50_ms: float
+    p99_ms: float
+    max_ms: float
+    rows: int
+    slow: int
+
+
+@dataclasses.dataclass
+class DbMetrics:
+    slow_query_threshold_ms: float
+    queries: List[QueryStatistics]
+
+
+class _QueryCounters:
+    def __init__(self, samples: int) -> None:
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.durations: Deque[float] = deque(maxlen=samples)
+
+
+class QueryMetrics:
+    """
+    Per named query timings of `Dao` statements. A statement is timed until
+    its rows are fetched, SQLite evaluates `SELECT`s lazily while stepping.
+
+    Statements slower than `slow_query_threshold_ms` are logged with their
+    `EXPLAIN QUERY PLAN`, evaluated on the same connection and parameters.
+    """
+
+    def __init__(
+        self,
+        slow_query_threshold_ms: float = DEFAULT_SLOW_QUERY_THRESHOLD_MS,
+        logger: logging.Logger = logging.getLogger(),
+        samples_per_query: int = DEFAULT_SAMPLES_PER_QUERY,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        if slow_query_threshold_ms < 0:
+            raise ValueError('"slow_query_threshold_ms" can not be negative')
+
+        self._slow_query_threshold_s = slow_query_threshold_ms / 1000
+        self._logger = logger
+        self._samples_per_query = samples_per_query
+        self._clock = clock
+        self._counters: Dict[str, _QueryCounters] = {}
+        self._statements: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def fetch_all(
+        self,
+        connection: sqlite3.Connection,
+        name: str,
+        sql: str,
+        parameters: Parameters = (),
+    ) -> List[Any]:
+        started_at = self._clock()
+        rows = connection.execute(sql, parameters).fetchall()
+        self._record(connection, name, sql, parameters, started_at, len(rows))
+
+        return rows
+
+    def fetch_one(
+        self,
+        connection: sqlite3.Connection,
+        name: str,
+        sql: str,
+        parameters: Parameters = (),
+    ) -> Any:
+        started_at = self._clock()
+        row = connection.execute(sql, parameters).fetchone()
+        self._record(
+            connection, name, sql, parameters, started_at, 0 if row is None else 1
+        )
+
+        return row
+
+    def execute(
+        self,
+        connection: sqlite3.Connection,
+        name: str,
+        sql: str,
+        parameters: Parameters = (),
+    ) -> sqlite3.Cursor:
+        """
+        For statements without a result set, `rows` counts the changed rows.
+        """
+        started_at = self._clock()
+        cursor = connection.execute(sql, parameters)
+        self._record(
+            connection, name, sql, parameters, started_at, max(cursor.rowcount, 0)
+        )
+
+        return cursor
+
+    def execute_many(
+        self,
+        connection: sqlite3.Connection,
+        name: str,
+        sql: str,
+        seq_of_parameters: Iterable[Parameters],
+    ) -> sqlite3.Cursor:
+        seq_of_parameters = list(seq_of_parameters)
+        started_at = self._clock()
+        cursor = connection.executemany(sql, seq_of_parameters)
+        self._record(
+            connection,
+            name,
+            sql,
+            seq_of_parameters[0] if seq_of_parameters else None,
+            started_at,
+            max(cursor.rowcount, 0),
+        )
+
+        return cursor
+
+    def snapshot(self) -> DbMetrics:
+        with self._lock:
+            queries = [
+                _statistics(name, counters)
+                for name, counters in self._counters.items()
+            ]
+
+        return DbMetrics(
+            slow_query_threshold_ms=self._slow_query_threshold_s * 1000,
+            queries=sorted(queries, key=lambda query: query.total_ms, reverse=True),
+        )
+
+    def statements(self) -> Dict[str, str]:
+        """
+        Last SQL text executed under every query name.
+        """
+        with self._lock:
+            return dict(self._statements)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._statements.clear()
+
+    def _record(
+        self,
+        connection: sqlite3.Connection,
+        name: str,
+        sql: str,
+        parameters: Parameters | None,
+        started_at: float,
+        rows: int,
+    ) -> None:
+        duration_s = self._clock() - started_at
+        slow = duration_s > self._slow_query_threshold_s
+
+        with self._lock:
+            counters = self._counters.get(name)
+
+            if counters is None:
+                counters = self._counters[name] = _QueryCounters(
+                    self._samples_per_query
+                )
+
+            counters.count += 1
+            counters.total_s += duration_s
+            counters.max_s = max(counters.max_s, duration_s)
+            counters.rows += rows
+            counters.slow += slow
+            counters.durations.append(duration_s)
+            self._statements[name] = sql
+
+        if slow:
+            self._logger.warning(
+                "Slow query %s took %.1fms, %d row(s), plan:\n%s",
+                name,
+                duration_s * 1000,
+                rows,
+                explain_query_plan(connection, sql, parameters),
+            )
+
+
+def explain_query_plan(
+    connection: sqlite3.Connection, sql: str, parameters: Parameters | None = None
+) -> str:
+    """
+    `EXPLAIN QUERY PLAN` of `sql` as an indented tree, like the sqlite3 shell.
+    """
+    # NOTE: `Dao` sets `row_factory` on the connection, plan rows need plain tuples
+    cursor = connection.cursor()
+    cursor.row_factory = None
+
+    try:
+        plan = cursor.execute(
+            f"EXPLAIN QUERY PLAN {sql}", () if parameters is None else parameters
+        ).fetchall()
+    except sqlite3.Error as e:
+        return f"unavailable: {e}"
+    finally:
+        cursor.close()
+
+    depths: Dict[int, int] = {0: -1}
+    lines = []
+
+    for node_id, parent_id, _, detail in plan:
+        depths[node_id] = depths.get(parent_id, -1) + 1
+        lines.append(f"{'  ' * depths[node_id]}{detail}")
+
+    return "\n".join(lines)
+
+
+def _statistics(name: str, counters: _QueryCounters) -> QueryStatistics:
+    durations = sorted(counters.durations)
+
+    def percentile(p: float) -> float:
+        return durations[min(int(len(durations) * p), len(durations) - 1)] * 1000
+
+    return QueryStatistics(
+        name=name,
+        count=counters.count,
+        total_ms=counters.total_s * 1000,
+        mean_ms=counters.total_s / counters.count * 1000,
+        p50_ms=percentile(0.5),
+        p99_ms=percentile(0.99),
+        max_ms=counters.max_s * 1000,
+        rows=counters.rows,
+        slow=counters.slow,
+    )
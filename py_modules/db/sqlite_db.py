@@ -1,18 +1,234 @@
 import contextlib
+import queue
 import sqlite3
-from typing import Generator
+import threading
+from dataclasses import dataclass
+from typing import Generator, List, Tuple
+
+DEFAULT_READERS = 2
+DEFAULT_CACHED_STATEMENTS = 128
+
+_JOURNAL_MODES = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+_SYNCHRONOUS_MODES = ("OFF", "NORMAL", "FULL", "EXTRA")
+_TEMP_STORES = ("DEFAULT", "FILE", "MEMORY")
+
+
+@dataclass(frozen=True)
+class PragmaProfile:
+    """
+    Pragmas applied to every connection opened by `SqlLiteDb`.
+
+    `cache_size` follows SQLite semantics: a negative value is a size in KiB,
+    a positive one is a number of pages.
+    """
+
+    journal_mode: str = "WAL"
+    synchronous: str = "NORMAL"
+    cache_size: int = -8 * 1024
+    mmap_size: int = 64 * 1024 * 1024
+    temp_store: str = "MEMORY"
+    busy_timeout: int = 5000
+
+    def __post_init__(self):
+        self._validate_choice("journal_mode", self.journal_mode, _JOURNAL_MODES)
+        self._validate_choice("synchronous", self.synchronous, _SYNCHRONOUS_MODES)
+        self._validate_choice("temp_store", self.temp_store, _TEMP_STORES)
+
+        for field_name in ("cache_size", "mmap_size", "busy_timeout"):
+            if not isinstance(getattr(self, field_name), int):
+                raise ValueError(f'"{field_name}" must be a valid integer')
+
+        if self.mmap_size < 0 or self.busy_timeout < 0:
+            raise ValueError('"mmap_size" and "busy_timeout" can not be negative')
+
+    def statements(self) -> List[str]:
+        return [
+            f"PRAGMA busy_timeout = {self.busy_timeout}",
+            f"PRAGMA journal_mode = {self.journal_mode}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA cache_size = {self.cache_size}",
+            f"PRAGMA mmap_size = {self.mmap_size}",
+            f"PRAGMA temp_store = {self.temp_store}",
+        ]
+
+    @staticmethod
+    def _validate_choice(field_name: str, value: str, choices: Tuple[str, ...]):
+        if value.upper() not in choices:
+            raise ValueError(f'"{field_name}" must be one of: {", ".join(choices)}')
 
 
 class SqlLiteDb:
-    def __init__(self, database_path: str):
+    """
+    Small pool of long-lived connections: one writer and up to `readers`
+    read-only connections. Every connection keeps its own prepared statement
+    cache, so repeated `Dao` queries skip opening the file and re-parsing
+    the schema.
+    """
+
+    def __init__(
+        self,
+        database_path: str,
+        readers: int = DEFAULT_READERS,
+        cached_statements: int = DEFAULT_CACHED_STATEMENTS,
+        pragmas: PragmaProfile = PragmaProfile(),
+    ):
+        if readers < 1:
+            raise ValueError("SqlLiteDb requires at least one reader connection")
+
         self._database_path = database_path
+        self._cached_statements = cached_statements
+        self._pragmas = pragmas
+        self._closed = False
+
+        self._writer: sqlite3.Connection | None = None
+        self._writer_lock = threading.Lock()
+
+        self._idle_readers: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._readers_slots = threading.BoundedSemaphore(readers)
+
+        self._write_generation = 0
+        self._write_generation_lock = threading.Lock()
+
+    @property
+    def write_generation(self) -> int:
+        """
+        Monotonically increasing counter of committed mutations, shared by
+        every `Dao` built on top of this database.
+        """
+        return self._write_generation
+
+    def bump_write_generation(self) -> int:
+        with self._write_generation_lock:
+            self._write_generation += 1
+            return self._write_generation
 
     @contextlib.contextmanager
     def transactional(self) -> Generator[sqlite3.Connection, None, None]:
-        with sqlite3.connect(self._database_path) as connection:
+        with self._writer_lock:
+            self._ensure_open()
+
+            if self._writer is None or not self._is_healthy(self._writer):
+                self._discard(self._writer)
+                self._writer = self._connect()
+
+            connection = self._writer
+
             try:
                 yield connection
                 connection.commit()
             except Exception as exception:
                 connection.rollback()
                 raise exception
+            finally:
+                connection.row_factory = None
+
+    @contextlib.contextmanager
+    def readonly(self) -> Generator[sqlite3.Connection, None, None]:
+        self._readers_slots.acquire()
+
+        try:
+            self._ensure_open()
+            connection = self._borrow_reader()
+
+            try:
+                yield connection
+            finally:
+                self._return_reader(connection)
+        finally:
+            self._readers_slots.release()
+
+    @contextlib.contextmanager
+    def snapshot(self) -> Generator[sqlite3.Connection, None, None]:
+        """
+        Read-only connection inside one read transaction: every query sees the
+        same committed state, even if the writer commits in between. The
+        transaction is rolled back when the connection is returned.
+        """
+        with self.readonly() as connection:
+            connection.execute("BEGIN")
+            yield connection
+
+    def checkpoint(self) -> Tuple[int, int, int]:
+        """
+        Runs `PRAGMA wal_checkpoint(TRUNCATE)` on the writer connection and
+        returns SQLite's `(busy, log_frames, checkpointed_frames)` triple.
+        """
+        with self.transactional() as connection:
+            return connection.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+
+    def close(self) -> None:
+        with self._writer_lock:
+            self._closed = True
+            self._discard(self._writer)
+            self._writer = None
+
+        while True:
+            try:
+                self._discard(self._idle_readers.get_nowait())
+            except queue.Empty:
+                break
+
+    def _borrow_reader(self) -> sqlite3.Connection:
+        while True:
+            try:
+                connection = self._idle_readers.get_nowait()
+            except queue.Empty:
+                return self._connect(query_only=True)
+
+            if self._is_healthy(connection):
+                return connection
+
+            self._discard(connection)
+
+    def _return_reader(self, connection: sqlite3.Connection) -> None:
+        connection.row_factory = None
+
+        if self._closed:
+            self._discard(connection)
+            return
+
+        try:
+            if connection.in_transaction:
+                connection.rollback()
+        except sqlite3.Error:
+            self._discard(connection)
+            return
+
+        self._idle_readers.put(connection)
+
+    def _connect(self, query_only: bool = False) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self._database_path,
+            check_same_thread=False,
+            cached_statements=self._cached_statements,
+        )
+
+        for statement in self._pragmas.statements():
+            connection.execute(statement)
+
+        if query_only:
+            connection.execute("PRAGMA query_only = ON")
+
+        return connection
+
+    def _ensure_open(self) -> None:
+        if self._closed:
+            raise sqlite3.ProgrammingError("Database connection pool is closed")
+
+    @staticmethod
+    def _is_healthy(connection: sqlite3.Connection) -> bool:
+        try:
+            connection.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    @staticmethod
+    def _discard(connection: sqlite3.Connection | None) -> None:
+        if connection is None:
+            return
+
+        try:
+            connection.close()
+        except sqlite3.Error:
+            pass
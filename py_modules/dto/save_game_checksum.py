@@ -1,4 +1,8 @@
 from typing import Optional
+from py_modules.schemas.common import (
+    SAMPLED_CHECKSUM_ALGORITHMS,
+    STORED_CHECKSUM_ALGORITHMS,
+)
 
 
 class AddGameChecksumDTO:
@@ -7,8 +11,11 @@ class AddGameChecksumDTO:
         self.checksum = kwargs.get("checksum", None)
         self.algorithm = kwargs.get("algorithm", None)
         self.chunk_size = kwargs.get("chunk_size", None)
+        self.region_count = kwargs.get("region_count", None)
         self.created_at = kwargs.get("created_at", None)
         self.updated_at = kwargs.get("updated_at", None)
+        # NOTE: Checksum the same file had before it changed, replaced on save
+        self.previous_checksum = kwargs.get("previous_checksum", None)
 
         self.validate_required_fields()
 
@@ -25,7 +32,7 @@ class AddGameChecksumDTO:
             (
                 "algorithm",
                 self.algorithm,
-                "\"algorithm\" must be: 'SHA224', 'SHA256', 'SHA384', 'SHA512', 'SHA3_224', 'SHA3_256', 'SHA3_384', 'SHA3_512'",
+                f"\"algorithm\" must be: {', '.join(map(repr, STORED_CHECKSUM_ALGORITHMS))}",
             ),
             ("chunk_size", self.chunk_size, '"chunk_size" must be a valid integer'),
         ]
@@ -33,6 +40,15 @@ class AddGameChecksumDTO:
         for field_name, field_value, message in fields:
             self._validate_field(field_name, field_value, message)
 
+        # NOTE: Sampled fingerprints of the same file differ per region count
+        if (self.algorithm in SAMPLED_CHECKSUM_ALGORITHMS) != (
+            self.region_count is not None
+        ):
+            raise ValueError(
+                '"region_count" must be set only for sampled algorithms: '
+                f"{', '.join(map(repr, SAMPLED_CHECKSUM_ALGORITHMS))}"
+            )
+
     def to_dict(self):
         return self.__dict__
 
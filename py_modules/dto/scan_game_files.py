@@ -0,0 +1,67 @@
+from typing import Optional
+from py_modules.files import FINGERPRINT_REGION_COUNT, SHA256
+from py_modules.game_file_scanner import DEFAULT_EXTENSIONS, DEFAULT_MIN_SIZE
+from py_modules.schemas.common import STORED_CHECKSUM_ALGORITHMS
+
+
+class ScanGameFilesDTO:
+    def __init__(self, **kwargs):
+        self.roots = kwargs.get("roots", None)
+        self.game_ids_by_path = kwargs.get("game_ids_by_path", None) or {}
+        self.extensions = kwargs.get("extensions", None) or DEFAULT_EXTENSIONS
+        self.min_size = kwargs.get("min_size", None)
+        self.min_size = DEFAULT_MIN_SIZE if self.min_size is None else self.min_size
+        self.max_size = kwargs.get("max_size", None)
+        self.algorithm = kwargs.get("algorithm", None) or SHA256
+        self.chunk_size = kwargs.get("chunk_size", None)
+        self.region_count = kwargs.get("region_count", None) or FINGERPRINT_REGION_COUNT
+        self.job_id = kwargs.get("job_id", None)
+
+        self.validate_required_fields()
+
+    def _validate_field(
+        self, field_name: str, field_value: Optional[str], custom_message: str
+    ):
+        if field_value is None:
+            raise ValueError(f'"{field_name}" {custom_message}')
+
+    def validate_required_fields(self):
+        fields = [
+            ("roots", self.roots, '"roots" can not be null'),
+        ]
+
+        for field_name, field_value, message in fields:
+            self._validate_field(field_name, field_value, message)
+
+        if not self.roots:
+            raise ValueError('"roots" must contain at least one directory')
+
+        if self.algorithm not in STORED_CHECKSUM_ALGORITHMS:
+            raise ValueError(
+                f"\"algorithm\" must be: {', '.join(map(repr, STORED_CHECKSUM_ALGORITHMS))}"
+            )
+
+        for field_name, field_value in (
+            ("min_size", self.min_size),
+            ("max_size", self.max_size),
+            ("chunk_size", self.chunk_size),
+        ):
+            if field_value is None:
+                continue
+
+            if (
+                isinstance(field_value, bool)
+                or not isinstance(field_value, int)
+                or field_value < 0
+            ):
+                raise ValueError(f'"{field_name}" must be a non-negative integer')
+
+        if self.max_size is not None and self.max_size < self.min_size:
+            raise ValueError('"max_size" can not be smaller than "min_size"')
+
+    def to_dict(self):
+        return self.__dict__
+
+    @classmethod
+    def from_dict(cls, dict_obj):
+        return cls(**dict_obj)
@@ -0,0 +1,58 @@
+from typing import Optional
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 500
+
+
+class GetGameSessionsDTO:
+    def __init__(self, **kwargs):
+        self.game_id = kwargs.get("game_id", None)
+        self.cursor = kwargs.get("cursor", None)
+        self.limit = kwargs.get("limit", None)
+        self.limit = DEFAULT_LIMIT if self.limit is None else self.limit
+
+        self.validate_required_fields()
+
+    def _validate_field(
+        self, field_name: str, field_value: Optional[str], custom_message: str
+    ):
+        if field_value is None:
+            raise ValueError(f'"{field_name}" {custom_message}')
+
+    def validate_required_fields(self):
+        fields = [
+            ("game_id", self.game_id, '"game_id" can not be null'),
+        ]
+
+        for field_name, field_value, message in fields:
+            self._validate_field(field_name, field_value, message)
+
+        if (
+            not isinstance(self.limit, int)
+            or isinstance(self.limit, bool)
+            or not 0 < self.limit <= MAX_LIMIT
+        ):
+            raise ValueError(f'"limit" must be between 1 and {MAX_LIMIT}')
+
+        if self.cursor is not None and (
+            not isinstance(self.cursor, dict)
+            or not isinstance(self.cursor.get("date_time"), str)
+            or not isinstance(self.cursor.get("id"), int)
+            or isinstance(self.cursor.get("id"), bool)
+        ):
+            raise ValueError(
+                '"cursor" must contain a "date_time" string and an "id" integer'
+            )
+
+    def cursor_key(self):
+        if self.cursor is None:
+            return None
+
+        return self.cursor["date_time"], self.cursor["id"]
+
+    def to_dict(self):
+        return self.__dict__
+
+    @classmethod
+    def from_dict(cls, dict_obj):
+        return cls(**dict_obj)
@@ -0,0 +1,65 @@
+from typing import Optional
+
+
+class _SessionDTO:
+    REQUIRED_FIELDS = ()
+
+    def __init__(self, **kwargs):
+        self.game_id = kwargs.get("game_id", None)
+
+        self.validate_required_fields()
+
+    def _validate_field(
+        self, field_name: str, field_value: Optional[str], custom_message: str
+    ):
+        if field_value is None:
+            raise ValueError(f'"{field_name}" {custom_message}')
+
+    def validate_required_fields(self):
+        for field_name, message in self.REQUIRED_FIELDS:
+            self._validate_field(field_name, getattr(self, field_name), message)
+
+    def to_dict(self):
+        return self.__dict__
+
+    @classmethod
+    def from_dict(cls, dict_obj):
+        return cls(**dict_obj)
+
+
+class SessionStartDTO(_SessionDTO):
+    REQUIRED_FIELDS = (
+        ("game_id", '"game_id" can not be null'),
+        ("game_name", '"game_name" must be a valid value'),
+        ("started_at", '"started_at" must be a valid date'),
+    )
+
+    def __init__(self, **kwargs):
+        self.game_name = kwargs.get("game_name", None)
+        self.started_at = kwargs.get("started_at", None)
+
+        super().__init__(**kwargs)
+
+
+class SessionHeartbeatDTO(_SessionDTO):
+    REQUIRED_FIELDS = (
+        ("game_id", '"game_id" can not be null'),
+        ("at", '"at" must be a valid date'),
+    )
+
+    def __init__(self, **kwargs):
+        self.at = kwargs.get("at", None)
+
+        super().__init__(**kwargs)
+
+
+class SessionEndDTO(_SessionDTO):
+    REQUIRED_FIELDS = (
+        ("game_id", '"game_id" can not be null'),
+        ("ended_at", '"ended_at" must be a valid date'),
+    )
+
+    def __init__(self, **kwargs):
+        self.ended_at = kwargs.get("ended_at", None)
+
+        super().__init__(**kwargs)
@@ -0,0 +1,234 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Tuple
+
+from py_modules.db.sqlite_db import SqlLiteDb
+
+DEFAULT_MAX_ENTRIES = 20_000
+# NOTE: Hits only note their use in memory, written in batches of this size
+TOUCH_BATCH_SIZE = 256
+# NOTE: Bump on every change of `file_hash`, old entries are simply dropped
+SCHEMA_VERSION = 1
+
+
+class FileHashCache:
+    """
+    Persistent digest cache in a sidecar SQLite file.
+
+    An entry is only valid while `(st_dev, st_ino, st_size, st_mtime_ns)` of
+    the path are unchanged, so a hit needs a `stat` but never opens the file.
+    Once there are more than `max_entries`, the least recently used entries
+    are evicted. `region_count` is 0 for head and tail digests.
+
+    A hit is read-only, its `last_used_at` is written later together with
+    other hits: on the next `put`, every `TOUCH_BATCH_SIZE` hits or on `close`.
+    """
+
+    def __init__(
+        self,
+        database_path: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        clock: Callable[[], int] = time.time_ns,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+
+        self._db = SqlLiteDb(database_path, readers=1)
+        self._max_entries = max_entries
+        self._clock = clock
+        self._touched: Dict[Tuple[str, str, int, int], int] = {}
+        self._touched_lock = threading.Lock()
+
+        with self._db.transactional() as connection:
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+
+            if version != SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS file_hash")
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS file_hash (
+                    path TEXT NOT NULL,
+                    algorithm TEXT NOT NULL,
+                    chunk_size INTEGER NOT NULL,
+                    region_count INTEGER NOT NULL,
+                    st_dev INTEGER NOT NULL,
+                    st_ino INTEGER NOT NULL,
+                    st_size INTEGER NOT NULL,
+                    st_mtime_ns INTEGER NOT NULL,
+                    digest TEXT NOT NULL,
+                    last_used_at INTEGER NOT NULL,
+                    PRIMARY KEY (path, algorithm, chunk_size, region_count)
+                )
+                """
+            )
+            connection.execute(
+                """
+                CREATE INDEX IF NOT EXISTS file_hash_last_used_at_idx
+                ON file_hash(last_used_at)
+                """
+            )
+            self._entries = connection.execute(
+                "SELECT COUNT(*) FROM file_hash"
+            ).fetchone()[0]
+
+    def get(
+        self,
+        path: str,
+        stat: os.stat_result,
+        algorithm: str,
+        chunk_size: int,
+        region_count: int = 0,
+    ) -> str | None:
+        with self._db.readonly() as connection:
+            row = connection.execute(
+                """
+                SELECT digest
+                FROM file_hash
+                WHERE path = ? AND algorithm = ? AND chunk_size = ? AND region_count = ?
+                    AND st_dev = ? AND st_ino = ? AND st_size = ? AND st_mtime_ns = ?
+                """,
+                (
+                    path,
+                    algorithm,
+                    chunk_size,
+                    region_count,
+                    stat.st_dev,
+                    stat.st_ino,
+                    stat.st_size,
+                    stat.st_mtime_ns,
+                ),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        with self._touched_lock:
+            self._touched[(path, algorithm, chunk_size, region_count)] = self._clock()
+            flush = len(self._touched) >= TOUCH_BATCH_SIZE
+
+        if flush:
+            with self._db.transactional() as connection:
+                self._flush_touched(connection)
+
+        return row[0]
+
+    def get_previous(
+        self,
+        path: str,
+        algorithm: str,
+        chunk_size: int,
+        region_count: int = 0,
+    ) -> str | None:
+        """
+        Digest last recorded for `path`, whether or not the file changed since.
+        """
+        with self._db.readonly() as connection:
+            row = connection.execute(
+                """
+                SELECT digest
+                FROM file_hash
+                WHERE path = ? AND algorithm = ? AND chunk_size = ? AND region_count = ?
+                """,
+                (path, algorithm, chunk_size, region_count),
+            ).fetchone()
+
+        return None if row is None else row[0]
+
+    def put(
+        self,
+        path: str,
+        stat: os.stat_result,
+        algorithm: str,
+        chunk_size: int,
+        digest: str,
+        region_count: int = 0,
+    ) -> None:
+        file_version = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+        with self._db.transactional() as connection:
+            self._flush_touched(connection)
+            inserted = connection.execute(
+                """
+                INSERT OR IGNORE INTO file_hash (
+                    path, algorithm, chunk_size, region_count, st_dev, st_ino, st_size,
+                    st_mtime_ns, digest, last_used_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    path,
+                    algorithm,
+                    chunk_size,
+                    region_count,
+                    *file_version,
+                    digest,
+                    self._clock(),
+                ),
+            ).rowcount
+
+            if inserted == 0:
+                connection.execute(
+                    """
+                    UPDATE file_hash
+                    SET st_dev = ?, st_ino = ?, st_size = ?, st_mtime_ns = ?, digest = ?,
+                        last_used_at = ?
+                    WHERE path = ? AND algorithm = ? AND chunk_size = ? AND region_count = ?
+                    """,
+                    (
+                        *file_version,
+                        digest,
+                        self._clock(),
+                        path,
+                        algorithm,
+                        chunk_size,
+                        region_count,
+                    ),
+                )
+
+            # NOTE: The row count is tracked, so a put never counts the table
+            self._entries += inserted
+
+            if self._entries > self._max_entries:
+                self._entries -= connection.execute(
+                    """
+                    DELETE FROM file_hash
+                    WHERE rowid IN (
+                        SELECT rowid FROM file_hash ORDER BY last_used_at LIMIT ?
+                    )
+                    """,
+                    (self._entries - self._max_entries,),
+                ).rowcount
+
+    def clear(self) -> None:
+        with self._db.transactional() as connection:
+            with self._touched_lock:
+                self._touched.clear()
+
+            connection.execute("DELETE FROM file_hash")
+            self._entries = 0
+
+    def close(self) -> None:
+        if self._touched:
+            with self._db.transactional() as connection:
+                self._flush_touched(connection)
+
+        self._db.close()
+
+    def _flush_touched(self, connection: sqlite3.Connection) -> None:
+        with self._touched_lock:
+            touched, self._touched = self._touched, {}
+
+        if not touched:
+            return
+
+        connection.executemany(
+            """
+            UPDATE file_hash SET last_used_at = ?
+            WHERE path = ? AND algorithm = ? AND chunk_size = ? AND region_count = ?
+            """,
+            [(last_used_at, *key) for key, last_used_at in touched.items()],
+        )
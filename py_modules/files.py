@@ -1,16 +1,46 @@
 # https://www.geeksforgeeks.org/sha-in-python/
 import hashlib
+import mmap
 import os
+import stat
+import struct
 import sys
+from typing import BinaryIO, Callable, Dict, List
+
+from py_modules.file_hash_cache import FileHashCache
+from py_modules.schemas.common import (
+    CHECKSUM_ALGORITHMS,
+    ChecksumAlgorithm,
+    SampledChecksumAlgorithm,
+    StoredChecksumAlgorithm,
+)
 
 data_dir = os.environ["DECKY_PLUGIN_RUNTIME_DIR"]
 
 # 16MB
 CHUNK_SIZE = 16 * 1024 * 1024
+SHA256: ChecksumAlgorithm = "SHA256"
+
+# NOTE: SHAKE has a variable output length, use the security level of each
+# variant in bits * 2, like SHA3 does
+SHAKE_DIGEST_SIZES: Dict[ChecksumAlgorithm, int] = {"SHAKE_128": 32, "SHAKE_256": 64}
+
+SAMPLED_SHA256: SampledChecksumAlgorithm = "SAMPLED_SHA256"
+# 16 x 1MB, half of the I/O of the head and tail digest
+FINGERPRINT_REGION_COUNT = 16
+FINGERPRINT_REGION_SIZE = 1024 * 1024
+# NOTE: Prefixed to every sampled fingerprint, so it can never be equal to a
+# plain digest of the same bytes. Bump the version when the layout changes
+_FINGERPRINT_HEADER = struct.Struct("<8sQQQ")
+_FINGERPRINT_MAGIC = b"PTSMPL01"
 
 
 class Files:
-    # NOTE(ynhhoJ): https://stackoverflow.com/a/44873382
+    hash_cache: FileHashCache | None
+
+    def __init__(self, hash_cache: FileHashCache | None = None) -> None:
+        self.hash_cache = hash_cache
+
     def get_file_sha256(
         self, file_path: str, chunk_size: int = CHUNK_SIZE
     ) -> None | str:
@@ -24,29 +54,307 @@ class Files:
         Returns:
             str: `sha256` hex digest of the file.
         """
+        return self.get_file_digest(file_path, SHA256, chunk_size)
+
+    # NOTE(ynhhoJ): https://stackoverflow.com/a/44873382
+    def get_file_digest(
+        self,
+        file_path: str,
+        algorithm: ChecksumAlgorithm = SHA256,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> None | str:
+        """
+        Compute a hash of the first and last `chunk` of a file with any
+        `ChecksumAlgorithm`. If the file is smaller than `chunk_size * 2`,
+        hash the entire file.
+
+        When a `hash_cache` is set and the file did not change since it was
+        last hashed, the cached digest is returned without opening the file.
+
+        Args:
+            `file_path` (str): Path to the file.
+            `algorithm` (ChecksumAlgorithm): Name as stored in `game_file_checksum`.
+            `chunk_size` (int): Size of the head and of the tail to hash.
+
+        Returns:
+            str: hex digest of the file.
+        """
 
         if sys.version_info < (3, 11):
             raise RuntimeError(
                 "Minimum required version of Python is 3.11.0 which supports: hashlib.file_digest"
             )
 
+        if algorithm not in CHECKSUM_ALGORITHMS:
+            raise ValueError(
+                f'"algorithm" must be one of: {", ".join(CHECKSUM_ALGORITHMS)}'
+            )
+
+        return self._get_digest(
+            file_path,
+            algorithm,
+            chunk_size,
+            0,
+            lambda f, file_size: self._digest_of_head_and_tail(
+                f, file_size, algorithm, chunk_size
+            ),
+        )
+
+    def get_file_fingerprint(
+        self,
+        file_path: str,
+        region_count: int = FINGERPRINT_REGION_COUNT,
+        region_size: int = FINGERPRINT_REGION_SIZE,
+    ) -> None | str:
+        """
+        Compute a SHA256 hash of the file size and of `region_count` regions
+        of `region_size` bytes, spread evenly from the first to the last byte
+        of a file. Unlike `get_file_digest` the middle of huge images is
+        sampled too, the I/O cost stays `region_count * region_size`.
+        If the file is not larger than that, hash the entire file.
+
+        Stored as `SAMPLED_SHA256` with `chunk_size = region_size`, a
+        fingerprint is only comparable to one with the same `region_count`.
+
+        Args:
+            `file_path` (str): Path to the file.
+            `region_count` (int): Number of sampled regions, at least 2.
+            `region_size` (int): Size of every region.
+
+        Returns:
+            str: `sha256` hex digest of the sampled regions.
+        """
+
+        if region_count < 2:
+            raise ValueError('"region_count" must be at least 2')
+
+        if region_size < 1:
+            raise ValueError('"region_size" must be positive')
+
+        return self._get_digest(
+            file_path,
+            SAMPLED_SHA256,
+            region_size,
+            region_count,
+            lambda f, file_size: self._digest_of_regions(
+                f, file_size, region_count, region_size
+            ),
+        )
+
+    def get_cached_digest(
+        self,
+        file_path: str,
+        file_stat: os.stat_result,
+        algorithm: StoredChecksumAlgorithm,
+        chunk_size: int,
+        region_count: int = 0,
+    ) -> None | str:
+        """
+        Digest of an unchanged file from `hash_cache`, the file is not opened.
+        `region_count` is 0 for `get_file_digest` digests.
+        """
+        if self.hash_cache is None:
+            return None
+
+        return self.hash_cache.get(
+            file_path, file_stat, algorithm, chunk_size, region_count
+        )
+
+    def get_previous_digest(
+        self,
+        file_path: str,
+        algorithm: StoredChecksumAlgorithm,
+        chunk_size: int,
+        region_count: int = 0,
+    ) -> None | str:
+        """
+        Digest `hash_cache` recorded for `file_path` before it changed.
+        """
+        if self.hash_cache is None:
+            return None
+
+        return self.hash_cache.get_previous(
+            file_path, algorithm, chunk_size, region_count
+        )
+
+    def _get_digest(
+        self,
+        file_path: str,
+        algorithm: StoredChecksumAlgorithm,
+        chunk_size: int,
+        region_count: int,
+        digest_of_file: Callable[[BinaryIO, int], str],
+    ) -> None | str:
         file_path = file_path.strip('"').strip("'")
 
-        if not os.path.isfile(file_path):
+        try:
+            file_stat = os.stat(file_path)
+        except OSError:
             return None
 
-        file_size = os.path.getsize(file_path)
-        hasher = hashlib.sha256()
+        if not stat.S_ISREG(file_stat.st_mode):
+            return None
+
+        cached_digest = self.get_cached_digest(
+            file_path, file_stat, algorithm, chunk_size, region_count
+        )
+
+        if cached_digest is not None:
+            return cached_digest
 
         with open(file_path, "rb") as f:
+            digest = digest_of_file(f, file_stat.st_size)
+            stat_after_read = os.fstat(f.fileno())
+
+        # NOTE: Do not cache a digest of a file that was modified while reading it
+        if self.hash_cache is not None and _is_same_file_version(
+            file_stat, stat_after_read
+        ):
+            self.hash_cache.put(
+                file_path, file_stat, algorithm, chunk_size, digest, region_count
+            )
+
+        return digest
+
+    def _digest_of_head_and_tail(
+        self,
+        f: BinaryIO,
+        file_size: int,
+        algorithm: ChecksumAlgorithm,
+        chunk_size: int,
+    ) -> str:
+        hashlib_name = algorithm.lower()
+        file_descriptor = f.fileno()
+
+        _advise(file_descriptor, "POSIX_FADV_SEQUENTIAL")
+
+        try:
             if file_size <= chunk_size * 2:
-                return hashlib.file_digest(f, "sha256").hexdigest()
+                return _hexdigest(hashlib.file_digest(f, hashlib_name), algorithm)
+
+            hasher = hashlib.new(hashlib_name)
+
+            try:
+                mapped = mmap.mmap(file_descriptor, 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # NOTE: Some file systems (e.g. FUSE mounts) can not be mapped
+                mapped = None
+
+            if mapped is None:
+                self._update_with_read_head_and_tail(hasher, f, chunk_size)
+            else:
+                with mapped:
+                    _update_with_mapped_head_and_tail(hasher, mapped, chunk_size)
+
+            return _hexdigest(hasher, algorithm)
+        finally:
+            # NOTE: Hashed pages are not needed anymore, drop them before they
+            # push the pages of the running game out of the page cache
+            _advise(file_descriptor, "POSIX_FADV_DONTNEED")
+
+    def _update_with_read_head_and_tail(
+        self, hasher, f: BinaryIO, chunk_size: int
+    ) -> None:
+        first_chunk = f.read(chunk_size)
+        hasher.update(memoryview(first_chunk))
+
+        f.seek(-chunk_size, os.SEEK_END)
+        last_chunk = f.read(chunk_size)
+        hasher.update(memoryview(last_chunk))
+
+    def _digest_of_regions(
+        self, f: BinaryIO, file_size: int, region_count: int, region_size: int
+    ) -> str:
+        hasher = hashlib.sha256(
+            _FINGERPRINT_HEADER.pack(
+                _FINGERPRINT_MAGIC, file_size, region_count, region_size
+            )
+        )
+        file_descriptor = f.fileno()
+
+        # NOTE: Regions are far apart, read-ahead past them is wasted I/O
+        _advise(file_descriptor, "POSIX_FADV_RANDOM")
+
+        try:
+            if file_size <= region_count * region_size:
+                return hashlib.file_digest(f, lambda: hasher).hexdigest()
+
+            offsets = fingerprint_region_offsets(file_size, region_count, region_size)
+
+            try:
+                mapped = mmap.mmap(file_descriptor, 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                mapped = None
+
+            if mapped is None:
+                for offset in offsets:
+                    hasher.update(os.pread(file_descriptor, region_size, offset))
+            else:
+                with mapped, memoryview(mapped) as view:
+                    for offset in offsets:
+                        with view[offset : offset + region_size] as region:
+                            hasher.update(region)
+
+            return hasher.hexdigest()
+        finally:
+            _advise(file_descriptor, "POSIX_FADV_DONTNEED")
+
+
+def fingerprint_region_offsets(
+    file_size: int, region_count: int, region_size: int
+) -> List[int]:
+    """
+    Deterministic start offsets of the sampled regions. The first region
+    starts at the first byte and the last one ends at the last byte, the
+    others are spaced evenly in between.
+    """
+    last_offset = file_size - region_size
+
+    return [
+        index * last_offset // (region_count - 1) for index in range(region_count)
+    ]
+
+
+def _update_with_mapped_head_and_tail(
+    hasher, mapped: mmap.mmap, chunk_size: int
+) -> None:
+    """
+    Hashes the head and the tail straight from the page cache, no `bytes`
+    copies of the chunks are allocated.
+    """
+    if hasattr(mmap, "MADV_SEQUENTIAL"):
+        mapped.madvise(mmap.MADV_SEQUENTIAL)
+
+    with memoryview(mapped) as view:
+        with view[:chunk_size] as head:
+            hasher.update(head)
+
+        with view[-chunk_size:] as tail:
+            hasher.update(tail)
+
+
+def _advise(file_descriptor: int, advice_name: str) -> None:
+    # NOTE: `posix_fadvise` is only a hint and missing outside of Linux
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    try:
+        os.posix_fadvise(file_descriptor, 0, 0, getattr(os, advice_name))
+    except OSError:
+        pass
+
+
+def _hexdigest(hasher, algorithm: ChecksumAlgorithm) -> str:
+    if algorithm in SHAKE_DIGEST_SIZES:
+        return hasher.hexdigest(SHAKE_DIGEST_SIZES[algorithm])
 
-            first_chunk = f.read(chunk_size)
-            hasher.update(memoryview(first_chunk))
+    return hasher.hexdigest()
 
-            f.seek(-chunk_size, os.SEEK_END)
-            last_chunk = f.read(chunk_size)
-            hasher.update(memoryview(last_chunk))
 
-        return hasher.hexdigest()
+def _is_same_file_version(before: os.stat_result, after: os.stat_result) -> bool:
+    return (before.st_dev, before.st_ino, before.st_size, before.st_mtime_ns) == (
+        after.st_dev,
+        after.st_ino,
+        after.st_size,
+        after.st_mtime_ns,
+    )
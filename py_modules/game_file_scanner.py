@@ -0,0 +1,292 @@
+import asyncio
+import logging
+import os
+import stat
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterator, List, Sequence, Tuple
+
+from py_modules.bulk_hashing import (
+    SAVE_BATCH_SIZE,
+    BulkFileHasher,
+    BulkHashProgress,
+    FileHashRequest,
+    default_chunk_size,
+)
+from py_modules.dto.save_game_checksum import AddGameChecksumDTO
+from py_modules.files import FINGERPRINT_REGION_COUNT, SHA256, Files
+from py_modules.schemas.common import (
+    SAMPLED_CHECKSUM_ALGORITHMS,
+    STORED_CHECKSUM_ALGORITHMS,
+    StoredChecksumAlgorithm,
+)
+
+logger = logging.getLogger()
+
+DEFAULT_EXTENSIONS: Tuple[str, ...] = (".exe", ".appimage", ".x86_64")
+# 1MB, skips launcher stubs and scripts
+DEFAULT_MIN_SIZE = 1024 * 1024
+# NOTE: Wine prefixes ship thousands of system executables below `windows`
+EXCLUDED_DIRECTORIES = frozenset({"windows"})
+
+
+@dataclass
+class DiscoveredFile:
+    path: str
+    stat: os.stat_result
+
+
+@dataclass
+class ScannedGameFile:
+    game_id: str | None
+    path: str
+    size: int
+    checksum: str | None
+    unchanged: bool
+
+
+@dataclass
+class GameFileScanSummary:
+    discovered: int
+    unchanged: int
+    hashed: int
+    failed: int
+    cancelled: bool
+    elapsed_s: float
+    files_per_second: float
+    # NOTE: Bytes actually read for hashing, not the size of the hashed files
+    mb_per_second: float
+    files: List[ScannedGameFile]
+
+
+def normalize_path(path: str) -> str:
+    return os.path.normpath(os.path.expanduser(path.strip('"').strip("'")))
+
+
+def discover_game_files(
+    roots: Sequence[str],
+    extensions: Sequence[str] = DEFAULT_EXTENSIONS,
+    min_size: int = DEFAULT_MIN_SIZE,
+    max_size: int | None = None,
+) -> Iterator[DiscoveredFile]:
+    """
+    Walks `roots` with `os.scandir`, without following directory symlinks.
+    Hidden and `EXCLUDED_DIRECTORIES` are skipped, unreadable directories
+    are ignored. Every file is reported once, even if roots overlap.
+    """
+    suffixes = tuple(extension.lower() for extension in extensions)
+    stack = [normalize_path(root) for root in reversed(roots)]
+    seen_paths = set()
+
+    while stack:
+        directory = stack.pop()
+
+        try:
+            with os.scandir(directory) as entries:
+                subdirectories = []
+
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith(".") and (
+                            entry.name.lower() not in EXCLUDED_DIRECTORIES
+                        ):
+                            subdirectories.append(entry.path)
+
+                        continue
+
+                    if not entry.name.lower().endswith(suffixes):
+                        continue
+
+                    try:
+                        file_stat = entry.stat()
+                    except OSError:
+                        continue
+
+                    if (
+                        not stat.S_ISREG(file_stat.st_mode)
+                        or file_stat.st_size < min_size
+                        or (max_size is not None and file_stat.st_size > max_size)
+                        or entry.path in seen_paths
+                    ):
+                        continue
+
+                    seen_paths.add(entry.path)
+                    yield DiscoveredFile(entry.path, file_stat)
+        except OSError as e:
+            logger.debug("Can not scan %s: %s", directory, e)
+            continue
+
+        stack.extend(sorted(subdirectories, reverse=True))
+
+
+class GameFileScanner:
+    """
+    Finds game executables below a set of roots and fingerprints them on the
+    `BulkFileHasher` pool. Files that did not change since a previous scan are
+    served by `Files.hash_cache` by `stat` alone, only new and changed files
+    are read. Checksums of files listed in `game_ids_by_path` are saved through
+    `save_checksums`. The checksum of a changed file replaces the one recorded
+    for its path, other checksums of the game are kept.
+    """
+
+    def __init__(
+        self,
+        files: Files,
+        save_checksums: Callable[[List[AddGameChecksumDTO]], Awaitable[None]],
+        save_batch_size: int = SAVE_BATCH_SIZE,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self._files = files
+        self._save_checksums = save_checksums
+        self._save_batch_size = save_batch_size
+        self._clock = clock
+        self._hasher = BulkFileHasher(files, save_checksums, save_batch_size)
+
+    def cancel(self, job_id: str | None = None) -> None:
+        self._hasher.cancel(job_id)
+
+    async def scan(
+        self,
+        roots: Sequence[str],
+        game_ids_by_path: Dict[str, str],
+        extensions: Sequence[str] = DEFAULT_EXTENSIONS,
+        min_size: int = DEFAULT_MIN_SIZE,
+        max_size: int | None = None,
+        algorithm: StoredChecksumAlgorithm = SHA256,
+        chunk_size: int | None = None,
+        region_count: int = FINGERPRINT_REGION_COUNT,
+        on_progress: Callable[[BulkHashProgress], Awaitable[None]] | None = None,
+        job_id: str | None = None,
+    ) -> GameFileScanSummary:
+        if algorithm not in STORED_CHECKSUM_ALGORITHMS:
+            raise ValueError(
+                f'"algorithm" must be one of: {", ".join(STORED_CHECKSUM_ALGORITHMS)}'
+            )
+
+        started_at = self._clock()
+        sampled = algorithm in SAMPLED_CHECKSUM_ALGORITHMS
+        chunk_size = chunk_size or default_chunk_size(algorithm)
+        cache_region_count = region_count if sampled else 0
+        game_ids = {
+            normalize_path(path): game_id for path, game_id in game_ids_by_path.items()
+        }
+
+        def discover() -> Tuple[List[ScannedGameFile], List[FileHashRequest]]:
+            unchanged: List[ScannedGameFile] = []
+            changed: List[FileHashRequest] = []
+
+            for file in discover_game_files(roots, extensions, min_size, max_size):
+                game_id = game_ids.get(file.path)
+                checksum = self._files.get_cached_digest(
+                    file.path, file.stat, algorithm, chunk_size, cache_region_count
+                )
+
+                if checksum is None:
+                    previous_checksum = None
+
+                    # NOTE: Saving replaces only what this path hashed to before
+                    if game_id is not None:
+                        previous_checksum = self._files.get_previous_digest(
+                            file.path, algorithm, chunk_size, cache_region_count
+                        )
+
+                    sizes[file.path] = file.stat.st_size
+                    changed.append(
+                        FileHashRequest(game_id, file.path, previous_checksum)
+                    )
+                    continue
+
+                unchanged.append(
+                    ScannedGameFile(
+                        game_id=game_id,
+                        path=file.path,
+                        size=file.stat.st_size,
+                        checksum=checksum,
+                        unchanged=True,
+                    )
+                )
+
+            return unchanged, changed
+
+        sizes: Dict[str, int] = {}
+        unchanged, changed = await asyncio.to_thread(discover)
+
+        # NOTE: A file may have been hashed before it was added as a game
+        await self._save_unchanged(
+            unchanged, algorithm, chunk_size, region_count if sampled else None
+        )
+
+        hash_summary = await self._hasher.hash_files(
+            changed,
+            algorithm,
+            chunk_size,
+            on_progress=on_progress,
+            region_count=region_count,
+            job_id=job_id,
+        )
+
+        hashed_files = [
+            ScannedGameFile(
+                game_id=result.game_id,
+                path=result.path,
+                size=sizes[result.path],
+                checksum=result.checksum,
+                unchanged=False,
+            )
+            for result in hash_summary.results
+        ]
+        bytes_read = sum(
+            min(file.size, chunk_size * (region_count if sampled else 2))
+            for file in hashed_files
+            if file.checksum is not None
+        )
+        elapsed_s = max(self._clock() - started_at, 1e-9)
+        discovered = len(unchanged) + len(changed)
+
+        summary = GameFileScanSummary(
+            discovered=discovered,
+            unchanged=len(unchanged),
+            hashed=hash_summary.hashed,
+            failed=hash_summary.failed + hash_summary.missing,
+            cancelled=hash_summary.cancelled,
+            elapsed_s=elapsed_s,
+            files_per_second=discovered / elapsed_s,
+            mb_per_second=bytes_read / 1024 / 1024 / elapsed_s,
+            files=unchanged + hashed_files,
+        )
+        logger.info(
+            "Scanned %d file(s), %d unchanged, %d hashed in %.2fs: "
+            "%.1f files/s, %.1f MB/s",
+            summary.discovered,
+            summary.unchanged,
+            summary.hashed,
+            summary.elapsed_s,
+            summary.files_per_second,
+            summary.mb_per_second,
+        )
+
+        return summary
+
+    async def _save_unchanged(
+        self,
+        files: List[ScannedGameFile],
+        algorithm: StoredChecksumAlgorithm,
+        chunk_size: int,
+        region_count: int | None,
+    ) -> None:
+        checksums = [
+            AddGameChecksumDTO(
+                game_id=file.game_id,
+                checksum=file.checksum,
+                algorithm=algorithm,
+                chunk_size=chunk_size,
+                region_count=region_count,
+            )
+            for file in files
+            if file.game_id is not None
+        ]
+
+        for start in range(0, len(checksums), self._save_batch_size):
+            await self._save_checksums(
+                checksums[start : start + self._save_batch_size]
+            )
@@ -1,6 +1,5 @@
 from py_modules.db.dao import Dao
-from typing import Dict, List
-import dataclasses
+from typing import List
 from py_modules.schemas.response import (
     FileChecksum,
     Game,
@@ -27,31 +26,29 @@ class Games:
             Game(response.game_id, response.name), total_time=response.time
         )
 
-    def get_dictionary(self) -> List[Dict[str, GameDictionary]]:
-        data = self.dao.get_games_dictionary()
+    def get_dictionary(self) -> List[GameDictionary]:
+        data = self.dao.get_games_dictionary_with_checksums()
 
-        result: List[Dict[str, GameDictionary]] = []
+        result: List[GameDictionary] = []
 
         for game in data:
-            game_files_checksum = self.dao.get_game_files_checksum(game.id)
             file_checksum_list: List[FileChecksum] = []
 
-            for game_file_checksum in game_files_checksum:
+            for game_file_checksum in game.files:
                 file_checksum_list.append(
                     FileChecksum(
                         Game(game_file_checksum.game_id, game_file_checksum.game_name),
                         game_file_checksum.checksum,
                         game_file_checksum.algorithm,
                         game_file_checksum.chunk_size,
+                        game_file_checksum.region_count,
                         game_file_checksum.created_at,
                         game_file_checksum.updated_at,
                     )
                 )
 
             result.append(
-                dataclasses.asdict(
-                    GameDictionary(Game(game.id, game.name), files=file_checksum_list)
-                )
+                GameDictionary(Game(game.id, game.name), files=file_checksum_list)
             )
 
         return result
@@ -64,6 +61,7 @@ class Games:
         hash_chunk_size: int,
         hash_created_at: None | str,
         hash_updated_at: None | str,
+        hash_region_count: None | int = None,
     ):
         self.dao.save_game_checksum(
             game_id,
@@ -72,10 +70,36 @@ class Games:
             hash_chunk_size,
             hash_created_at,
             hash_updated_at,
+            hash_region_count,
         )
 
     def save_game_checksum_bulk(self, checksums: List[AddGameChecksumDTO]):
-        checksums_data = [
+        self.dao.save_game_checksum_bulk(self._to_checksums_data(checksums))
+
+    def replace_game_checksum_bulk(self, checksums: List[AddGameChecksumDTO]):
+        """
+        Saves `checksums`, each one replaces the `previous_checksum` its file
+        had for the same game, algorithm, chunk size and region count.
+        """
+        self.dao.replace_game_checksum_bulk(
+            self._to_checksums_data(checksums),
+            [
+                (
+                    dto.game_id,
+                    dto.previous_checksum,
+                    dto.algorithm,
+                    dto.chunk_size,
+                    dto.region_count,
+                )
+                for dto in checksums
+                if dto.previous_checksum is not None
+                and dto.previous_checksum != dto.checksum
+            ],
+        )
+
+    @staticmethod
+    def _to_checksums_data(checksums: List[AddGameChecksumDTO]):
+        return [
             (
                 dto.game_id,
                 dto.checksum,
@@ -83,12 +107,11 @@ class Games:
                 dto.chunk_size,
                 dto.created_at,
                 dto.updated_at,
+                dto.region_count,
             )
             for dto in checksums
         ]
 
-        self.dao.save_game_checksum_bulk(checksums_data)
-
     def remove_game_checksum(self, game_id: str, checksum: str):
         self.dao.remove_game_checksum(game_id, checksum)
 
@@ -98,25 +121,24 @@ class Games:
     def remove_all_checksums(self):
         return self.dao.remove_all_checksums()
 
-    def get_games_checksum(self):
+    def get_games_checksum(self) -> List[FileChecksum]:
         games_checksum_without_game_dict = self.dao.get_games_checksum()
-        result = []
+        result: List[FileChecksum] = []
 
         for game in games_checksum_without_game_dict:
             result.append(
-                dataclasses.asdict(
-                    FileChecksum(
-                        # TODO: Add test case to check if name is correct
-                        Game(
-                            game.game_id,
-                            game.game_name if game.game_name is not None else "[Unknown name]",
-                        ),
-                        game.checksum,
-                        game.algorithm,
-                        game.chunk_size,
-                        game.created_at,
-                        game.updated_at,
-                    )
+                FileChecksum(
+                    # TODO: Add test case to check if name is correct
+                    Game(
+                        game.game_id,
+                        game.game_name if game.game_name is not None else "[Unknown name]",
+                    ),
+                    game.checksum,
+                    game.algorithm,
+                    game.chunk_size,
+                    game.region_count,
+                    game.created_at,
+                    game.updated_at,
                 )
             )
 
@@ -1,8 +1,10 @@
+import calendar
 from datetime import date, datetime, timedelta
 
 
 DATE_FORMAT = "%Y-%m-%d"
 DATE_WITH_HOURS_FORMAT = "%Y-%m-%dT%H:%M:%S"
+SECONDS_IN_DAY = 24 * 60 * 60
 
 
 def parse_date(date_str: str) -> date:
@@ -34,3 +36,18 @@ def start_of_week(date: datetime):
 
 def end_of_week(date: datetime):
     return start_of_week(date) + timedelta(days=6)
+
+
+def to_epoch(dt: datetime) -> int:
+    """
+    Seconds since 1970-01-01 of the wall clock time stored in `play_time`.
+
+    `play_time.date_time` keeps naive local time, so the value is computed as if
+    it was UTC. This matches `STRFTIME('%s', date_time)` in SQLite and keeps
+    every stored day exactly `SECONDS_IN_DAY` long, even across DST changes.
+    """
+    return calendar.timegm(dt.timetuple())
+
+
+def to_day_key(dt: datetime) -> int:
+    return to_epoch(dt) // SECONDS_IN_DAY
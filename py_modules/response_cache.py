@@ -0,0 +1,150 @@
+import dataclasses
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Tuple, TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_MAX_ENTRIES = 64
+# 8MB
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+
+
+@dataclasses.dataclass
+class ResponseCacheMetrics:
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
+    entries: int
+    size_bytes: int
+    max_entries: int
+    max_bytes: int
+
+
+class ResponseCache:
+    """
+    In-process LRU cache for computed responses.
+
+    Entries are only valid for the write generation they were computed in:
+    as soon as `Dao.write_generation` moves on, the whole cache is dropped.
+    Sizes are estimated once per entry, so the memory cap is approximate.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        self._entries: OrderedDict[Hashable, Tuple[Any, int]] = OrderedDict()
+        self._generation: int | None = None
+        self._size_bytes = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get_or_compute(
+        self, key: Hashable, generation: int, compute: Callable[[], T]
+    ) -> T:
+        with self._lock:
+            self._invalidate_if_stale(generation)
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+
+            self._misses += 1
+
+        value = compute()
+        size = _estimate_size(value)
+
+        with self._lock:
+            # NOTE: A write may have landed while computing, the value is still
+            # correct for `generation` but must not outlive it
+            if self._generation == generation and size <= self._max_bytes:
+                self._store(key, value, size)
+
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+
+    def metrics(self) -> ResponseCacheMetrics:
+        with self._lock:
+            return ResponseCacheMetrics(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                invalidations=self._invalidations,
+                entries=len(self._entries),
+                size_bytes=self._size_bytes,
+                max_entries=self._max_entries,
+                max_bytes=self._max_bytes,
+            )
+
+    def _invalidate_if_stale(self, generation: int) -> None:
+        if self._generation == generation:
+            return
+
+        if self._generation is not None and generation < self._generation:
+            return
+
+        if self._entries:
+            self._invalidations += 1
+
+        self._entries.clear()
+        self._size_bytes = 0
+        self._generation = generation
+
+    def _store(self, key: Hashable, value: Any, size: int) -> None:
+        previous = self._entries.pop(key, None)
+
+        if previous is not None:
+            self._size_bytes -= previous[1]
+
+        self._entries[key] = (value, size)
+        self._size_bytes += size
+
+        while (
+            len(self._entries) > self._max_entries
+            or self._size_bytes > self._max_bytes
+        ):
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self._size_bytes -= evicted_size
+            self._evictions += 1
+
+
+def _estimate_size(value: Any) -> int:
+    size = 0
+    stack = [value]
+    seen: Dict[int, None] = {}
+
+    while stack:
+        item = stack.pop()
+
+        if id(item) in seen:
+            continue
+
+        seen[id(item)] = None
+        size += sys.getsizeof(item)
+
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif dataclasses.is_dataclass(item) and not isinstance(item, type):
+            stack.extend(getattr(item, field.name) for field in dataclasses.fields(item))
+
+    return size
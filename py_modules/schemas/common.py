@@ -1,12 +1,30 @@
-from typing import Literal
+from typing import Literal, get_args
 
+# NOTE: `hashlib` backed algorithms, hashing the head and the tail of a file
 ChecksumAlgorithm = Literal[
+    "BLAKE2B",
+    "BLAKE2S",
     "SHA224",
     "SHA256",
     "SHA384",
     "SHA512",
+    "SHA512_224",
+    "SHA512_256",
     "SHA3_224",
     "SHA3_256",
     "SHA3_384",
     "SHA3_512",
+    "SHAKE_128",
+    "SHAKE_256",
 ]
+
+# NOTE: Hashes `region_count` regions spread over the whole file, see
+# `Files.get_file_fingerprint`
+SampledChecksumAlgorithm = Literal["SAMPLED_SHA256"]
+
+# NOTE: Must stay in sync with the CHECK constraint of `game_file_checksum.algorithm`
+StoredChecksumAlgorithm = Literal[ChecksumAlgorithm, SampledChecksumAlgorithm]
+
+CHECKSUM_ALGORITHMS = get_args(ChecksumAlgorithm)
+SAMPLED_CHECKSUM_ALGORITHMS = get_args(SampledChecksumAlgorithm)
+STORED_CHECKSUM_ALGORITHMS = get_args(StoredChecksumAlgorithm)
@@ -1,4 +1,4 @@
-from typing import List, TypedDict, Optional
+from typing import Dict, List, TypedDict, Optional
 from dataclasses import dataclass
 from .response import Game
 
@@ -10,12 +10,39 @@ class AddTimeDict(TypedDict):
     game_name: str
 
 
+class SessionStartDict(TypedDict):
+    game_id: str
+    game_name: str
+    started_at: float
+
+
+class SessionHeartbeatDict(TypedDict):
+    game_id: str
+    at: float
+
+
+class SessionEndDict(TypedDict):
+    game_id: str
+    ended_at: float
+
+
 class DailyStatisticsForPeriodDict(TypedDict):
     start_date: str
     end_date: str
     game_id: Optional[str]
 
 
+class GameSessionsCursorDict(TypedDict):
+    date_time: str
+    id: int
+
+
+class GetGameSessionsDict(TypedDict):
+    game_id: str
+    cursor: Optional[GameSessionsCursorDict]
+    limit: Optional[int]
+
+
 @dataclass
 class ApplyManualTimeCorrectionList:
     game: Game
@@ -29,6 +56,23 @@ GetGameDTO = str
 GetFileSHA256DTO = str
 
 
+class FileHashRequestDict(TypedDict):
+    game_id: str
+    path: str
+
+
+class ScanGameFilesDict(TypedDict):
+    roots: List[str]
+    game_ids_by_path: Dict[str, str]
+    extensions: Optional[List[str]]
+    min_size: Optional[int]
+    max_size: Optional[int]
+    algorithm: Optional[str]
+    chunk_size: Optional[int]
+    region_count: Optional[int]
+    job_id: Optional[str]
+
+
 class AddGameChecksumDict(TypedDict):
     game_id: str
     checksum: str
@@ -36,6 +80,7 @@ class AddGameChecksumDict(TypedDict):
     chunk_size: int
     created_at: Optional[str]
     updated_at: Optional[str]
+    region_count: Optional[int]
 
 
 class RemoveGameChecksumDTO(TypedDict):
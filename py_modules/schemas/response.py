@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from typing import List
-from .common import ChecksumAlgorithm
+from .common import StoredChecksumAlgorithm
 
 
 @dataclass
@@ -29,6 +29,24 @@ class GamePlaytimeDetails(GamePlaytimeSummary):
     last_session: SessionInformation | None
 
 
+@dataclass
+class GamePlaytimeOverview(GamePlaytimeSummary):
+    total_sessions: int
+    last_session: SessionInformation | None
+
+
+@dataclass
+class GameSessionsCursor:
+    date_time: str
+    id: int
+
+
+@dataclass
+class PagedGameSessions:
+    sessions: List[SessionInformation]
+    next_cursor: GameSessionsCursor | None
+
+
 @dataclass
 class GamePlaytimeReport(GamePlaytimeSummary):
     last_played_date: str
@@ -53,8 +71,9 @@ class PagedDayStatistics:
 class FileChecksum:
     game: Game
     checksum: str
-    algorithm: ChecksumAlgorithm
+    algorithm: StoredChecksumAlgorithm
     chunk_size: int
+    region_count: None | int
     created_at: None | str
     updated_at: None | str
 
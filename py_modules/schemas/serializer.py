@@ -0,0 +1,76 @@
+import dataclasses
+from functools import lru_cache
+from typing import Any, Dict, Tuple
+
+_PRIMITIVE_TYPES = frozenset({str, int, float, bool, type(None)})
+
+# NOTE: Filled lazily, one entry per response dataclass
+_FIELD_NAMES: Dict[type, Tuple[Tuple[str, str], ...]] = {}
+
+
+@lru_cache(maxsize=1024)
+def to_camel_case(snake_str: str) -> str:
+    """
+    Converts a snake_case string to camelCase.
+
+    An underscore followed by an ASCII letter or digit is dropped and the
+    character is upper-cased, leading underscores are removed afterwards.
+    For example: "last_session" -> "lastSession"
+    """
+    characters = []
+    index = 0
+
+    while index < len(snake_str):
+        character = snake_str[index]
+        following = snake_str[index + 1] if index + 1 < len(snake_str) else ""
+
+        if character == "_" and following.isascii() and following.isalnum():
+            characters.append(following.upper())
+            index += 2
+            continue
+
+        characters.append(character)
+        index += 1
+
+    return "".join(characters).lstrip("_")
+
+
+def to_camel_case_response(data: Any) -> Any:
+    """
+    Serializes a response into plain dicts and lists with camelCase keys.
+
+    Dataclasses are read field by field, so there is no intermediate
+    `dataclasses.asdict` copy. Field names are converted once per class.
+    Dict keys go through the memoized `to_camel_case`.
+    """
+    data_type = type(data)
+
+    if data_type in _PRIMITIVE_TYPES:
+        return data
+
+    field_names = _FIELD_NAMES.get(data_type)
+
+    if field_names is None and dataclasses.is_dataclass(data_type):
+        field_names = _FIELD_NAMES[data_type] = tuple(
+            (field.name, to_camel_case(field.name))
+            for field in dataclasses.fields(data_type)
+        )
+
+    if field_names is not None:
+        return {
+            camel_name: to_camel_case_response(getattr(data, name))
+            for name, camel_name in field_names
+        }
+
+    if isinstance(data, list):
+        return [to_camel_case_response(item) for item in data]
+
+    if isinstance(data, dict):
+        return {
+            to_camel_case(key) if isinstance(key, str) else key: to_camel_case_response(
+                value
+            )
+            for key, value in data.items()
+        }
+
+    return data
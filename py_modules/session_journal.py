@@ -0,0 +1,207 @@
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import IO, Callable, Dict, Iterable, List
+
+logger = logging.getLogger()
+
+DEFAULT_FSYNC_INTERVAL_S = 5.0
+
+
+@dataclass
+class JournalSession:
+    game_id: str
+    game_name: str
+    started_at: float
+    last_seen_at: float
+
+
+class SessionJournal:
+    """
+    Append-only log of live play sessions, one JSON record per line.
+
+    Heartbeats are plain appends, the file is fsynced at most once per
+    `fsync_interval_s` (`0` syncs every record). A session that was never
+    ended, e.g. because the plugin died, is recovered with `unfinished()`
+    and ends at its last heartbeat.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        fsync_interval_s: float = DEFAULT_FSYNC_INTERVAL_S,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if fsync_interval_s < 0:
+            raise ValueError("fsync_interval_s must be non-negative")
+
+        self._path = path
+        self._fsync_interval_s = fsync_interval_s
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        self._file: IO[str] | None = None
+        self._last_fsync_at = clock()
+        self._sessions: Dict[str, JournalSession] = {}
+
+    def start(self, game_id: str, game_name: str, started_at: float) -> bool:
+        with self._lock:
+            if game_id in self._sessions:
+                logger.warning("Session of %s is already started, ignoring it", game_id)
+                return False
+
+            self._sessions[game_id] = JournalSession(
+                game_id, game_name, started_at, started_at
+            )
+            self._append(
+                {
+                    "type": "start",
+                    "game_id": game_id,
+                    "game_name": game_name,
+                    "at": started_at,
+                }
+            )
+
+            return True
+
+    def heartbeat(self, game_id: str, at: float) -> bool:
+        with self._lock:
+            session = self._sessions.get(game_id)
+
+            if session is None:
+                return False
+
+            session.last_seen_at = max(session.last_seen_at, at)
+            self._append({"type": "heartbeat", "game_id": game_id, "at": at})
+
+            return True
+
+    def get(self, game_id: str) -> JournalSession | None:
+        with self._lock:
+            return self._sessions.get(game_id)
+
+    def end(self, game_id: str) -> None:
+        """
+        Forgets the session. Call it only once its time is saved, the journal
+        is then rewritten with the sessions that are still running.
+        """
+        with self._lock:
+            if self._sessions.pop(game_id, None) is not None:
+                self._rewrite(self._sessions.values())
+
+    def unfinished(self) -> List[JournalSession]:
+        """
+        Reads sessions left over in the journal file by a previous run.
+        A torn last line, e.g. after a power loss, is skipped.
+        """
+        with self._lock:
+            if not os.path.exists(self._path):
+                return []
+
+            sessions: Dict[str, JournalSession] = {}
+
+            with open(self._path, "r", encoding="utf-8") as journal:
+                for line in journal:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning("Skipping corrupted session journal record")
+                        continue
+
+                    _apply_record(sessions, record)
+
+            return list(sessions.values())
+
+    def reset(self) -> None:
+        """
+        Drops recovered sessions from the file, keeping the running ones.
+        """
+        with self._lock:
+            self._rewrite(self._sessions.values())
+
+    def sync(self) -> None:
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def _append(self, record: dict) -> None:
+        if self._file is None:
+            self._file = open(self._path, "a", encoding="utf-8")
+
+        self._file.write(_encode(record))
+        self._file.flush()
+
+        if self._clock() - self._last_fsync_at >= self._fsync_interval_s:
+            self._sync()
+
+    def _sync(self) -> None:
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+        self._last_fsync_at = self._clock()
+
+    def _rewrite(self, sessions: Iterable[JournalSession]) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+        temporary_path = f"{self._path}.tmp"
+
+        with open(temporary_path, "w", encoding="utf-8") as journal:
+            for session in sessions:
+                journal.write(
+                    _encode(
+                        {
+                            "type": "start",
+                            "game_id": session.game_id,
+                            "game_name": session.game_name,
+                            "at": session.started_at,
+                        }
+                    )
+                )
+
+                if session.last_seen_at != session.started_at:
+                    journal.write(
+                        _encode(
+                            {
+                                "type": "heartbeat",
+                                "game_id": session.game_id,
+                                "at": session.last_seen_at,
+                            }
+                        )
+                    )
+
+            journal.flush()
+            os.fsync(journal.fileno())
+
+        os.replace(temporary_path, self._path)
+        self._last_fsync_at = self._clock()
+
+
+def _encode(record: dict) -> str:
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+def _apply_record(sessions: Dict[str, JournalSession], record: dict) -> None:
+    record_type = record.get("type")
+    game_id = record.get("game_id")
+
+    if record_type == "start":
+        sessions[game_id] = JournalSession(
+            game_id, record["game_name"], record["at"], record["at"]
+        )
+    elif record_type == "heartbeat" and game_id in sessions:
+        session = sessions[game_id]
+        session.last_seen_at = max(session.last_seen_at, record["at"])
@@ -1,13 +1,22 @@
-import dataclasses
 from collections import defaultdict
 from datetime import datetime, date, time, timedelta
-from typing import Dict, List, Any, Optional
-from py_modules.db.dao import DailyGameTimeDto, Dao, GameTimeDto
+from typing import Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+from py_modules.db.dao import (
+    DailyGameTimeDto,
+    DailyStatisticsSnapshot,
+    Dao,
+    GameOverallSummaryDto,
+    GameTimeDto,
+)
 from py_modules.helpers import format_date
+from py_modules.response_cache import ResponseCache
 from py_modules.schemas.response import (
     DayStatistics,
     Game,
     GamePlaytimeDetails,
+    GamePlaytimeOverview,
+    GameSessionsCursor,
+    PagedGameSessions,
     SessionInformation,
     PagedDayStatistics,
     GamePlaytimeReport,
@@ -15,6 +24,8 @@ from py_modules.schemas.response import (
 from dataclasses import dataclass
 from py_modules.helpers import start_of_week, end_of_week
 
+T = TypeVar("T")
+
 
 @dataclass
 class PlayTimeWithHash:
@@ -24,83 +35,27 @@ class PlayTimeWithHash:
 
 class Statistics:
     dao: Dao
+    cache: ResponseCache
 
-    def __init__(self, dao: Dao) -> None:
+    def __init__(self, dao: Dao, cache: ResponseCache | None = None) -> None:
         self.dao = dao
+        self.cache = cache if cache is not None else ResponseCache()
 
-    def combine_games_by_checksum_per_day(
-        self, days: List[DayStatistics]
-    ) -> List[DayStatistics]:
-        """
-        Combines games played on the same day that share the same file checksum.
-        This version is slightly cleaner and adds comments on its assumptions.
-        """
-        result_days = []
-
-        for day in days:
-            # Group games by checksum for the current day
-            checksum_to_games: Dict[Optional[str], List[GamePlaytimeDetails]] = (
-                defaultdict(list)
-            )
-            for gwt in day.games:
-                # Assumption: The checksum of the first session is representative
-                # for the purpose of grouping. Handle cases with no sessions.
-                checksum = gwt.sessions[0].checksum if gwt.sessions else None
-                checksum_to_games[checksum].append(gwt)
-
-            merged_games: List[GamePlaytimeDetails] = []
-            for checksum, game_group in checksum_to_games.items():
-                # If checksum is None or only one game has it, no merging is needed
-                if checksum is None or len(game_group) == 1:
-                    merged_games.extend(game_group)
-                    continue
-
-                # Merge multiple games with the same checksum
-                # Assumption: The game identity (name, id) of the first game in the
-                # group is used for the merged entry.
-                representative_game = game_group[0]
-
-                total_time = sum(g.total_time for g in game_group)
-
-                all_sessions = [s for g in game_group for s in g.sessions]
-                all_sessions.sort(key=lambda s: s.date, reverse=True)
-
-                merged_games.append(
-                    GamePlaytimeDetails(
-                        game=representative_game.game,
-                        total_time=total_time,
-                        sessions=all_sessions,
-                        # Last session is kept from the representative game
-                        last_session=representative_game.last_session,
-                    )
-                )
-
-            # Re-calculate total time for the day after merging
-            total_day_time = sum(gwt.total_time for gwt in merged_games)
-            result_days.append(
-                DayStatistics(date=day.date, games=merged_games, total=total_day_time)
-            )
-
-        return result_days
+    def _cached(self, key: Hashable, compute: Callable[[], T]) -> T:
+        return self.cache.get_or_compute(key, self.dao.write_generation, compute)
 
     def _get_statistics_for_period(
-        self, start_time: datetime, end_time: datetime, game_id: Optional[str] = None
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        snapshot: DailyStatisticsSnapshot,
     ):
-        daily_reports = self.dao.fetch_per_day_time_report(
-            start_time, end_time, game_id
-        )
-
-        game_ids_in_period = {report.game_id for report in daily_reports}
-
-        sessions_by_day_and_game = self.dao.fetch_sessions_for_period(
-            start_time, end_time, game_id
-        )
-
-        last_sessions_map = self.dao.fetch_last_sessions_for_games(game_ids_in_period)
+        sessions_by_day_and_game = snapshot.sessions_by_day_and_game
+        last_sessions_map = snapshot.last_sessions
 
         reports_by_date: Dict[str, List[DailyGameTimeDto]] = defaultdict(list)
 
-        for report in daily_reports:
+        for report in snapshot.daily_reports:
             reports_by_date[report.date].append(report)
 
         result_days: List[DayStatistics] = []
@@ -132,23 +87,31 @@ class Statistics:
                 DayStatistics(date=date_str, games=day_games, total=total_day_time)
             )
 
-        return self.combine_games_by_checksum_per_day(result_days)
+        return result_days
 
     def daily_statistics_for_period(
         self, start: date, end: date, game_id: Optional[str] = None
+    ) -> PagedDayStatistics:
+        return self._cached(
+            ("daily_statistics_for_period", start, end, game_id),
+            lambda: self._daily_statistics_for_period(start, end, game_id),
+        )
+
+    def _daily_statistics_for_period(
+        self, start: date, end: date, game_id: Optional[str] = None
     ) -> PagedDayStatistics:
         start_time = datetime.combine(start, time.min)
         end_time = datetime.combine(end, time.max)
 
-        combined_data = self._get_statistics_for_period(start_time, end_time, game_id)
-
-        has_prev = self.dao.has_data_before(start_time, game_id)
-        has_next = self.dao.has_data_after(end_time, game_id)
+        snapshot = self.dao.fetch_daily_statistics_for_period(
+            start_time, end_time, game_id
+        )
+        combined_data = self._get_statistics_for_period(start_time, end_time, snapshot)
 
         return PagedDayStatistics(
             data=combined_data,
-            has_prev=has_prev,
-            has_next=has_next,
+            has_prev=snapshot.has_prev,
+            has_next=snapshot.has_next,
         )
 
     def get_last_sessions_from_grouped_sessions(
@@ -171,85 +134,96 @@ class Statistics:
         return last_sessions_by_checksum
 
     def get_statistics_for_last_two_weeks(self):
-        now = datetime.now()
+        today = date.today()
 
-        start_current_week = start_of_week(now)
-        two_weeks_ago_start = start_current_week - timedelta(weeks=1)
+        two_weeks_ago_start = start_of_week(today) - timedelta(weeks=1)
+        two_weeks_ago_end = end_of_week(today)
 
-        two_weeks_ago_end = end_of_week(now)
+        return self._cached(
+            ("statistics_for_last_two_weeks", two_weeks_ago_start, two_weeks_ago_end),
+            lambda: self._get_statistics_for_period_with_aliases(
+                datetime.combine(two_weeks_ago_start, time.min),
+                datetime.combine(two_weeks_ago_end, time.max),
+            ),
+        )
 
-        result: List[dict[str, GamePlaytimeReport]] = []
+    def _get_statistics_for_period_with_aliases(
+        self, start_time: datetime, end_time: datetime
+    ):
+        result: List[GamePlaytimeReport] = []
 
         playtime_information = self.dao.fetch_playtime_information_for_period(
-            two_weeks_ago_start, two_weeks_ago_end
+            start_time, end_time
         )
 
         for information in playtime_information:
             if information.aliases_id is not None:
                 for alias_id in information.aliases_id.split(","):
                     result.append(
-                        dataclasses.asdict(
-                            GamePlaytimeReport(
-                                game=Game(alias_id, information.game_name),
-                                total_time=information.total_time,
-                                last_played_date=information.last_played_date,
-                                aliases_id=information.aliases_id.replace(
-                                    alias_id, information.game_id
-                                ),
-                            )
+                        GamePlaytimeReport(
+                            game=Game(alias_id, information.game_name),
+                            total_time=information.total_time,
+                            last_played_date=information.last_played_date,
+                            aliases_id=information.aliases_id.replace(
+                                alias_id, information.game_id
+                            ),
                         )
                     )
 
             result.append(
-                dataclasses.asdict(
-                    GamePlaytimeReport(
-                        game=Game(information.game_id, information.game_name),
-                        total_time=information.total_time,
-                        last_played_date=information.last_played_date,
-                        aliases_id=information.aliases_id,
-                    )
+                GamePlaytimeReport(
+                    game=Game(information.game_id, information.game_name),
+                    total_time=information.total_time,
+                    last_played_date=information.last_played_date,
+                    aliases_id=information.aliases_id,
                 )
             )
 
         return result
 
-    def fetch_playtime_information(self) -> List[dict[str, GamePlaytimeReport]]:
-        result: List[dict[str, GamePlaytimeReport]] = []
+    def fetch_playtime_information(self) -> List[GamePlaytimeReport]:
+        return self._cached(
+            ("fetch_playtime_information",), self._fetch_playtime_information
+        )
+
+    def _fetch_playtime_information(self) -> List[GamePlaytimeReport]:
+        result: List[GamePlaytimeReport] = []
         playtime_information = self.dao.fetch_playtime_information()
 
         for information in playtime_information:
             if information.aliases_id is not None:
                 for alias_id in information.aliases_id.split(","):
                     result.append(
-                        dataclasses.asdict(
-                            GamePlaytimeReport(
-                                game=Game(alias_id, information.game_name),
-                                total_time=information.total_time,
-                                last_played_date=information.last_played_date,
-                                aliases_id=information.aliases_id.replace(
-                                    alias_id, information.game_id
-                                ),
-                            )
+                        GamePlaytimeReport(
+                            game=Game(alias_id, information.game_name),
+                            total_time=information.total_time,
+                            last_played_date=information.last_played_date,
+                            aliases_id=information.aliases_id.replace(
+                                alias_id, information.game_id
+                            ),
                         )
                     )
 
             result.append(
-                dataclasses.asdict(
-                    GamePlaytimeReport(
-                        game=Game(information.game_id, information.game_name),
-                        total_time=information.total_time,
-                        last_played_date=information.last_played_date,
-                        aliases_id=information.aliases_id,
-                    )
+                GamePlaytimeReport(
+                    game=Game(information.game_id, information.game_name),
+                    total_time=information.total_time,
+                    last_played_date=information.last_played_date,
+                    aliases_id=information.aliases_id,
                 )
             )
 
         return result
 
-    def per_game_overall_statistic(self) -> List[Dict[str, Any]]:
+    def per_game_overall_statistic(self) -> List[GamePlaytimeDetails]:
         """
         Returns overall statistics per game, grouped by checksum (or game_id if checksum is missing).
         """
+        return self._cached(
+            ("per_game_overall_statistic",), self._per_game_overall_statistic
+        )
+
+    def _per_game_overall_statistic(self) -> List[GamePlaytimeDetails]:
         data = self.dao.fetch_overall_playtime()
         all_sessions = self.dao.fetch_all_game_sessions_report()
 
@@ -277,7 +251,7 @@ class Statistics:
             sessions_by_key
         )
 
-        result: List[Dict[str, Any]] = []
+        result: List[GamePlaytimeDetails] = []
 
         for key, game_stats in games_by_key.items():
             first_game = game_stats[0]
@@ -295,10 +269,72 @@ class Statistics:
                 sessions=sessions,
                 last_session=last_session,
             )
-            result.append(dataclasses.asdict(game_with_time))
+            result.append(game_with_time)
 
         return result
 
+    def per_game_overall_statistic_short(self) -> List[GamePlaytimeOverview]:
+        """
+        Same grouping as `per_game_overall_statistic`, but only with totals and the
+        last session per group. Session history is served by `get_game_sessions`.
+        """
+        return self._cached(
+            ("per_game_overall_statistic_short",),
+            self._per_game_overall_statistic_short,
+        )
+
+    def _per_game_overall_statistic_short(self) -> List[GamePlaytimeOverview]:
+        games_by_key: Dict[str, List[GameOverallSummaryDto]] = defaultdict(list)
+
+        for summary in self.dao.fetch_overall_playtime_summary():
+            games_by_key[summary.checksum or summary.game_id].append(summary)
+
+        result: List[GamePlaytimeOverview] = []
+
+        for game_summaries in games_by_key.values():
+            first_game = game_summaries[0]
+            last_sessions = [
+                g.last_session for g in game_summaries if g.last_session is not None
+            ]
+
+            result.append(
+                GamePlaytimeOverview(
+                    game=Game(first_game.game_id, first_game.game_name),
+                    total_time=sum(g.time for g in game_summaries),
+                    total_sessions=sum(g.total_sessions for g in game_summaries),
+                    last_session=max(
+                        last_sessions,
+                        key=lambda s: datetime.fromisoformat(
+                            s.date.replace("Z", "+00:00")
+                        ),
+                        default=None,
+                    ),
+                )
+            )
+
+        return result
+
+    def get_game_sessions(
+        self, game_id: str, cursor: Optional[Tuple[str, int]], limit: int
+    ) -> PagedGameSessions:
+        """
+        Returns one page of sessions of `game_id`, newest first. `cursor` is the
+        `next_cursor` of the previous page, `None` for the first page.
+        """
+        # NOTE: One extra row tells whether there is a next page
+        rows = self.dao.fetch_game_sessions(game_id, cursor, limit + 1)
+        page = rows[:limit]
+
+        next_cursor = None
+
+        if len(rows) > limit:
+            last = page[-1]
+            next_cursor = GameSessionsCursor(date_time=last.session.date, id=last.id)
+
+        return PagedGameSessions(
+            sessions=[row.session for row in page], next_cursor=next_cursor
+        )
+
     def _generate_date_range(self, start_date, end_date):
         date_list = []
         curr_date = start_date
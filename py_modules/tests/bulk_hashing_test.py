@@ -0,0 +1,284 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from py_modules.db.dao import Dao
+from py_modules.db.migration import DbMigration
+from py_modules.games import Games
+from py_modules.tests.helpers import AbstractDatabaseTest
+
+with patch.dict("os.environ", {"DECKY_PLUGIN_RUNTIME_DIR": "./python/tests/data"}):
+    from py_modules.bulk_hashing import (
+        BulkFileHasher,
+        FileHashRequest,
+        detect_storage_type,
+        workers_for_paths,
+    )
+    from py_modules.files import Files
+
+
+class SlowFiles(Files):
+    def __init__(self, delay_s: float) -> None:
+        super().__init__()
+        self.delay_s = delay_s
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def get_file_digest(self, file_path, algorithm="SHA256", chunk_size=1024):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+
+        time.sleep(self.delay_s)
+
+        with self.lock:
+            self.running -= 1
+
+        return super().get_file_digest(file_path, algorithm, chunk_size)
+
+
+class TestBulkFileHasher(AbstractDatabaseTest, unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        DbMigration(db=self.database).migrate()
+        self.games = Games(Dao(self.database))
+        self.directory = tempfile.TemporaryDirectory()
+        self.saved_batches = []
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        super().tearDown()
+
+    async def _save(self, dtos) -> None:
+        self.saved_batches.append(len(dtos))
+        self.games.save_game_checksum_bulk(dtos)
+
+    def _create_files(self, count: int):
+        requests = []
+
+        for index in range(count):
+            path = os.path.join(self.directory.name, f"game-{index}.bin")
+
+            with open(path, "wb") as f:
+                f.write(f"content {index}".encode())
+
+            requests.append(FileHashRequest(str(index), path))
+
+        return requests
+
+    async def test_should_hash_and_save_every_file(self):
+        requests = self._create_files(5)
+        requests.append(FileHashRequest("missing", f"{self.directory.name}/missing"))
+        progress = []
+
+        async def on_progress(event):
+            progress.append((event.done, event.total))
+
+        hasher = BulkFileHasher(Files(), self._save, save_batch_size=2)
+        summary = await hasher.hash_files(
+            requests, on_progress=on_progress, max_workers=3
+        )
+
+        self.assertEqual(
+            (summary.total, summary.hashed, summary.missing, summary.failed),
+            (6, 5, 1, 0),
+        )
+        self.assertFalse(summary.cancelled)
+        self.assertEqual(progress, [(i, 6) for i in range(1, 7)])
+        self.assertEqual(sum(self.saved_batches), 5)
+        self.assertEqual(
+            sorted((c.game.id, c.checksum) for c in self.games.get_games_checksum()),
+            sorted(
+                (str(i), hashlib.sha256(f"content {i}".encode()).hexdigest())
+                for i in range(5)
+            ),
+        )
+
+    async def test_should_limit_concurrent_hashing(self):
+        files = SlowFiles(delay_s=0.02)
+
+        await BulkFileHasher(files, self._save).hash_files(
+            self._create_files(8), max_workers=2
+        )
+
+        self.assertEqual(files.max_running, 2)
+
+    async def test_should_stop_on_cancel_and_keep_finished_checksums(self):
+        hasher = BulkFileHasher(SlowFiles(delay_s=0.05), self._save)
+
+        async def on_progress(event):
+            hasher.cancel()
+
+        summary = await hasher.hash_files(
+            self._create_files(20), on_progress=on_progress, max_workers=1
+        )
+
+        self.assertTrue(summary.cancelled)
+        self.assertLess(len(summary.results), 20)
+        self.assertEqual(len(self.games.get_games_checksum()), summary.hashed)
+
+    async def test_should_cancel_only_the_job_with_the_same_id(self):
+        hasher = BulkFileHasher(SlowFiles(delay_s=0.02), self._save)
+        cancelled_requests = self._create_files(20)
+        other_requests = [
+            FileHashRequest(f"other-{r.game_id}", r.path)
+            for r in self._create_files(5)
+        ]
+
+        async def on_progress(event):
+            self.assertEqual(event.job_id, "first")
+            hasher.cancel("first")
+
+        cancelled, other = await asyncio.gather(
+            hasher.hash_files(
+                cancelled_requests,
+                on_progress=on_progress,
+                max_workers=1,
+                job_id="first",
+            ),
+            hasher.hash_files(other_requests, max_workers=1, job_id="second"),
+        )
+
+        self.assertTrue(cancelled.cancelled)
+        self.assertFalse(other.cancelled)
+        self.assertEqual(other.hashed, 5)
+
+    async def test_should_reject_a_job_id_that_is_already_running(self):
+        hasher = BulkFileHasher(SlowFiles(delay_s=0.02), self._save)
+        running = asyncio.create_task(
+            hasher.hash_files(self._create_files(3), max_workers=1, job_id="job")
+        )
+        await asyncio.sleep(0.01)
+
+        with self.assertRaises(ValueError):
+            await hasher.hash_files(self._create_files(1), job_id="job")
+
+        await running
+
+    async def test_should_not_hide_the_hashing_error_behind_a_failing_save(self):
+        async def save(dtos):
+            raise RuntimeError("save failed")
+
+        async def on_progress(event):
+            raise KeyError("progress failed")
+
+        with self.assertRaises(KeyError):
+            await BulkFileHasher(Files(), save).hash_files(
+                self._create_files(2), on_progress=on_progress, max_workers=1
+            )
+
+    async def test_should_probe_storage_off_the_event_loop(self):
+        loop_thread = threading.get_ident()
+        probed_from = []
+
+        def probe(paths):
+            probed_from.append(threading.get_ident())
+            return 1
+
+        with patch("py_modules.bulk_hashing.workers_for_paths", probe):
+            await BulkFileHasher(Files(), self._save).hash_files(
+                self._create_files(1)
+            )
+
+        self.assertEqual(len(probed_from), 1)
+        self.assertNotEqual(probed_from[0], loop_thread)
+
+    async def test_should_save_sampled_fingerprints_with_region_count(self):
+        requests = self._create_files(2)
+
+        await BulkFileHasher(Files(), self._save).hash_files(
+            requests, algorithm="SAMPLED_SHA256", max_workers=1, region_count=4
+        )
+
+        self.assertEqual(
+            sorted(
+                (c.game.id, c.checksum, c.algorithm, c.region_count)
+                for c in self.games.get_games_checksum()
+            ),
+            [
+                (
+                    request.game_id,
+                    Files().get_file_fingerprint(request.path, region_count=4),
+                    "SAMPLED_SHA256",
+                    4,
+                )
+                for request in requests
+            ],
+        )
+
+    async def test_should_reject_unsupported_algorithm(self):
+        with self.assertRaises(ValueError):
+            await BulkFileHasher(Files(), self._save).hash_files([], algorithm="MD5")
+
+
+class TestStorageDetection(unittest.TestCase):
+    def setUp(self) -> None:
+        self.sys_root = tempfile.TemporaryDirectory()
+        self.file = tempfile.NamedTemporaryFile()
+
+    def tearDown(self) -> None:
+        self.file.close()
+        self.sys_root.cleanup()
+
+    def _fake_block_device(self, disk: str, partition: str | None, rotational="0"):
+        device = os.stat(self.file.name).st_dev
+        disk_dir = os.path.join(self.sys_root.name, "devices", "block", disk)
+        device_dir = (
+            disk_dir if partition is None else os.path.join(disk_dir, partition)
+        )
+
+        os.makedirs(os.path.join(disk_dir, "queue"))
+        os.makedirs(device_dir, exist_ok=True)
+
+        with open(os.path.join(disk_dir, "queue", "rotational"), "w") as f:
+            f.write(rotational + "\n")
+
+        if partition is not None:
+            open(os.path.join(device_dir, "partition"), "w").close()
+
+        os.makedirs(os.path.join(self.sys_root.name, "dev", "block"))
+        os.symlink(
+            device_dir,
+            os.path.join(
+                self.sys_root.name,
+                "dev",
+                "block",
+                f"{os.major(device)}:{os.minor(device)}",
+            ),
+        )
+
+    def test_should_detect_sd_card_partition(self):
+        self._fake_block_device("mmcblk0", "mmcblk0p1")
+
+        self.assertEqual(
+            detect_storage_type(self.file.name, self.sys_root.name), "sd_card"
+        )
+        self.assertEqual(workers_for_paths([self.file.name], self.sys_root.name), 2)
+
+    def test_should_detect_nvme_partition(self):
+        self._fake_block_device("nvme0n1", "nvme0n1p8")
+
+        self.assertEqual(
+            detect_storage_type(self.file.name, self.sys_root.name), "nvme"
+        )
+
+    def test_should_detect_rotational_disk(self):
+        self._fake_block_device("sda", None, rotational="1")
+
+        self.assertEqual(
+            detect_storage_type(self.file.name, self.sys_root.name), "rotational"
+        )
+
+    def test_should_fall_back_to_unknown(self):
+        self.assertEqual(
+            detect_storage_type(self.file.name, self.sys_root.name), "unknown"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
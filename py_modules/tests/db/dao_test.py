@@ -1,5 +1,6 @@
 import sqlite3
 from datetime import datetime
+from unittest.mock import patch
 from py_modules.db.dao import Dao
 from py_modules.db.migration import DbMigration
 from py_modules.tests.helpers import AbstractDatabaseTest
@@ -319,6 +320,182 @@ class TestDao(AbstractDatabaseTest):
 
         self.assertEqual(len(result), 0)
 
+    def test_should_maintain_daily_rollup_on_save_play_time(self):
+        self.dao.save_game_dict("1001", "Zelda BOTW")
+        self.dao.save_play_time(datetime(2023, 1, 1, 9, 0), 3600, "1001")
+        self.dao.save_play_time(datetime(2023, 1, 1, 11, 0), 1800, "1001")
+        self.dao.save_play_time(datetime(2023, 1, 2, 10, 0), 2000, "1001")
+
+        self.assertEqual(
+            self._get_daily_rollup(),
+            [("2023-01-01", "1001", 5400, 2), ("2023-01-02", "1001", 2000, 1)],
+        )
+
+    def test_should_not_add_manual_time_to_daily_rollup(self):
+        self.dao.save_game_dict("1001", "Zelda BOTW")
+        self.dao.save_play_time(datetime(2023, 1, 1, 9, 0), 3600, "1001")
+        self.dao.apply_manual_time_for_game(
+            create_at=datetime(2023, 1, 1, 12, 0),
+            game_id="1001",
+            game_name="Zelda BOTW",
+            new_overall_time=7200,
+            source="manually-changed",
+        )
+
+        self.assertEqual(self._get_daily_rollup(), [("2023-01-01", "1001", 3600, 1)])
+
+    def test_should_group_transitively_linked_games_into_one_component(self):
+        for game_id in ("1", "2", "3", "4"):
+            self.dao.save_game_dict(game_id, f"Game {game_id}")
+
+        self.dao.save_game_checksum("3", "checksum_a", "SHA256", 1024, None, None)
+        self.dao.save_game_checksum("2", "checksum_a", "SHA256", 1024, None, None)
+        self.dao.save_game_checksum("2", "checksum_b", "SHA256", 1024, None, None)
+        self.dao.save_game_checksum_bulk(
+            [("1", "checksum_b", "SHA256", 1024, None, None, None)]
+        )
+
+        self.assertEqual(
+            self._get_game_components(), [("1", "1"), ("2", "1"), ("3", "1")]
+        )
+
+    def test_should_not_bump_write_generation_when_checksums_are_stored(self):
+        self.dao.save_game_dict("1", "Game 1")
+        checksums = [("1", "checksum_a", "SHA256", 1024, None, None, None)]
+        self.dao.save_game_checksum_bulk(checksums)
+        generation = self.dao.write_generation
+
+        self.dao.save_game_checksum_bulk(checksums)
+        self.dao.replace_game_checksum_bulk(checksums, [])
+
+        self.assertEqual(self.dao.write_generation, generation)
+
+        self.dao.replace_game_checksum_bulk(
+            [("1", "checksum_b", "SHA256", 1024, None, None, None)],
+            [("1", "checksum_a", "SHA256", 1024, None)],
+        )
+
+        self.assertEqual(self.dao.write_generation, generation + 1)
+
+    def test_should_split_component_when_checksum_is_removed(self):
+        for game_id in ("1", "2", "3"):
+            self.dao.save_game_dict(game_id, f"Game {game_id}")
+
+        self.dao.save_game_checksum("1", "checksum_a", "SHA256", 1024, None, None)
+        self.dao.save_game_checksum("2", "checksum_a", "SHA256", 1024, None, None)
+        self.dao.save_game_checksum("2", "checksum_b", "SHA256", 1024, None, None)
+        self.dao.save_game_checksum("3", "checksum_b", "SHA256", 1024, None, None)
+
+        self.dao.remove_game_checksum("2", "checksum_a")
+
+        self.assertEqual(self._get_game_components(), [("2", "2"), ("3", "2")])
+
+        self.dao.remove_all_game_checksums("3")
+
+        self.assertEqual(self._get_game_components(), [])
+
+    def test_should_not_link_games_with_same_checksum_and_different_algorithm(self):
+        self.dao.save_game_checksum("1", "checksum_a", "SHA256", 1024, None, None)
+        self.dao.save_game_checksum("2", "checksum_a", "BLAKE2B", 1024, None, None)
+
+        self.assertEqual(self._get_game_components(), [])
+
+    def test_should_add_linked_game_to_parent_component(self):
+        self.dao.save_game_checksum("5", "checksum_a", "SHA256", 1024, None, None)
+        self.dao.link_game_to_game_with_checksum("7", "5")
+
+        self.assertEqual(self._get_game_components(), [("5", "5"), ("7", "5")])
+
+        self.dao.remove_all_checksums()
+
+        self.assertEqual(self._get_game_components(), [])
+
+    def test_should_store_epoch_and_day_key_for_play_time(self):
+        self.dao.save_game_dict("1001", "Zelda BOTW")
+        self.dao.save_play_time(datetime(2023, 1, 1, 23, 59, 59), 60, "1001")
+
+        with sqlite3.connect(self.database_file) as connection:
+            self.assertEqual(
+                connection.execute(
+                    "SELECT started_at_epoch, day_key, DATE(day_key * 86400, 'unixepoch') FROM play_time"
+                ).fetchone(),
+                (1672617599, 19358, "2023-01-01"),
+            )
+
+    def test_should_include_both_range_bounds_for_sessions_and_daily_report(self):
+        self.dao.save_game_dict("1001", "Zelda BOTW")
+        self.dao.save_play_time(datetime(2023, 1, 1, 0, 0, 0), 60, "1001")
+        self.dao.save_play_time(datetime(2023, 1, 1, 23, 59, 59), 60, "1001")
+
+        begin, end = datetime(2023, 1, 1, 0, 0, 0), datetime(2023, 1, 1, 23, 59, 59)
+        sessions = self.dao.fetch_sessions_for_period(begin, end)
+        report = self.dao.fetch_per_day_time_report(begin, end)
+
+        self.assertEqual(len(sessions["2023-01-01"]["1001"]), 2)
+        self.assertEqual(report[0].sessions, 2)
+
+    def test_should_read_daily_statistics_from_one_snapshot(self):
+        self.dao.save_game_dict("1001", "Zelda BOTW")
+        self.dao.save_play_time(datetime(2023, 1, 1, 10, 0), 60, "1001")
+        fetch_per_day_time_report = self.dao._fetch_per_day_time_report
+
+        def save_play_time_meanwhile(*args):
+            result = fetch_per_day_time_report(*args)
+            self.dao.save_play_time(datetime(2023, 1, 1, 12, 0), 60, "1001")
+            self.dao.save_play_time(datetime(2023, 1, 3, 12, 0), 60, "1001")
+            return result
+
+        with patch.object(
+            self.dao, "_fetch_per_day_time_report", save_play_time_meanwhile
+        ):
+            snapshot = self.dao.fetch_daily_statistics_for_period(
+                datetime(2023, 1, 1, 0, 0), datetime(2023, 1, 1, 23, 59, 59), "1001"
+            )
+
+        self.assertEqual(snapshot.daily_reports[0].sessions, 1)
+        self.assertEqual(
+            len(snapshot.sessions_by_day_and_game["2023-01-01"]["1001"]), 1
+        )
+        self.assertEqual(snapshot.last_sessions["1001"].date, "2023-01-01T10:00:00")
+        self.assertEqual((snapshot.has_prev, snapshot.has_next), (False, False))
+
+    def test_should_report_data_around_period_like_separate_checks(self):
+        self.dao.save_game_dict("1001", "Zelda BOTW")
+        self.dao.save_game_dict("1002", "DOOM")
+        self.dao.save_play_time(datetime(2023, 1, 1, 10, 0), 60, "1001")
+        self.dao.save_play_time(datetime(2023, 1, 5, 10, 0), 60, "1002")
+
+        for game_id in (None, "1001", "1002"):
+            for begin, end in (
+                (datetime(2023, 1, 2), datetime(2023, 1, 3)),
+                (datetime(2022, 12, 1), datetime(2023, 1, 1, 10, 0)),
+                (datetime(2023, 1, 5, 10, 0), datetime(2023, 2, 1)),
+            ):
+                with self.subTest(game_id=game_id, begin=begin, end=end):
+                    snapshot = self.dao.fetch_daily_statistics_for_period(
+                        begin, end, game_id
+                    )
+
+                    self.assertEqual(
+                        (snapshot.has_prev, snapshot.has_next),
+                        (
+                            self.dao.has_data_before(begin, game_id),
+                            self.dao.has_data_after(end, game_id),
+                        ),
+                    )
+
+    def _get_game_components(self):
+        with sqlite3.connect(self.database_file) as connection:
+            return connection.execute(
+                "SELECT game_id, leader_id FROM game_component ORDER BY game_id"
+            ).fetchall()
+
+    def _get_daily_rollup(self):
+        with sqlite3.connect(self.database_file) as connection:
+            return connection.execute(
+                "SELECT date, game_id, duration, sessions FROM play_time_daily ORDER BY date, game_id"
+            ).fetchall()
+
     def _get_overall_time_for_game(self, game_id: str):
         return list(
             filter(lambda x: x.game_id == game_id, self.dao.fetch_overall_playtime())
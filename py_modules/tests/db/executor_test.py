@@ -0,0 +1,115 @@
+import asyncio
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from py_modules.db.dao import Dao
+from py_modules.db.executor import DbExecutor
+from py_modules.db.migration import DbMigration
+from py_modules.statistics import Statistics
+from py_modules.tests.helpers import AbstractDatabaseTest
+from py_modules.time_tracking import TimeTracking
+
+SLOW_QUERY_S = 0.5
+
+
+class SlowOverallStatisticsDao(Dao):
+    def fetch_playtime_information(self):
+        time.sleep(SLOW_QUERY_S)
+        return super().fetch_playtime_information()
+
+
+class TestDbExecutor(AbstractDatabaseTest, unittest.IsolatedAsyncioTestCase):
+    executor: DbExecutor
+
+    def setUp(self) -> None:
+        super().setUp()
+        DbMigration(db=self.database).migrate()
+        self.executor = DbExecutor()
+
+    def tearDown(self) -> None:
+        self.executor.shutdown()
+        super().tearDown()
+
+    async def test_slow_overall_statistics_should_not_delay_add_time(self):
+        statistics = Statistics(SlowOverallStatisticsDao(self.database))
+        time_tracking = TimeTracking(Dao(self.database))
+        now = datetime(2022, 1, 1, 9, 0)
+
+        slow_read = asyncio.create_task(
+            self.executor.read(statistics.fetch_playtime_information)
+        )
+        await asyncio.sleep(0.05)
+
+        started = time.perf_counter()
+        await self.executor.write(
+            time_tracking.add_time,
+            now.timestamp(),
+            (now + timedelta(hours=1)).timestamp(),
+            "100",
+            "Zelda BOTW",
+        )
+        elapsed = time.perf_counter() - started
+
+        self.assertFalse(slow_read.done())
+        self.assertLess(elapsed, SLOW_QUERY_S / 2)
+
+        await slow_read
+        self.assertEqual(
+            Dao(self.database).fetch_overall_playtime()[0].time, 3600
+        )
+
+    async def test_should_keep_event_loop_responsive_during_reads(self):
+        statistics = Statistics(SlowOverallStatisticsDao(self.database))
+
+        slow_read = asyncio.create_task(
+            self.executor.read(statistics.fetch_playtime_information)
+        )
+
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+
+        self.assertLess(time.perf_counter() - started, SLOW_QUERY_S / 2)
+        await slow_read
+
+    async def test_should_run_writes_serially_on_single_thread(self):
+        running = 0
+        max_running = 0
+        threads = set()
+        lock = threading.Lock()
+
+        def write():
+            nonlocal running, max_running
+
+            with lock:
+                running += 1
+                max_running = max(max_running, running)
+                threads.add(threading.current_thread().name)
+
+            time.sleep(0.02)
+
+            with lock:
+                running -= 1
+
+        await asyncio.gather(*(self.executor.write(write) for _ in range(5)))
+
+        self.assertEqual(max_running, 1)
+        self.assertEqual(len(threads), 1)
+
+    async def test_should_run_reads_concurrently(self):
+        barrier = threading.Barrier(2, timeout=2)
+
+        await asyncio.gather(
+            self.executor.read(barrier.wait), self.executor.read(barrier.wait)
+        )
+
+    async def test_should_propagate_exceptions(self):
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            await self.executor.write(fail)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,9 @@
 import sqlite3
-from py_modules.db.migration import DbMigration
+from datetime import datetime
+from unittest.mock import patch
+from py_modules.helpers import to_epoch
+from py_modules.db.migration import LATEST_VERSION, DbMigration, Migration, _migrations
+from py_modules.db.sqlite_db import SqlLiteDb
 from py_modules.tests.helpers import AbstractDatabaseTest
 
 
@@ -7,6 +11,20 @@ class TestDbMigration(AbstractDatabaseTest):
     def get_migration(self):
         return DbMigration(self.database)
 
+    def _migrate_before(self, version: int) -> DbMigration:
+        """
+        Applies every migration older than `version`, like an old plugin did.
+        """
+        migration = self.get_migration()
+        legacy_migrations = [m for m in _migrations if m.version < version]
+
+        with patch("py_modules.db.migration._migrations", legacy_migrations), patch(
+            "py_modules.db.migration.LATEST_VERSION", version - 1
+        ):
+            migration.migrate()
+
+        return migration
+
     def test_database_schema(self):
         self.get_migration().migrate()
         self.assertEqual(
@@ -16,6 +34,8 @@ class TestDbMigration(AbstractDatabaseTest):
                 (1, "duration", "INT", 0, None, 0, 0),
                 (2, "game_id", "TEXT", 0, None, 0, 0),
                 (3, "migrated", "TEXT", 0, None, 0, 0),
+                (4, "started_at_epoch", "INTEGER", 0, None, 0, 0),
+                (5, "day_key", "INTEGER", 0, None, 0, 0),
             ],
         )
         self.assertEqual(
@@ -48,3 +68,176 @@ class TestDbMigration(AbstractDatabaseTest):
                 str(e),
                 "Database have been updated with latest version. Please update plugin",
             )
+
+    def test_should_backfill_daily_rollup(self):
+        migration = self._migrate_before(7)
+
+        with sqlite3.connect(self.database_file) as connection:
+            connection.executemany(
+                "INSERT INTO play_time (date_time, duration, game_id, migrated) VALUES (?, ?, ?, ?)",
+                [
+                    ("2023-01-01T09:00:00", 3600, "1001", None),
+                    ("2023-01-01T23:30:00", 600, "1001", None),
+                    ("2023-01-02T00:00:00", 1200, "1001", None),
+                    ("2023-01-02T10:00:00", 500, "1002", None),
+                    ("2023-01-02T11:00:00", 9999, "1002", "manually-changed"),
+                ],
+            )
+
+        migration.migrate()
+
+        with sqlite3.connect(self.database_file) as connection:
+            self.assertEqual(
+                connection.execute(
+                    "SELECT date, game_id, duration, sessions FROM play_time_daily ORDER BY date, game_id"
+                ).fetchall(),
+                [
+                    ("2023-01-01", "1001", 4200, 2),
+                    ("2023-01-02", "1001", 1200, 1),
+                    ("2023-01-02", "1002", 500, 1),
+                ],
+            )
+
+    def test_should_backfill_game_components(self):
+        migration = self._migrate_before(8)
+
+        with sqlite3.connect(self.database_file) as connection:
+            connection.executemany(
+                "INSERT INTO game_file_checksum (game_id, checksum, algorithm, chunk_size) VALUES (?, ?, ?, ?)",
+                [
+                    ("30", "checksum_a", "SHA256", 1024),
+                    ("20", "checksum_a", "SHA256", 1024),
+                    ("20", "checksum_b", "SHA256", 1024),
+                    ("10", "checksum_b", "SHA256", 1024),
+                    ("40", "checksum_c", "SHA256", 1024),
+                ],
+            )
+
+        migration.migrate()
+
+        with sqlite3.connect(self.database_file) as connection:
+            self.assertEqual(
+                connection.execute(
+                    "SELECT game_id, leader_id FROM game_component ORDER BY game_id"
+                ).fetchall(),
+                [("10", "10"), ("20", "10"), ("30", "10")],
+            )
+
+    def test_should_backfill_play_time_epoch_columns(self):
+        migration = self._migrate_before(9)
+
+        with sqlite3.connect(self.database_file) as connection:
+            connection.executemany(
+                "INSERT INTO play_time (date_time, duration, game_id) VALUES (?, ?, ?)",
+                [
+                    ("2023-01-01T09:00:00", 3600, "1001"),
+                    ("2023-03-26T02:30:00.123456", 600, "1001"),
+                ],
+            )
+
+        migration.migrate()
+
+        with sqlite3.connect(self.database_file) as connection:
+            self.assertEqual(
+                connection.execute(
+                    "SELECT started_at_epoch, day_key FROM play_time ORDER BY rowid"
+                ).fetchall(),
+                [
+                    (to_epoch(datetime(2023, 1, 1, 9, 0)), 19358),
+                    (to_epoch(datetime(2023, 3, 26, 2, 30)), 19442),
+                ],
+            )
+
+    def test_should_keep_checksums_when_allowing_sampled_fingerprints(self):
+        migration = self._migrate_before(11)
+
+        with sqlite3.connect(self.database_file) as connection:
+            connection.execute(
+                "INSERT INTO game_file_checksum (game_id, checksum, algorithm, chunk_size, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                ("10", "checksum_a", "SHA256", 1024, "2023-01-01", "2023-01-02"),
+            )
+
+        migration.migrate()
+
+        with sqlite3.connect(self.database_file) as connection:
+            connection.execute(
+                "INSERT INTO game_file_checksum (game_id, checksum, algorithm, chunk_size, region_count) VALUES (?, ?, ?, ?, ?)",
+                ("10", "checksum_b", "SAMPLED_SHA256", 1024, 16),
+            )
+
+            self.assertEqual(
+                connection.execute(
+                    "SELECT checksum_id, checksum, algorithm, region_count, updated_at FROM game_file_checksum ORDER BY checksum_id"
+                ).fetchall()[0],
+                (1, "checksum_a", "SHA256", None, "2023-01-02"),
+            )
+
+            for algorithm, region_count in (("SAMPLED_SHA256", None), ("SHA256", 16)):
+                with self.subTest(algorithm=algorithm, region_count=region_count):
+                    with self.assertRaises(sqlite3.IntegrityError):
+                        connection.execute(
+                            "INSERT INTO game_file_checksum (game_id, checksum, algorithm, chunk_size, region_count) VALUES (?, ?, ?, ?, ?)",
+                            ("20", "checksum_c", algorithm, 1024, region_count),
+                        )
+
+    def test_should_only_read_user_version_when_schema_is_current(self):
+        self.get_migration().migrate()
+        self.database.close()
+        self.database = StatementRecordingSqlLiteDb(self.database_file)
+
+        self.get_migration().migrate()
+
+        self.assertEqual(self.database.statements, ["PRAGMA user_version"])
+
+    def test_should_set_user_version_of_database_migrated_before_it_was_used(self):
+        migration = self._migrate_before(LATEST_VERSION + 1)
+
+        with sqlite3.connect(self.database_file) as connection:
+            connection.execute("PRAGMA user_version = 0")
+
+        migration.migrate()
+
+        with sqlite3.connect(self.database_file) as connection:
+            self.assertEqual(
+                connection.execute("PRAGMA user_version").fetchone()[0], LATEST_VERSION
+            )
+            self.assertEqual(
+                connection.execute("SELECT COUNT(*) FROM migration").fetchone()[0],
+                len(_migrations),
+            )
+
+    def test_should_roll_back_every_pending_migration_on_failure(self):
+        failing = Migration(
+            LATEST_VERSION + 1,
+            [
+                "CREATE TABLE created_before_failure (id INT)",
+                "INSERT INTO missing_table VALUES (1)",
+            ],
+        )
+
+        with patch(
+            "py_modules.db.migration._migrations", [*_migrations, failing]
+        ), patch("py_modules.db.migration.LATEST_VERSION", failing.version):
+            with self.assertRaises(sqlite3.OperationalError):
+                self.get_migration().migrate()
+
+        with sqlite3.connect(self.database_file) as connection:
+            self.assertEqual(
+                connection.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                ).fetchall(),
+                [],
+            )
+            self.assertEqual(connection.execute("PRAGMA user_version").fetchone()[0], 0)
+
+
+class StatementRecordingSqlLiteDb(SqlLiteDb):
+    def __init__(self, database_path: str):
+        super().__init__(database_path)
+        self.statements = []
+
+    def _connect(self, query_only: bool = False):
+        connection = super()._connect(query_only)
+        connection.set_trace_callback(self.statements.append)
+
+        return connection
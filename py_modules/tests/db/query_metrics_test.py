@@ -0,0 +1,149 @@
+import sqlite3
+import unittest
+from datetime import datetime
+from unittest.mock import Mock
+
+from py_modules.db.dao import Dao
+from py_modules.db.migration import DbMigration
+from py_modules.db.query_metrics import QueryMetrics, explain_query_plan
+from py_modules.tests.helpers import AbstractDatabaseTest
+
+
+class Clock:
+    """
+    Every query takes the next duration of `durations`, in seconds.
+    """
+
+    def __init__(self, durations) -> None:
+        self.now = 0.0
+        self._durations = iter(durations)
+        self._started = False
+
+    def __call__(self) -> float:
+        if self._started:
+            self.now += next(self._durations)
+
+        self._started = not self._started
+
+        return self.now
+
+
+class TestQueryMetrics(unittest.TestCase):
+    def setUp(self) -> None:
+        self.connection = sqlite3.connect(":memory:")
+        self.connection.execute(
+            "CREATE TABLE play_time (game_id TEXT, duration INTEGER)"
+        )
+        self.connection.execute(
+            "CREATE INDEX play_time_game_id_idx ON play_time (game_id)"
+        )
+        self.logger = Mock()
+
+    def tearDown(self) -> None:
+        self.connection.close()
+
+    def test_should_group_timings_per_named_query(self):
+        metrics = QueryMetrics(
+            logger=self.logger, clock=Clock([0.001 * i for i in range(1, 101)])
+        )
+        metrics.execute_many(
+            self.connection,
+            "insert",
+            "INSERT INTO play_time VALUES (?, ?)",
+            [("1001", 10), ("1002", 20), ("1001", 30)],
+        )
+
+        for _ in range(99):
+            metrics.fetch_all(
+                self.connection,
+                "by_game",
+                "SELECT duration FROM play_time WHERE game_id = ?",
+                ("1001",),
+            )
+
+        by_game, insert = metrics.snapshot().queries
+
+        self.assertEqual((insert.name, insert.count, insert.rows), ("insert", 1, 3))
+        self.assertEqual(
+            (by_game.name, by_game.count, by_game.rows), ("by_game", 99, 198)
+        )
+        self.assertAlmostEqual(by_game.total_ms, sum(range(2, 101)))
+        self.assertAlmostEqual(by_game.p50_ms, 51)
+        self.assertAlmostEqual(by_game.p99_ms, 100)
+        self.assertAlmostEqual(by_game.max_ms, 100)
+        self.assertEqual(by_game.slow, 0)
+        self.logger.warning.assert_not_called()
+
+    def test_should_log_slow_query_with_its_plan(self):
+        metrics = QueryMetrics(
+            slow_query_threshold_ms=50, logger=self.logger, clock=Clock([0.01, 0.2])
+        )
+        self.connection.row_factory = lambda c, row: {"duration": row[0]}
+        sql = "SELECT duration FROM play_time WHERE game_id = ?"
+
+        metrics.fetch_all(self.connection, "fast", sql, ("1001",))
+        metrics.fetch_one(self.connection, "slow", sql, ("1001",))
+
+        self.logger.warning.assert_called_once()
+        args = self.logger.warning.call_args.args
+        self.assertEqual(args[1], "slow")
+        self.assertAlmostEqual(args[2], 200)
+        self.assertIn("USING INDEX play_time_game_id_idx", args[4])
+        self.assertEqual(
+            [(query.name, query.slow) for query in metrics.snapshot().queries],
+            [("slow", 1), ("fast", 0)],
+        )
+
+    def test_should_explain_query_plan_as_tree(self):
+        plan = explain_query_plan(
+            self.connection,
+            "SELECT * FROM play_time WHERE game_id IN (SELECT game_id FROM play_time)",
+        )
+
+        self.assertTrue(plan.splitlines()[0].startswith("SEARCH play_time"))
+        self.assertTrue(any(line.startswith("  ") for line in plan.splitlines()))
+
+    def test_should_not_record_failed_statement(self):
+        metrics = QueryMetrics(logger=self.logger)
+
+        with self.assertRaises(sqlite3.OperationalError):
+            metrics.fetch_all(self.connection, "broken", "SELECT * FROM missing")
+
+        self.assertEqual(metrics.snapshot().queries, [])
+
+
+class TestDaoQueryMetrics(AbstractDatabaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        DbMigration(db=self.database).migrate()
+        self.dao = Dao(db=self.database)
+
+    def test_should_record_every_dao_statement_by_name(self):
+        self.dao.save_game_dict("1001", "Zelda BOTW")
+        self.dao.save_play_time(datetime(2023, 1, 1, 9, 0), 3600, "1001")
+        self.dao.fetch_per_day_time_report(datetime(2023, 1, 1), datetime(2023, 1, 2))
+        self.dao.fetch_per_day_time_report(datetime(2023, 1, 1), datetime(2023, 1, 2))
+
+        queries = {
+            query.name: (query.count, query.rows)
+            for query in self.dao.metrics.snapshot().queries
+        }
+
+        self.assertEqual(
+            queries,
+            {
+                "save_game_dict": (1, 1),
+                "save_play_time": (1, 1),
+                "append_overall_time": (1, 1),
+                "append_daily_time": (1, 1),
+                "fetch_per_day_time_report": (2, 2),
+            },
+        )
+        self.assertIn(
+            "FROM play_time_daily ptd",
+            self.dao.metrics.statements()["fetch_per_day_time_report"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
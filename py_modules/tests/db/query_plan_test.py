@@ -0,0 +1,351 @@
+import ast
+import inspect
+import re
+import unittest
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+from py_modules.db import dao as dao_module
+from py_modules.db.dao import Dao
+from py_modules.db.migration import DbMigration
+from py_modules.db.query_metrics import QueryMetrics, explain_query_plan
+from py_modules.tests.helpers import AbstractDatabaseTest
+
+GAME_FILE_CHECKSUM_UNIQUE = "sqlite_autoindex_game_file_checksum_1"
+GAME_DICT_PK = "sqlite_autoindex_game_dict_1"
+OVERALL_TIME_PK = "sqlite_autoindex_overall_time_1"
+
+
+@dataclass(frozen=True)
+class ExpectedPlan:
+    # Every index has to show up in the plan
+    indexes: FrozenSet[str] = frozenset()
+    # Tables, by alias, that may be read in full. Scans of subqueries are not
+    # counted, materialized CTEs show up by their alias and must be listed.
+    allowed_scans: FrozenSet[str] = frozenset()
+    # `play_time` may only be read in full by reports over the whole history
+    whole_history: bool = False
+
+
+def plan(
+    *indexes: str, allowed_scans: Tuple[str, ...] = (), whole_history: bool = False
+) -> ExpectedPlan:
+    return ExpectedPlan(frozenset(indexes), frozenset(allowed_scans), whole_history)
+
+
+# NOTE: Inserts and upserts by primary key have no plan
+EXPECTED_PLANS: Dict[str, ExpectedPlan] = {
+    "save_game_dict": plan(),
+    "save_play_time": plan(),
+    "append_overall_time": plan(),
+    "append_daily_time": plan(),
+    "save_play_time_bulk.game_dict": plan(),
+    "save_play_time_bulk.play_time": plan(),
+    "save_play_time_bulk.overall_time": plan(),
+    "save_play_time_bulk.play_time_daily": plan(),
+    "apply_manual_time_for_game.current_time": plan(
+        "play_time_game_id_started_at_epoch_idx"
+    ),
+    "has_data_before": plan("play_time_day_key_game_id_idx"),
+    "has_data_before.game": plan("play_time_game_id_started_at_epoch_idx"),
+    "has_data_after": plan("play_time_day_key_game_id_idx"),
+    "has_data_after.game": plan("play_time_game_id_started_at_epoch_idx"),
+    "has_play_time_started_at": plan("play_time_game_id_started_at_epoch_idx"),
+    "has_data_around": plan("play_time_day_key_game_id_idx"),
+    "has_data_around.game": plan("play_time_game_id_started_at_epoch_idx"),
+    # NOTE: `dg` is the `DayGroups` CTE, one row per game and day
+    "fetch_per_day_time_report": plan(
+        GAME_DICT_PK, GAME_FILE_CHECKSUM_UNIQUE, allowed_scans=("dg",)
+    ),
+    "fetch_per_day_time_report.game": plan(
+        GAME_DICT_PK, GAME_FILE_CHECKSUM_UNIQUE, allowed_scans=("dg",)
+    ),
+    "fetch_sessions_for_period": plan(
+        "play_time_day_key_game_id_idx", allowed_scans=("dg",)
+    ),
+    "fetch_sessions_for_period.game": plan(
+        "play_time_day_key_game_id_idx", allowed_scans=("dg",)
+    ),
+    "fetch_game_sessions": plan("play_time_game_id_date_time_idx"),
+    "fetch_last_sessions_for_games": plan("play_time_game_id_started_at_epoch_idx"),
+    "get_game": plan(OVERALL_TIME_PK, GAME_DICT_PK),
+    "get_game_files_checksum": plan(GAME_FILE_CHECKSUM_UNIQUE),
+    "save_game_checksum": plan(),
+    "save_game_checksum_bulk": plan(),
+    "replace_game_checksum_bulk.remove": plan(GAME_FILE_CHECKSUM_UNIQUE),
+    "replace_game_checksum_bulk.save": plan(),
+    "link_game_to_game_with_checksum": plan(GAME_FILE_CHECKSUM_UNIQUE),
+    "remove_game_checksum": plan(GAME_FILE_CHECKSUM_UNIQUE),
+    "remove_all_game_checksums": plan(GAME_FILE_CHECKSUM_UNIQUE),
+    "remove_all_checksums": plan(),
+    "remove_all_checksums.game_component": plan(),
+    # Whole library reports, every game is part of the result
+    "fetch_overall_playtime": plan(
+        GAME_DICT_PK, allowed_scans=("game_file_checksum", "ot")
+    ),
+    # Whole history: the last session of every game, ranked over all sessions
+    "fetch_overall_playtime_summary": plan(
+        "play_time_game_id_started_at_epoch_idx",
+        allowed_scans=("game_file_checksum", "ot"),
+        whole_history=True,
+    ),
+    # Whole history: all time totals and last played date of every game
+    "fetch_playtime_information": plan(
+        "play_time_game_id_date_time_idx",
+        allowed_scans=("gd", "cm"),
+        whole_history=True,
+    ),
+    # NOTE: `ptp` and `pc` are the per game and per component totals of the period
+    "fetch_playtime_information_for_period": plan(
+        "play_time_day_key_game_id_idx",
+        "play_time_game_id_date_time_idx",
+        allowed_scans=("gd", "ptp", "pc"),
+    ),
+    # Whole history: exports every session that was ever saved
+    "fetch_all_game_sessions_report": plan(
+        "play_time_game_id_started_at_epoch_idx", whole_history=True
+    ),
+    # Whole history: the last session of every game, ranked over all sessions
+    "fetch_all_last_playtime_session_information": plan(
+        "play_time_game_id_started_at_epoch_idx", whole_history=True
+    ),
+    "get_games_dictionary": plan(allowed_scans=("gd",)),
+    "get_games_dictionary_with_checksums": plan(
+        GAME_FILE_CHECKSUM_UNIQUE, allowed_scans=("gd",)
+    ),
+    "get_games_checksum": plan(GAME_DICT_PK, allowed_scans=("gfc",)),
+}
+
+_QUERY_METHODS = {"fetch_all", "fetch_one", "execute", "execute_many"}
+_SCAN = re.compile(r"^SCAN (\S+(?: ROW)?)")
+_DERIVED = re.compile(r"^(?:CO-ROUTINE|MATERIALIZE) (\S+)")
+_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\S+)")
+_PLAY_TIME = re.compile(r"\bplay_time\b(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_NOT_ALIASES = {
+    "CROSS",
+    "GROUP",
+    "INDEXED",
+    "INNER",
+    "JOIN",
+    "LEFT",
+    "LIMIT",
+    "NOT",
+    "ON",
+    "ORDER",
+    "SET",
+    "UNION",
+    "USING",
+    "WHERE",
+    "WINDOW",
+}
+
+
+class PlanRecordingQueryMetrics(QueryMetrics):
+    def __init__(self) -> None:
+        super().__init__()
+        self.plans: Dict[str, Set[str]] = {}
+
+    def _record(self, connection, name, sql, parameters, started_at, rows) -> None:
+        self.plans.setdefault(name, set()).add(
+            explain_query_plan(connection, sql, parameters)
+        )
+        super()._record(connection, name, sql, parameters, started_at, rows)
+
+
+def dao_query_names() -> Set[str]:
+    """
+    Names of every query `Dao` runs through `QueryMetrics`, read from its source.
+    """
+    names: Set[str] = set()
+
+    for node in ast.walk(ast.parse(inspect.getsource(dao_module))):
+        if not (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Attribute)
+            and node.func.attr in _QUERY_METHODS
+            and ast.unparse(node.func.value) == "self.metrics"
+        ):
+            continue
+
+        name = node.args[1]
+        candidates = [name]
+
+        if isinstance(name, ast.IfExp):
+            candidates = [name.body, name.orelse]
+
+        for candidate in candidates:
+            if not isinstance(candidate, ast.Constant):
+                raise AssertionError(
+                    f"Query name must be a literal: {ast.unparse(candidate)}"
+                )
+
+            names.add(candidate.value)
+
+    return names
+
+
+def play_time_aliases(sql: str) -> FrozenSet[str]:
+    """
+    Names `play_time` is read under in `sql`, it shows up by alias in plans.
+    """
+    aliases = {"play_time"}
+
+    for match in _PLAY_TIME.finditer(sql):
+        alias = match.group(1)
+
+        if alias is not None and alias.upper() not in _NOT_ALIASES:
+            aliases.add(alias)
+
+    return frozenset(aliases)
+
+
+def plan_violations(
+    query_plan: str,
+    expected: ExpectedPlan,
+    play_time_tables: FrozenSet[str] = frozenset(),
+) -> List[str]:
+    lines = [line.strip() for line in query_plan.splitlines()]
+    derived = {m.group(1) for m in map(_DERIVED.match, lines) if m is not None}
+    used_indexes = {m.group(1) for line in lines for m in _INDEX.finditer(line)}
+    violations = []
+
+    for line in lines:
+        scan = _SCAN.match(line)
+
+        if scan is None:
+            continue
+
+        target = scan.group(1)
+
+        if (
+            target == "CONSTANT ROW"
+            or target.startswith("(subquery-")
+            or target in derived
+        ):
+            continue
+
+        if target in play_time_tables:
+            if not expected.whole_history:
+                violations.append(f"full scan of play_time: {line}")
+        elif target not in expected.allowed_scans:
+            violations.append(f"unexpected full scan: {line}")
+
+    for index in sorted(expected.indexes - used_indexes):
+        violations.append(f"index not used: {index}")
+
+    return violations
+
+
+class TestDaoQueryPlans(AbstractDatabaseTest):
+    """
+    Runs `EXPLAIN QUERY PLAN` for every statement `Dao` executes against the
+    migrated schema. A new query needs an entry in `EXPECTED_PLANS`.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        DbMigration(db=self.database).migrate()
+        self.metrics = PlanRecordingQueryMetrics()
+        self.dao = Dao(db=self.database, metrics=self.metrics)
+
+    def _run_every_query(self) -> None:
+        started_at = datetime(2023, 1, 1, 9, 0)
+        day_end = datetime(2023, 1, 1, 23, 59)
+
+        self.dao.save_game_dict("1001", "Zelda BOTW")
+        self.dao.save_play_time(started_at, 3600, "1001")
+        self.dao.save_play_time_bulk({"1002": "DOOM"}, [(started_at, 60, "1002")])
+        self.dao.apply_manual_time_for_game(
+            started_at, "1001", "Zelda BOTW", 7200, "manually-changed"
+        )
+        self.dao.save_game_checksum("1001", "checksum", "SHA256", 1, None, None)
+        self.dao.save_game_checksum_bulk(
+            [("1002", "checksum", "SHA256", 1, None, None, None)]
+        )
+        self.dao.replace_game_checksum_bulk(
+            [("1002", "new_checksum", "SHA256", 1, None, None, None)],
+            [("1002", "checksum", "SHA256", 1, None)],
+        )
+        self.dao.link_game_to_game_with_checksum("1003", "1001")
+
+        for game_id in (None, "1001"):
+            self.dao.fetch_per_day_time_report(started_at, day_end, game_id)
+            self.dao.has_data_before(started_at, game_id)
+            self.dao.has_data_after(started_at, game_id)
+            self.dao.fetch_sessions_for_period(started_at, day_end, game_id)
+            self.dao.fetch_daily_statistics_for_period(started_at, day_end, game_id)
+
+        self.dao.has_play_time_started_at("1001", started_at)
+        self.dao.fetch_overall_playtime()
+        self.dao.fetch_overall_playtime_summary()
+        self.dao.fetch_game_sessions("1001", None, 10)
+        self.dao.fetch_game_sessions("1001", (started_at.isoformat(), 1), 10)
+        self.dao.fetch_playtime_information()
+        self.dao.fetch_playtime_information_for_period(started_at, day_end)
+        self.dao.fetch_all_game_sessions_report()
+        self.dao.fetch_all_last_playtime_session_information()
+        self.dao.fetch_last_sessions_for_games(["1001", "1002"])
+        self.dao.get_game("1001")
+        self.dao.get_games_dictionary()
+        self.dao.get_games_dictionary_with_checksums()
+        self.dao.get_game_files_checksum("1001")
+        self.dao.get_games_checksum()
+        self.dao.remove_game_checksum("1001", "checksum")
+        self.dao.remove_all_game_checksums("1002")
+        self.dao.remove_all_checksums()
+
+    def test_every_query_should_declare_expected_plan(self):
+        self.assertEqual(set(EXPECTED_PLANS), dao_query_names())
+
+    def test_every_query_should_use_expected_plan(self):
+        self._run_every_query()
+
+        self.assertEqual(set(self.metrics.plans), set(EXPECTED_PLANS))
+        statements = self.metrics.statements()
+
+        for name, plans in sorted(self.metrics.plans.items()):
+            for query_plan in plans:
+                with self.subTest(query=name):
+                    self.assertEqual(
+                        plan_violations(
+                            query_plan,
+                            EXPECTED_PLANS[name],
+                            play_time_aliases(statements[name]),
+                        ),
+                        [],
+                        f"plan of {name}:\n{query_plan}",
+                    )
+
+    def test_should_report_scan_of_play_time(self):
+        violations = plan_violations(
+            "SCAN pt\nSEARCH gd USING INDEX sqlite_autoindex_game_dict_1 (game_id=?)",
+            plan("play_time_game_id_date_time_idx"),
+        )
+
+        self.assertEqual(
+            violations,
+            [
+                "unexpected full scan: SCAN pt",
+                "index not used: play_time_game_id_date_time_idx",
+            ],
+        )
+
+    def test_should_report_scan_of_play_time_by_alias_even_if_allowed(self):
+        sql = "SELECT * FROM play_time AS p JOIN game_dict gd ON gd.game_id = p.game_id"
+
+        self.assertEqual(play_time_aliases(sql), frozenset({"play_time", "p"}))
+        self.assertEqual(
+            plan_violations(
+                "SCAN p\nSCAN gd", plan(allowed_scans=("p", "gd")), frozenset({"p"})
+            ),
+            ["full scan of play_time: SCAN p"],
+        )
+        self.assertEqual(
+            plan_violations("SCAN p", plan(whole_history=True), frozenset({"p"})),
+            [],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import os
+import sqlite3
+import threading
+from py_modules.db.sqlite_db import PragmaProfile, SqlLiteDb
+from py_modules.tests.helpers import AbstractDatabaseTest
+
+
+class TestSqlLiteDb(AbstractDatabaseTest):
+    def test_should_reuse_writer_connection(self):
+        with self.database.transactional() as first:
+            pass
+
+        with self.database.transactional() as second:
+            pass
+
+        self.assertIs(first, second)
+
+    def test_should_reuse_reader_connection(self):
+        with self.database.readonly() as first:
+            pass
+
+        with self.database.readonly() as second:
+            pass
+
+        self.assertIs(first, second)
+
+    def test_should_not_allow_writes_on_reader_connection(self):
+        with self.database.readonly() as connection:
+            with self.assertRaises(sqlite3.OperationalError):
+                connection.execute("CREATE TABLE forbidden (id INT)")
+
+    def test_should_reset_row_factory_when_connection_is_returned(self):
+        with self.database.readonly() as connection:
+            connection.row_factory = lambda c, row: row[0]
+
+        with self.database.readonly() as connection:
+            self.assertIsNone(connection.row_factory)
+
+    def test_should_replace_broken_reader_connection(self):
+        with self.database.readonly() as first:
+            pass
+
+        first.close()
+
+        with self.database.readonly() as second:
+            self.assertEqual(second.execute("SELECT 1").fetchone(), (1,))
+
+        self.assertIsNot(first, second)
+
+    def test_should_rollback_writer_on_exception(self):
+        with self.database.transactional() as connection:
+            connection.execute("CREATE TABLE t (id INT)")
+
+        with self.assertRaises(ValueError):
+            with self.database.transactional() as connection:
+                connection.execute("INSERT INTO t (id) VALUES (1)")
+                raise ValueError("boom")
+
+        with self.database.readonly() as connection:
+            self.assertEqual(connection.execute("SELECT count(*) FROM t").fetchone(), (0,))
+
+    def test_should_see_committed_writes_from_readers(self):
+        with self.database.transactional() as connection:
+            connection.execute("CREATE TABLE t (id INT)")
+            connection.execute("INSERT INTO t (id) VALUES (1)")
+
+        with self.database.readonly() as connection:
+            self.assertEqual(connection.execute("SELECT id FROM t").fetchone(), (1,))
+
+    def test_should_not_see_writes_committed_during_snapshot(self):
+        with self.database.transactional() as connection:
+            connection.execute("CREATE TABLE t (id INT)")
+            connection.execute("INSERT INTO t (id) VALUES (1)")
+
+        with self.database.snapshot() as reader:
+            self.assertEqual(reader.execute("SELECT count(*) FROM t").fetchone(), (1,))
+
+            with self.database.transactional() as connection:
+                connection.execute("INSERT INTO t (id) VALUES (2)")
+
+            self.assertEqual(reader.execute("SELECT count(*) FROM t").fetchone(), (1,))
+
+        with self.database.readonly() as reader:
+            self.assertFalse(reader.in_transaction)
+            self.assertEqual(reader.execute("SELECT count(*) FROM t").fetchone(), (2,))
+
+    def test_should_limit_concurrent_readers(self):
+        borrowed = []
+        release = threading.Event()
+
+        def borrow():
+            with self.database.readonly() as connection:
+                borrowed.append(connection)
+                release.wait(timeout=5)
+
+        threads = [threading.Thread(target=borrow) for _ in range(3)]
+
+        for thread in threads:
+            thread.start()
+
+        threads[0].join(timeout=0.2)
+        self.assertEqual(len(borrowed), 2)
+
+        release.set()
+
+        for thread in threads:
+            thread.join(timeout=5)
+
+        self.assertEqual(len(borrowed), 3)
+        self.assertLessEqual(len({id(c) for c in borrowed}), 2)
+
+    def test_should_refuse_connections_after_close(self):
+        self.database.close()
+
+        with self.assertRaises(sqlite3.ProgrammingError):
+            with self.database.transactional():
+                pass
+
+        with self.assertRaises(sqlite3.ProgrammingError):
+            with self.database.readonly():
+                pass
+
+    def test_should_apply_pragma_profile_to_every_connection(self):
+        with self.database.transactional() as writer:
+            self.assertEqual(writer.execute("PRAGMA journal_mode").fetchone(), ("wal",))
+            self.assertEqual(writer.execute("PRAGMA synchronous").fetchone(), (1,))
+            self.assertEqual(writer.execute("PRAGMA temp_store").fetchone(), (2,))
+            self.assertEqual(writer.execute("PRAGMA busy_timeout").fetchone(), (5000,))
+
+        with self.database.readonly() as reader:
+            self.assertEqual(reader.execute("PRAGMA journal_mode").fetchone(), ("wal",))
+            self.assertEqual(reader.execute("PRAGMA cache_size").fetchone(), (-8192,))
+
+    def test_should_apply_custom_pragma_profile(self):
+        self.database.close()
+        self.database = SqlLiteDb(
+            self.database_file,
+            pragmas=PragmaProfile(
+                journal_mode="DELETE", synchronous="FULL", cache_size=-1024
+            ),
+        )
+
+        with self.database.readonly() as reader:
+            self.assertEqual(reader.execute("PRAGMA journal_mode").fetchone(), ("delete",))
+            self.assertEqual(reader.execute("PRAGMA synchronous").fetchone(), (2,))
+            self.assertEqual(reader.execute("PRAGMA cache_size").fetchone(), (-1024,))
+
+    def test_should_reject_unknown_pragma_values(self):
+        with self.assertRaises(ValueError):
+            PragmaProfile(journal_mode="WAL; DROP TABLE play_time")
+
+        with self.assertRaises(ValueError):
+            PragmaProfile(busy_timeout=-1)
+
+    def test_should_truncate_wal_file_on_checkpoint(self):
+        with self.database.transactional() as connection:
+            connection.execute("CREATE TABLE t (id INT)")
+            connection.executemany(
+                "INSERT INTO t (id) VALUES (?)", [(i,) for i in range(1000)]
+            )
+
+        self.assertGreater(os.path.getsize(f"{self.database_file}-wal"), 0)
+
+        busy, _, _ = self.database.checkpoint()
+
+        self.assertEqual(busy, 0)
+        self.assertEqual(os.path.getsize(f"{self.database_file}-wal"), 0)
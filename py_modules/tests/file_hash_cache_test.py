@@ -0,0 +1,224 @@
+import hashlib
+import os
+import sqlite3
+import unittest
+from unittest.mock import patch
+from py_modules.file_hash_cache import TOUCH_BATCH_SIZE, FileHashCache
+
+with patch.dict("os.environ", {"DECKY_PLUGIN_RUNTIME_DIR": "./python/tests/data"}):
+    from py_modules.files import CHUNK_SIZE, Files
+
+
+class Counter:
+    def __init__(self) -> None:
+        self.value = 0
+
+    def __call__(self) -> int:
+        self.value += 1
+        return self.value
+
+
+class TestFileHashCache(unittest.TestCase):
+    cache_file = f"test_file_hash_cache_{os.getpid()}.db"
+    file_path = f"temp_hashed_file_{os.getpid()}"
+
+    def setUp(self) -> None:
+        self._remove_files()
+        self.cache = FileHashCache(self.cache_file, clock=Counter())
+        self.files = Files(self.cache)
+
+    def tearDown(self) -> None:
+        self.cache.close()
+        self._remove_files()
+
+    def _remove_files(self) -> None:
+        for path in (self.file_path, f"{self.file_path}-2"):
+            if os.path.exists(path):
+                os.remove(path)
+
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.cache_file + suffix):
+                os.remove(self.cache_file + suffix)
+
+    def _write(self, content: bytes, path: str | None = None) -> str:
+        path = path or self.file_path
+
+        with open(path, "wb") as f:
+            f.write(content)
+
+        return path
+
+    def test_should_return_cached_digest_without_reading_file(self):
+        self._write(b"hello")
+        expected = hashlib.sha256(b"hello").hexdigest()
+
+        self.assertEqual(self.files.get_file_sha256(self.file_path), expected)
+
+        with patch.object(
+            Files, "_digest_of_head_and_tail", side_effect=AssertionError("read")
+        ), patch("builtins.open", side_effect=AssertionError("opened")):
+            self.assertEqual(self.files.get_file_sha256(self.file_path), expected)
+
+    def test_should_rehash_modified_file(self):
+        self._write(b"hello")
+        self.files.get_file_sha256(self.file_path)
+
+        self._write(b"hello world")
+
+        self.assertEqual(
+            self.files.get_file_sha256(self.file_path),
+            hashlib.sha256(b"hello world").hexdigest(),
+        )
+
+    def test_should_keep_previous_digest_of_modified_file(self):
+        self._write(b"hello")
+        self.files.get_file_sha256(self.file_path)
+
+        self._write(b"hello world")
+
+        self.assertEqual(
+            self.files.get_previous_digest(self.file_path, "SHA256", CHUNK_SIZE),
+            hashlib.sha256(b"hello").hexdigest(),
+        )
+        self.assertIsNone(
+            self.files.get_previous_digest(self.file_path, "SHA256", CHUNK_SIZE + 1)
+        )
+
+    def test_should_rehash_file_with_same_size_and_new_mtime(self):
+        self._write(b"aaaa")
+        self.files.get_file_sha256(self.file_path)
+        stat = os.stat(self.file_path)
+
+        self._write(b"bbbb")
+        os.utime(self.file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        self.assertEqual(
+            self.files.get_file_sha256(self.file_path),
+            hashlib.sha256(b"bbbb").hexdigest(),
+        )
+
+    def test_should_keep_entries_per_chunk_size(self):
+        content = b"A" * 64 + b"B" * 64 + b"C" * 64
+        self._write(content)
+
+        small_chunks = self.files.get_file_sha256(self.file_path, chunk_size=16)
+        whole_file = self.files.get_file_sha256(self.file_path, chunk_size=1024)
+
+        self.assertEqual(
+            small_chunks, hashlib.sha256(content[:16] + content[-16:]).hexdigest()
+        )
+        self.assertEqual(whole_file, hashlib.sha256(content).hexdigest())
+
+    def test_should_keep_entries_per_region_count(self):
+        self._write(b"A" * 64 + b"B" * 64 + b"C" * 64)
+
+        three_regions = self.files.get_file_fingerprint(
+            self.file_path, region_count=3, region_size=16
+        )
+        four_regions = self.files.get_file_fingerprint(
+            self.file_path, region_count=4, region_size=16
+        )
+
+        self.assertNotEqual(three_regions, four_regions)
+        self.assertEqual(
+            self.cache.get(
+                self.file_path, os.stat(self.file_path), "SAMPLED_SHA256", 16, 3
+            ),
+            three_regions,
+        )
+
+    def test_should_drop_entries_of_older_schema(self):
+        file_stat = os.stat(self._write(b"hello"))
+        self.cache.put(self.file_path, file_stat, "SHA256", 1, "digest")
+        self.cache.close()
+
+        with sqlite3.connect(self.cache_file) as connection:
+            connection.execute("PRAGMA user_version = 0")
+
+        self.cache = FileHashCache(self.cache_file)
+
+        self.assertIsNone(self.cache.get(self.file_path, file_stat, "SHA256", 1))
+
+    def test_should_persist_between_instances(self):
+        self._write(b"hello")
+        self.files.get_file_sha256(self.file_path)
+        self.cache.close()
+
+        self.cache = FileHashCache(self.cache_file)
+
+        self.assertEqual(
+            self.cache.get(
+                self.file_path, os.stat(self.file_path), "SHA256", 16 * 1024 * 1024
+            ),
+            hashlib.sha256(b"hello").hexdigest(),
+        )
+
+    def test_should_evict_least_recently_used_entries(self):
+        self.cache.close()
+        self.cache = FileHashCache(self.cache_file, max_entries=2, clock=Counter())
+        first = self._write(b"first")
+        second = self._write(b"second", f"{self.file_path}-2")
+        first_stat, second_stat = os.stat(first), os.stat(second)
+
+        self.cache.put(first, first_stat, "SHA256", 1, "digest-1")
+        self.cache.put(second, second_stat, "SHA256", 1, "digest-2")
+        self.assertEqual(self.cache.get(first, first_stat, "SHA256", 1), "digest-1")
+
+        self.cache.put(first, first_stat, "SHA256", 2, "digest-3")
+
+        self.assertEqual(self.cache.get(first, first_stat, "SHA256", 1), "digest-1")
+        self.assertIsNone(self.cache.get(second, second_stat, "SHA256", 1))
+        self.assertEqual(self.cache.get(first, first_stat, "SHA256", 2), "digest-3")
+
+    def test_should_not_write_on_cache_hit(self):
+        file_stat = os.stat(self._write(b"hello"))
+        self.cache.put(self.file_path, file_stat, "SHA256", 1, "digest")
+
+        with patch.object(
+            self.cache._db, "transactional", side_effect=AssertionError("write")
+        ):
+            for _ in range(TOUCH_BATCH_SIZE - 1):
+                self.assertEqual(
+                    self.cache.get(self.file_path, file_stat, "SHA256", 1), "digest"
+                )
+
+    def test_should_keep_entries_used_before_restart(self):
+        self.cache.close()
+        self.cache = FileHashCache(self.cache_file, max_entries=2, clock=Counter())
+        first = self._write(b"first")
+        second = self._write(b"second", f"{self.file_path}-2")
+        first_stat, second_stat = os.stat(first), os.stat(second)
+
+        self.cache.put(first, first_stat, "SHA256", 1, "digest-1")
+        self.cache.put(second, second_stat, "SHA256", 1, "digest-2")
+        self.cache.get(first, first_stat, "SHA256", 1)
+        self.cache.close()
+
+        clock = Counter()
+        clock.value = 10
+        self.cache = FileHashCache(self.cache_file, max_entries=2, clock=clock)
+        self.cache.put(first, first_stat, "SHA256", 2, "digest-3")
+
+        self.assertEqual(self.cache.get(first, first_stat, "SHA256", 1), "digest-1")
+        self.assertIsNone(self.cache.get(second, second_stat, "SHA256", 1))
+
+    def test_should_not_count_updated_entry_twice(self):
+        self.cache.close()
+        self.cache = FileHashCache(self.cache_file, max_entries=2, clock=Counter())
+        first = self._write(b"first")
+        second = self._write(b"second", f"{self.file_path}-2")
+        first_stat, second_stat = os.stat(first), os.stat(second)
+
+        self.cache.put(first, first_stat, "SHA256", 1, "digest-1")
+        self.cache.put(first, first_stat, "SHA256", 1, "digest-1")
+        self.cache.put(second, second_stat, "SHA256", 1, "digest-2")
+
+        self.assertEqual(self.cache.get(first, first_stat, "SHA256", 1), "digest-1")
+        self.assertEqual(self.cache.get(second, second_stat, "SHA256", 1), "digest-2")
+
+    def test_should_not_cache_missing_file(self):
+        self.assertIsNone(self.files.get_file_sha256(f"{self.file_path}-missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,7 +4,12 @@ from unittest.mock import patch
 import hashlib
 
 with patch.dict("os.environ", {"DECKY_PLUGIN_RUNTIME_DIR": "./python/tests/data"}):
-    from py_modules.files import Files
+    from py_modules.files import (
+        SHAKE_DIGEST_SIZES,
+        Files,
+        fingerprint_region_offsets,
+    )
+    from py_modules.schemas.common import CHECKSUM_ALGORITHMS
 
 CHUNK_SIZE = 16 * 1024 * 1024
 
@@ -108,6 +113,128 @@ class TestFiles(unittest.TestCase):
             self.assertEqual(result, expected_sha256)
             os.remove(file_path)
 
+    def test_should_support_every_checksum_algorithm(self):
+        content = b"A" * 64 + b"B" * 64 + b"C" * 64
+        file_path = self.create_temp_file(content)
+
+        for algorithm in CHECKSUM_ALGORITHMS:
+            with self.subTest(algorithm=algorithm):
+                hasher = hashlib.new(algorithm.lower(), content[:16] + content[-16:])
+                expected = (
+                    hasher.hexdigest(SHAKE_DIGEST_SIZES[algorithm])
+                    if algorithm in SHAKE_DIGEST_SIZES
+                    else hasher.hexdigest()
+                )
+
+                self.assertEqual(
+                    self.files.get_file_digest(file_path, algorithm, chunk_size=16),
+                    expected,
+                )
+
+        os.remove(file_path)
+
+    def test_should_hash_whole_small_file_with_shake(self):
+        file_path = self.create_temp_file(b"hello")
+
+        self.assertEqual(
+            self.files.get_file_digest(file_path, "SHAKE_256"),
+            hashlib.shake_256(b"hello").hexdigest(64),
+        )
+        os.remove(file_path)
+
+    def test_should_reject_unknown_algorithm(self):
+        file_path = self.create_temp_file(b"hello")
+
+        with self.assertRaises(ValueError):
+            self.files.get_file_digest(file_path, "MD5")
+
+        os.remove(file_path)
+
+    def test_should_hash_large_file_through_mmap_without_reading_chunks(self):
+        content = b"A" * 64 + b"B" * 64 + b"C" * 64
+        file_path = self.create_temp_file(content)
+
+        with patch.object(
+            Files,
+            "_update_with_read_head_and_tail",
+            side_effect=AssertionError("read"),
+        ):
+            result = self.files.get_file_digest(file_path, "SHA256", chunk_size=16)
+
+        self.assertEqual(
+            result, hashlib.sha256(content[:16] + content[-16:]).hexdigest()
+        )
+        os.remove(file_path)
+
+    def test_should_fall_back_to_reads_when_file_can_not_be_mapped(self):
+        content = b"A" * 64 + b"B" * 64 + b"C" * 64
+        file_path = self.create_temp_file(content)
+
+        with patch("py_modules.files.mmap.mmap", side_effect=OSError("no mmap")):
+            result = self.files.get_file_digest(file_path, "SHA256", chunk_size=16)
+
+        self.assertEqual(
+            result, hashlib.sha256(content[:16] + content[-16:]).hexdigest()
+        )
+        os.remove(file_path)
+
+    def test_should_sample_regions_from_head_to_tail(self):
+        self.assertEqual(fingerprint_region_offsets(100, 4, 10), [0, 30, 60, 90])
+        self.assertEqual(fingerprint_region_offsets(41, 4, 10), [0, 10, 20, 31])
+
+    def test_should_detect_change_in_the_middle_with_fingerprint(self):
+        content = bytearray(b"A" * 64 + b"B" * 64 + b"C" * 64)
+        file_path = self.create_temp_file(bytes(content))
+        digest = self.files.get_file_digest(file_path, "SHA256", chunk_size=16)
+        fingerprint = self.files.get_file_fingerprint(
+            file_path, region_count=3, region_size=16
+        )
+
+        content[90] = ord("X")
+        self.create_temp_file(bytes(content))
+
+        self.assertEqual(
+            self.files.get_file_digest(file_path, "SHA256", chunk_size=16), digest
+        )
+        self.assertNotEqual(
+            self.files.get_file_fingerprint(file_path, region_count=3, region_size=16),
+            fingerprint,
+        )
+        os.remove(file_path)
+
+    def test_should_never_match_plain_digest_with_fingerprint(self):
+        file_path = self.create_temp_file(b"hello")
+
+        self.assertNotEqual(
+            self.files.get_file_fingerprint(file_path),
+            hashlib.sha256(b"hello").hexdigest(),
+        )
+        self.assertNotEqual(
+            self.files.get_file_fingerprint(file_path, region_count=3),
+            self.files.get_file_fingerprint(file_path, region_count=4),
+        )
+        os.remove(file_path)
+
+    def test_should_fingerprint_with_reads_when_file_can_not_be_mapped(self):
+        file_path = self.create_temp_file(os.urandom(1000))
+        mapped = self.files.get_file_fingerprint(
+            file_path, region_count=5, region_size=16
+        )
+
+        with patch("py_modules.files.mmap.mmap", side_effect=OSError("no mmap")):
+            self.assertEqual(
+                self.files.get_file_fingerprint(
+                    file_path, region_count=5, region_size=16
+                ),
+                mapped,
+            )
+
+        os.remove(file_path)
+
+    def test_should_reject_less_than_two_regions(self):
+        with self.assertRaises(ValueError):
+            self.files.get_file_fingerprint("temp_file", region_count=1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,305 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from py_modules.db.dao import Dao
+from py_modules.db.migration import DbMigration
+from py_modules.file_hash_cache import FileHashCache
+from py_modules.games import Games
+from py_modules.tests.helpers import AbstractDatabaseTest
+
+with patch.dict("os.environ", {"DECKY_PLUGIN_RUNTIME_DIR": "./python/tests/data"}):
+    from py_modules.dto.scan_game_files import ScanGameFilesDTO
+    from py_modules.files import Files
+    from py_modules.game_file_scanner import (
+        DEFAULT_MIN_SIZE,
+        GameFileScanner,
+        discover_game_files,
+    )
+
+
+class Clock:
+    def __init__(self, step: float) -> None:
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+class TestDiscoverGameFiles(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = self.directory.name
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def _write(self, relative_path: str, size: int) -> str:
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, "wb") as f:
+            f.write(b"x" * size)
+
+        return path
+
+    def _discover(self, roots, **kwargs):
+        return sorted(file.path for file in discover_game_files(roots, **kwargs))
+
+    def test_should_filter_by_extension_and_size(self):
+        game = self._write("Game/Game.EXE", 100)
+        appimage = self._write("Other/Other.AppImage", 300)
+        self._write("Game/readme.txt", 100)
+        self._write("Game/stub.exe", 10)
+        self._write("Huge/huge.exe", 1000)
+
+        self.assertEqual(
+            self._discover([self.root], min_size=50, max_size=500),
+            sorted([game, appimage]),
+        )
+
+    def test_should_skip_hidden_and_wine_system_directories(self):
+        game = self._write("prefix/drive_c/Games/Game.exe", 100)
+        self._write("prefix/drive_c/windows/system32/notepad.exe", 100)
+        self._write(".cache/cached.exe", 100)
+
+        self.assertEqual(self._discover([self.root], min_size=1), [game])
+
+    def test_should_report_files_of_overlapping_roots_once(self):
+        game = self._write("Games/Game/Game.exe", 100)
+
+        self.assertEqual(
+            self._discover(
+                [self.root, os.path.join(self.root, "Games"), f'"{self.root}/"'],
+                min_size=1,
+            ),
+            [game],
+        )
+
+    def test_should_not_follow_directory_symlinks(self):
+        game = self._write("Games/Game.exe", 100)
+        os.symlink(self.root, os.path.join(self.root, "Games", "loop"))
+
+        self.assertEqual(self._discover([self.root], min_size=1), [game])
+
+    def test_should_ignore_missing_root(self):
+        self.assertEqual(self._discover([f"{self.root}/missing"], min_size=1), [])
+
+
+class TestScanGameFilesDTO(unittest.TestCase):
+    def test_should_default_only_missing_min_size(self):
+        self.assertEqual(
+            ScanGameFilesDTO.from_dict({"roots": ["/games"]}).min_size,
+            DEFAULT_MIN_SIZE,
+        )
+
+        for min_size, expected in ((None, DEFAULT_MIN_SIZE), (0, 0)):
+            dto = ScanGameFilesDTO.from_dict({"roots": ["/games"], "min_size": min_size})
+
+            self.assertEqual(dto.min_size, expected)
+
+    def test_should_reject_negative_min_size(self):
+        with self.assertRaises(ValueError):
+            ScanGameFilesDTO.from_dict({"roots": ["/games"], "min_size": -1})
+
+    def test_should_reject_invalid_sizes(self):
+        for field_name in ("min_size", "max_size", "chunk_size"):
+            for value in (-1, True, 1.5, "1024"):
+                with self.subTest(field_name=field_name, value=value):
+                    with self.assertRaises(ValueError):
+                        ScanGameFilesDTO.from_dict(
+                            {"roots": ["/games"], field_name: value}
+                        )
+
+    def test_should_accept_missing_max_size_and_chunk_size(self):
+        dto = ScanGameFilesDTO.from_dict(
+            {"roots": ["/games"], "max_size": None, "chunk_size": None}
+        )
+
+        self.assertEqual((dto.max_size, dto.chunk_size), (None, None))
+
+        dto = ScanGameFilesDTO.from_dict(
+            {"roots": ["/games"], "min_size": 0, "max_size": 0, "chunk_size": 0}
+        )
+
+        self.assertEqual((dto.max_size, dto.chunk_size), (0, 0))
+
+
+class TestGameFileScanner(AbstractDatabaseTest, unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        DbMigration(db=self.database).migrate()
+        self.games = Games(Dao(self.database))
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.directory.name, "games")
+        self.hash_cache = FileHashCache(
+            os.path.join(self.directory.name, "file_hash_cache.db")
+        )
+        self.scanner = GameFileScanner(
+            Files(self.hash_cache), self._save, clock=Clock(step=0.5)
+        )
+
+    def tearDown(self) -> None:
+        self.hash_cache.close()
+        self.directory.cleanup()
+        super().tearDown()
+
+    async def _save(self, dtos) -> None:
+        self.games.replace_game_checksum_bulk(dtos)
+
+    def _write(self, name: str, content: bytes) -> str:
+        path = os.path.join(self.root, name, f"{name}.exe")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with open(path, "wb") as f:
+            f.write(content)
+
+        return path
+
+    def _saved_checksums(self):
+        return sorted((c.game.id, c.checksum) for c in self.games.get_games_checksum())
+
+    def _get_game_components(self):
+        with self.database.readonly() as connection:
+            return connection.execute(
+                "SELECT game_id, leader_id FROM game_component ORDER BY game_id"
+            ).fetchall()
+
+    async def _scan(self, game_ids_by_path):
+        return await self.scanner.scan(
+            [self.root], game_ids_by_path, min_size=1, chunk_size=4
+        )
+
+    async def test_should_hash_new_files_and_save_checksums_of_games(self):
+        first = self._write("first", b"first game")
+        self._write("second", b"second")
+
+        summary = await self._scan({f'"{first}"': "100"})
+
+        self.assertEqual(
+            (summary.discovered, summary.unchanged, summary.hashed, summary.failed),
+            (2, 0, 2, 0),
+        )
+        self.assertEqual(
+            self._saved_checksums(),
+            [("100", hashlib.sha256(b"firsgame").hexdigest())],
+        )
+
+    async def test_should_only_read_new_and_changed_files_on_next_scan(self):
+        first = self._write("first", b"first game")
+        second = self._write("second", b"second")
+        await self._scan({})
+
+        with open(second, "ab") as f:
+            f.write(b" edition")
+
+        with patch.object(
+            Files, "_digest_of_head_and_tail", wraps=Files()._digest_of_head_and_tail
+        ) as digest_of_head_and_tail:
+            summary = await self._scan({first: "100", second: "200"})
+
+        self.assertEqual((summary.unchanged, summary.hashed), (1, 1))
+        self.assertEqual(digest_of_head_and_tail.call_count, 1)
+        self.assertEqual(
+            self._saved_checksums(),
+            [
+                ("100", hashlib.sha256(b"firsgame").hexdigest()),
+                ("200", hashlib.sha256(b"secotion").hexdigest()),
+            ],
+        )
+
+    async def test_should_replace_checksum_of_modified_file(self):
+        first = self._write("first", b"same game")
+        second = self._write("second", b"same game")
+        await self._scan({first: "100", second: "200"})
+
+        self.assertEqual(self._get_game_components(), [("100", "100"), ("200", "100")])
+
+        with open(first, "ab") as f:
+            f.write(b" patched")
+
+        summary = await self._scan({first: "100", second: "200"})
+
+        self.assertEqual((summary.unchanged, summary.hashed), (1, 1))
+        self.assertEqual(
+            self._saved_checksums(),
+            [
+                ("100", hashlib.sha256(b"sameched").hexdigest()),
+                ("200", hashlib.sha256(b"samegame").hexdigest()),
+            ],
+        )
+        self.assertEqual(self._get_game_components(), [])
+
+    async def test_should_keep_linked_alias_checksum_on_rescan(self):
+        first = self._write("first", b"first game")
+        second = self._write("second", b"second")
+        await self._scan({first: "100", second: "200"})
+        self.games.link_game_to_game_with_checksum("100", "200")
+
+        with open(first, "ab") as f:
+            f.write(b" patched")
+
+        await self._scan({first: "100", second: "200"})
+
+        self.assertEqual(
+            self._saved_checksums(),
+            sorted(
+                [
+                    ("100", hashlib.sha256(b"firsched").hexdigest()),
+                    ("100", hashlib.sha256(b"second").hexdigest()),
+                    ("200", hashlib.sha256(b"second").hexdigest()),
+                ]
+            ),
+        )
+        self.assertEqual(self._get_game_components(), [("100", "100"), ("200", "100")])
+
+    async def test_should_keep_every_file_of_game(self):
+        launcher = self._write("launcher", b"launcher")
+        game = self._write("game", b"game binary")
+
+        await self._scan({launcher: "100", game: "100"})
+
+        with open(game, "ab") as f:
+            f.write(b" patched")
+
+        await self._scan({launcher: "100", game: "100"})
+
+        self.assertEqual(
+            self._saved_checksums(),
+            [
+                ("100", hashlib.sha256(b"gameched").hexdigest()),
+                ("100", hashlib.sha256(b"launcher").hexdigest()),
+            ],
+        )
+
+    async def test_should_not_write_checksums_of_unchanged_files_again(self):
+        first = self._write("first", b"same game")
+        second = self._write("second", b"same game")
+        await self._scan({first: "100", second: "200"})
+        generation = self.games.dao.write_generation
+
+        with patch(
+            "py_modules.db.dao.refresh_game_components"
+        ) as refresh_game_components:
+            summary = await self._scan({first: "100", second: "200"})
+
+        self.assertEqual((summary.unchanged, summary.hashed), (2, 0))
+        self.assertEqual(self.games.dao.write_generation, generation)
+        refresh_game_components.assert_not_called()
+
+    async def test_should_report_throughput(self):
+        self._write("first", b"first game")
+        self._write("second", b"second")
+
+        summary = await self._scan({})
+
+        self.assertEqual(summary.elapsed_s, 0.5)
+        self.assertEqual(summary.files_per_second, 4)
+        self.assertEqual(summary.mb_per_second, (8 + 6) / 1024 / 1024 / 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import dataclasses
+import unittest
+from py_modules.db.dao import Dao
+from py_modules.db.migration import DbMigration
+from py_modules.db.sqlite_db import SqlLiteDb
+from py_modules.games import Games
+from py_modules.tests.helpers import AbstractDatabaseTest
+
+
+class QueryCountingSqlLiteDb(SqlLiteDb):
+    queries: int = 0
+
+    def _connect(self, query_only: bool = False):
+        connection = super()._connect(query_only)
+        connection.set_trace_callback(self._count_query)
+
+        return connection
+
+    def _count_query(self, statement: str):
+        # NOTE: Skip pragmas and connection health checks
+        if "FROM" in statement.upper():
+            self.queries += 1
+
+
+class TestGamesDictionary(AbstractDatabaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        self.database.close()
+        self.database = QueryCountingSqlLiteDb(self.database_file)
+        DbMigration(db=self.database).migrate()
+        self.dao = Dao(self.database)
+        self.games = Games(self.dao)
+
+    def test_should_return_games_with_grouped_checksums(self):
+        self.dao.save_game_dict("100", "Zelda BOTW")
+        self.dao.save_game_dict("200", "DOOM")
+        self.dao.save_game_checksum(
+            "100", "checksum_b", "SHA256", 1024, "2023-01-01", "2023-01-02"
+        )
+        self.dao.save_game_checksum(
+            "100", "checksum_a", "SHA256", 1024, "2023-01-01", "2023-01-02"
+        )
+
+        self.assertEqual(
+            [dataclasses.asdict(game) for game in self.games.get_dictionary()],
+            [
+                {
+                    "game": {"id": "100", "name": "Zelda BOTW"},
+                    "files": [
+                        {
+                            "game": {"id": "100", "name": "Zelda BOTW"},
+                            "checksum": "checksum_a",
+                            "algorithm": "SHA256",
+                            "chunk_size": 1024,
+                            "region_count": None,
+                            "created_at": "2023-01-01",
+                            "updated_at": "2023-01-02",
+                        },
+                        {
+                            "game": {"id": "100", "name": "Zelda BOTW"},
+                            "checksum": "checksum_b",
+                            "algorithm": "SHA256",
+                            "chunk_size": 1024,
+                            "region_count": None,
+                            "created_at": "2023-01-01",
+                            "updated_at": "2023-01-02",
+                        },
+                    ],
+                },
+                {"game": {"id": "200", "name": "DOOM"}, "files": []},
+            ],
+        )
+
+    def test_should_use_constant_number_of_queries_regardless_of_library_size(self):
+        queries_per_library_size = []
+
+        for library_size in (1, 10, 200):
+            for index in range(library_size):
+                game_id = f"{library_size}-{index}"
+                self.dao.save_game_dict(game_id, f"Game {game_id}")
+                self.dao.save_game_checksum(
+                    game_id, f"checksum-{game_id}", "SHA256", 1024, None, None
+                )
+
+            self.database.queries = 0
+            self.games.get_dictionary()
+            queries_per_library_size.append(self.database.queries)
+
+        self.assertEqual(queries_per_library_size, [1, 1, 1])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -15,16 +15,20 @@ class AbstractDatabaseTest(unittest.TestCase):
     database: SqlLiteDb
 
     def setUp(self) -> None:
-        if os.path.exists(self.database_file):
-            os.remove(self.database_file)
+        self._remove_database_files()
         self.database = SqlLiteDb(self.database_file)
         super().setUp()
 
     def tearDown(self) -> None:
-        if os.path.exists(self.database_file):
-            os.remove(self.database_file)
+        self.database.close()
+        self._remove_database_files()
         self.database = None  # type: ignore [assignment]
         super().tearDown()
 
+    def _remove_database_files(self) -> None:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.database_file + suffix):
+                os.remove(self.database_file + suffix)
+
     if __name__ == "__main__":
         unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+from datetime import datetime, timedelta
+from py_modules.db.dao import Dao
+from py_modules.db.migration import DbMigration
+from py_modules.response_cache import ResponseCache
+from py_modules.statistics import Statistics
+from py_modules.tests.helpers import AbstractDatabaseTest
+from py_modules.time_tracking import TimeTracking
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_should_compute_once_per_generation(self):
+        cache = ResponseCache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return [len(calls)]
+
+        self.assertEqual(cache.get_or_compute("key", 0, compute), [1])
+        self.assertEqual(cache.get_or_compute("key", 0, compute), [1])
+        self.assertEqual(cache.get_or_compute("key", 1, compute), [2])
+
+        metrics = cache.metrics()
+        self.assertEqual((metrics.hits, metrics.misses), (1, 2))
+        self.assertEqual(metrics.invalidations, 1)
+
+    def test_should_evict_least_recently_used_entry(self):
+        cache = ResponseCache(max_entries=2)
+
+        cache.get_or_compute("a", 0, lambda: "a")
+        cache.get_or_compute("b", 0, lambda: "b")
+        cache.get_or_compute("a", 0, lambda: "unused")
+        cache.get_or_compute("c", 0, lambda: "c")
+
+        self.assertEqual(cache.get_or_compute("a", 0, lambda: "missed"), "a")
+        self.assertEqual(cache.get_or_compute("b", 0, lambda: "missed"), "missed")
+        self.assertEqual(cache.metrics().evictions, 2)
+
+    def test_should_respect_memory_cap(self):
+        cache = ResponseCache(max_bytes=64 * 1024)
+
+        for index in range(10):
+            cache.get_or_compute(index, 0, lambda: "x" * 20 * 1024)
+
+        metrics = cache.metrics()
+        self.assertLessEqual(metrics.size_bytes, 64 * 1024)
+        self.assertLessEqual(metrics.entries, 3)
+
+    def test_should_not_store_values_larger_than_memory_cap(self):
+        cache = ResponseCache(max_bytes=1024)
+
+        cache.get_or_compute("big", 0, lambda: "x" * 4096)
+
+        self.assertEqual(cache.metrics().entries, 0)
+
+    def test_should_not_store_value_computed_for_outdated_generation(self):
+        cache = ResponseCache()
+
+        def compute_while_write_lands():
+            cache.get_or_compute("other", 1, lambda: "new")
+            return "old"
+
+        cache.get_or_compute("key", 0, compute_while_write_lands)
+
+        self.assertEqual(cache.get_or_compute("key", 1, lambda: "fresh"), "fresh")
+
+
+class TestStatisticsCache(AbstractDatabaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        DbMigration(db=self.database).migrate()
+        self.time_tracking = TimeTracking(Dao(self.database))
+        self.statistics = Statistics(Dao(self.database))
+
+    def test_should_invalidate_cached_statistics_after_write(self):
+        now = datetime(2022, 1, 1, 9, 0)
+        self.time_tracking.add_time(
+            now.timestamp(), (now + timedelta(hours=1)).timestamp(), "100", "Zelda"
+        )
+
+        first = self.statistics.fetch_playtime_information()
+        second = self.statistics.fetch_playtime_information()
+
+        self.assertIs(first, second)
+        self.assertEqual(first[0].total_time, 3600)
+
+        self.time_tracking.add_time(
+            (now + timedelta(hours=2)).timestamp(),
+            (now + timedelta(hours=3)).timestamp(),
+            "100",
+            "Zelda",
+        )
+
+        self.assertEqual(
+            self.statistics.fetch_playtime_information()[0].total_time, 7200
+        )
+
+        metrics = self.statistics.cache.metrics()
+        self.assertEqual((metrics.hits, metrics.misses), (1, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
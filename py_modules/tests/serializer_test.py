@@ -0,0 +1,90 @@
+import unittest
+from py_modules.response_cache import ResponseCacheMetrics
+from py_modules.schemas.response import (
+    Game,
+    GamePlaytimeDetails,
+    PagedGameSessions,
+    SessionInformation,
+)
+from py_modules.schemas.serializer import to_camel_case, to_camel_case_response
+
+
+class TestSerializer(unittest.TestCase):
+    def test_should_convert_snake_case_to_camel_case(self):
+        self.assertEqual(to_camel_case("last_session"), "lastSession")
+        self.assertEqual(to_camel_case("has_prev"), "hasPrev")
+        self.assertEqual(to_camel_case("size_2_bytes"), "size2Bytes")
+        self.assertEqual(to_camel_case("_private_value"), "PrivateValue")
+        self.assertEqual(to_camel_case("trailing_"), "trailing_")
+        self.assertEqual(to_camel_case("id"), "id")
+
+    def test_should_serialize_nested_dataclasses(self):
+        session = SessionInformation(
+            date="2024-01-01T10:00:00", duration=60, migrated=None, checksum=None
+        )
+
+        self.assertEqual(
+            to_camel_case_response(
+                [
+                    GamePlaytimeDetails(
+                        game=Game("100", "Zelda BOTW"),
+                        total_time=60,
+                        sessions=[session],
+                        last_session=session,
+                    )
+                ]
+            ),
+            [
+                {
+                    "game": {"id": "100", "name": "Zelda BOTW"},
+                    "totalTime": 60,
+                    "sessions": [
+                        {
+                            "date": "2024-01-01T10:00:00",
+                            "duration": 60,
+                            "migrated": None,
+                            "checksum": None,
+                        }
+                    ],
+                    "lastSession": {
+                        "date": "2024-01-01T10:00:00",
+                        "duration": 60,
+                        "migrated": None,
+                        "checksum": None,
+                    },
+                }
+            ],
+        )
+
+    def test_should_serialize_optional_nested_dataclass(self):
+        self.assertEqual(
+            to_camel_case_response(PagedGameSessions(sessions=[], next_cursor=None)),
+            {"sessions": [], "nextCursor": None},
+        )
+
+    def test_should_convert_dict_keys(self):
+        self.assertEqual(
+            to_camel_case_response({"game_id": [{"total_time": 1}], 1: "one"}),
+            {"gameId": [{"totalTime": 1}], 1: "one"},
+        )
+
+    def test_should_serialize_dataclasses_outside_of_response_schemas(self):
+        metrics = ResponseCacheMetrics(1, 2, 3, 4, 5, 6, 7, 8)
+
+        self.assertEqual(
+            to_camel_case_response(metrics),
+            {
+                "hits": 1,
+                "misses": 2,
+                "evictions": 3,
+                "invalidations": 4,
+                "entries": 5,
+                "sizeBytes": 6,
+                "maxEntries": 7,
+                "maxBytes": 8,
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import os
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+from py_modules.db.dao import Dao
+from py_modules.db.migration import DbMigration
+from py_modules.session_journal import SessionJournal
+from py_modules.tests.helpers import AbstractDatabaseTest
+from py_modules.time_tracking import TimeTracking
+
+
+class ManualClock:
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def __call__(self) -> float:
+        return self.value
+
+
+class TestSessionJournal(AbstractDatabaseTest):
+    journal_file = f"test_sessions_{os.getpid()}.journal"
+
+    def setUp(self) -> None:
+        super().setUp()
+        self._remove_journal_files()
+        DbMigration(db=self.database).migrate()
+        self.dao = Dao(self.database)
+        self.clock = ManualClock()
+        self.journal = SessionJournal(
+            self.journal_file, fsync_interval_s=5, clock=self.clock
+        )
+        self.time_tracking = TimeTracking(self.dao, self.journal)
+
+    def tearDown(self) -> None:
+        self.journal.close()
+        self._remove_journal_files()
+        super().tearDown()
+
+    def _remove_journal_files(self) -> None:
+        for suffix in ("", ".tmp"):
+            if os.path.exists(self.journal_file + suffix):
+                os.remove(self.journal_file + suffix)
+
+    def _reopen_journal(self) -> TimeTracking:
+        # NOTE: Simulates a plugin restart, nothing is ended or closed
+        self.journal = SessionJournal(self.journal_file, clock=self.clock)
+
+        return TimeTracking(self.dao, self.journal)
+
+    def test_should_save_session_on_end(self):
+        started_at = datetime(2024, 1, 1, 10, 0)
+
+        self.assertTrue(
+            self.time_tracking.start_session("100", "Zelda", started_at.timestamp())
+        )
+        self.assertTrue(
+            self.time_tracking.heartbeat_session(
+                "100", (started_at + timedelta(minutes=30)).timestamp()
+            )
+        )
+        self.assertTrue(
+            self.time_tracking.end_session(
+                "100", (started_at + timedelta(hours=1)).timestamp()
+            )
+        )
+
+        self.assertEqual(self.dao.fetch_overall_playtime()[0].time, 3600)
+        self.assertEqual(os.path.getsize(self.journal_file), 0)
+
+    def test_should_not_touch_database_on_heartbeat(self):
+        started_at = datetime(2024, 1, 1, 10, 0).timestamp()
+        generation = self.dao.write_generation
+
+        self.time_tracking.start_session("100", "Zelda", started_at)
+
+        for minute in range(1, 61):
+            self.time_tracking.heartbeat_session("100", started_at + minute * 60)
+
+        self.assertEqual(self.dao.write_generation, generation)
+        self.assertEqual(self.dao.fetch_overall_playtime(), [])
+
+    def test_should_fsync_at_most_once_per_interval(self):
+        started_at = datetime(2024, 1, 1, 10, 0).timestamp()
+
+        with mock.patch("py_modules.session_journal.os.fsync") as fsync:
+            self.time_tracking.start_session("100", "Zelda", started_at)
+
+            for second in range(1, 11):
+                self.clock.value = second
+                self.time_tracking.heartbeat_session("100", started_at + second)
+
+        # NOTE: Synced at clock 5 and 10
+        self.assertEqual(fsync.call_count, 2)
+
+    def test_should_ignore_heartbeat_and_end_of_unknown_session(self):
+        self.assertFalse(self.time_tracking.heartbeat_session("404", 1))
+        self.assertFalse(self.time_tracking.end_session("404", 1))
+
+    def test_should_ignore_second_start_of_running_session(self):
+        self.assertTrue(self.time_tracking.start_session("100", "Zelda", 10))
+        self.assertFalse(self.time_tracking.start_session("100", "Zelda", 20))
+        self.assertEqual(self.journal.get("100").started_at, 10)
+
+    def test_should_recover_unfinished_session_up_to_last_heartbeat(self):
+        started_at = datetime(2024, 1, 1, 10, 0)
+
+        self.time_tracking.start_session("100", "Zelda", started_at.timestamp())
+        self.time_tracking.heartbeat_session(
+            "100", (started_at + timedelta(minutes=45)).timestamp()
+        )
+
+        time_tracking = self._reopen_journal()
+
+        self.assertEqual(time_tracking.recover_sessions(), 1)
+        self.assertEqual(self.dao.fetch_overall_playtime()[0].time, 45 * 60)
+
+        # NOTE: A second restart must not save the same session again
+        self.assertEqual(self._reopen_journal().recover_sessions(), 0)
+        self.assertEqual(self.dao.fetch_overall_playtime()[0].time, 45 * 60)
+
+    def test_should_not_recover_session_saved_right_before_crash(self):
+        started_at = datetime(2024, 1, 1, 10, 0)
+
+        self.time_tracking.start_session("100", "Zelda", started_at.timestamp())
+        self.time_tracking.heartbeat_session(
+            "100", (started_at + timedelta(minutes=45)).timestamp()
+        )
+
+        # NOTE: The time is committed, the plugin dies before the journal is updated
+        with mock.patch.object(
+            SessionJournal, "end", side_effect=SystemExit("crash")
+        ), self.assertRaises(SystemExit):
+            self.time_tracking.end_session(
+                "100", (started_at + timedelta(hours=1)).timestamp()
+            )
+
+        time_tracking = self._reopen_journal()
+
+        self.assertEqual(time_tracking.recover_sessions(), 0)
+        self.assertEqual(self.dao.fetch_overall_playtime()[0].time, 3600)
+        self.assertEqual(os.path.getsize(self.journal_file), 0)
+
+    def test_should_keep_running_sessions_when_another_one_ends(self):
+        started_at = datetime(2024, 1, 1, 10, 0)
+
+        self.time_tracking.start_session("100", "Zelda", started_at.timestamp())
+        self.time_tracking.start_session("200", "DOOM", started_at.timestamp())
+        self.time_tracking.heartbeat_session(
+            "200", (started_at + timedelta(minutes=20)).timestamp()
+        )
+        self.time_tracking.end_session(
+            "100", (started_at + timedelta(minutes=10)).timestamp()
+        )
+
+        time_tracking = self._reopen_journal()
+        time_tracking.recover_sessions()
+
+        self.assertEqual(
+            sorted((g.game_id, g.time) for g in self.dao.fetch_overall_playtime()),
+            [("100", 10 * 60), ("200", 20 * 60)],
+        )
+
+    def test_should_skip_torn_journal_record(self):
+        started_at = datetime(2024, 1, 1, 10, 0)
+
+        self.time_tracking.start_session("100", "Zelda", started_at.timestamp())
+        self.time_tracking.heartbeat_session(
+            "100", (started_at + timedelta(minutes=5)).timestamp()
+        )
+        self.journal.close()
+
+        with open(self.journal_file, "a", encoding="utf-8") as journal:
+            journal.write('{"type":"heartbeat","game_id":"100","at":')
+
+        time_tracking = self._reopen_journal()
+
+        self.assertEqual(time_tracking.recover_sessions(), 1)
+        self.assertEqual(self.dao.fetch_overall_playtime()[0].time, 5 * 60)
+
+    def test_should_require_journal_for_live_sessions(self):
+        with self.assertRaises(ValueError):
+            TimeTracking(self.dao).start_session("100", "Zelda", 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
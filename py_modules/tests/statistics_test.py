@@ -0,0 +1,268 @@
+import dataclasses
+import unittest
+from datetime import datetime, timedelta
+from py_modules.db.dao import Dao
+from py_modules.db.migration import DbMigration
+from py_modules.dto.statistics.get_game_sessions import GetGameSessionsDTO
+from py_modules.games import Games
+from py_modules.statistics import Statistics
+from py_modules.tests.helpers import AbstractDatabaseTest
+from py_modules.time_tracking import TimeTracking
+
+CHECKSUM = "a3976a0553ba444ac96074ee2330a38a6b635e70a0c2a7ac2d0b568765ce2a0a"
+
+
+class TestGameSessions(AbstractDatabaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        DbMigration(db=self.database).migrate()
+        self.time_tracking = TimeTracking(Dao(self.database))
+        self.games = Games(Dao(self.database))
+        self.statistics = Statistics(Dao(self.database))
+
+    def _add_sessions(self, game_id: str, game_name: str, starts: list) -> None:
+        for start in starts:
+            self.time_tracking.add_time(
+                start.timestamp(),
+                (start + timedelta(minutes=30)).timestamp(),
+                game_id,
+                game_name,
+            )
+
+    def test_should_return_totals_and_last_session_without_history(self):
+        now = datetime(2023, 5, 1, 10, 0)
+        self._add_sessions("100", "Zelda BOTW", [now, now + timedelta(days=2)])
+        self._add_sessions("200", "Doom", [now + timedelta(days=1)])
+
+        result = self.statistics.per_game_overall_statistic_short()
+
+        self.assertEqual(
+            [
+                dataclasses.asdict(r)
+                for r in sorted(result, key=lambda r: r.game.id)
+            ],
+            [
+                {
+                    "game": {"id": "100", "name": "Zelda BOTW"},
+                    "total_time": 3600,
+                    "total_sessions": 2,
+                    "last_session": {
+                        "date": "2023-05-03T10:00:00",
+                        "duration": 1800,
+                        "migrated": None,
+                        "checksum": None,
+                    },
+                },
+                {
+                    "game": {"id": "200", "name": "Doom"},
+                    "total_time": 1800,
+                    "total_sessions": 1,
+                    "last_session": {
+                        "date": "2023-05-02T10:00:00",
+                        "duration": 1800,
+                        "migrated": None,
+                        "checksum": None,
+                    },
+                },
+            ],
+        )
+
+    def test_should_group_short_statistics_by_checksum(self):
+        now = datetime(2023, 5, 1, 10, 0)
+        self._add_sessions("100", "Zelda BOTW", [now])
+        self._add_sessions("200", "Zelda BOTW (Emulated)", [now + timedelta(days=1)])
+
+        for game_id in ("100", "200"):
+            self.games.save_game_checksum(
+                game_id, CHECKSUM, "SHA256", 16 * 1024 * 1024, None, None
+            )
+
+        result = self.statistics.per_game_overall_statistic_short()
+
+        self.assertEqual(len(result), 1)
+        self.assertEqual(result[0].game.id, "100")
+        self.assertEqual(result[0].total_time, 3600)
+        self.assertEqual(result[0].total_sessions, 2)
+        self.assertEqual(result[0].last_session.date, "2023-05-02T10:00:00")
+
+    def test_should_page_through_sessions_newest_first(self):
+        now = datetime(2023, 5, 1, 10, 0)
+        starts = [now + timedelta(hours=i) for i in range(5)]
+        self._add_sessions("100", "Zelda BOTW", starts)
+        self._add_sessions("200", "Doom", [now])
+
+        dates = []
+        cursor = None
+        pages = 0
+
+        while True:
+            page = self.statistics.get_game_sessions("100", cursor, 2)
+            dates.extend(s.date for s in page.sessions)
+            pages += 1
+
+            if page.next_cursor is None:
+                break
+
+            cursor = (page.next_cursor.date_time, page.next_cursor.id)
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(
+            dates, [s.isoformat() for s in sorted(starts, reverse=True)]
+        )
+
+    def test_should_not_skip_sessions_sharing_a_start_time(self):
+        now = datetime(2023, 5, 1, 10, 0)
+        self._add_sessions("100", "Zelda BOTW", [now, now, now])
+
+        first = self.statistics.get_game_sessions("100", None, 2)
+        second = self.statistics.get_game_sessions(
+            "100",
+            (first.next_cursor.date_time, first.next_cursor.id),
+            2,
+        )
+
+        self.assertEqual(len(first.sessions), 2)
+        self.assertEqual(len(second.sessions), 1)
+        self.assertIsNone(second.next_cursor)
+
+    def test_should_return_empty_page_for_unknown_game(self):
+        page = self.statistics.get_game_sessions("404", None, 10)
+
+        self.assertEqual(
+            dataclasses.asdict(page), {"sessions": [], "next_cursor": None}
+        )
+
+    def test_should_validate_game_sessions_request(self):
+        self.assertEqual(GetGameSessionsDTO.from_dict({"game_id": "100"}).limit, 50)
+
+        with self.assertRaises(ValueError):
+            GetGameSessionsDTO.from_dict({"game_id": "100", "limit": 501})
+
+        with self.assertRaises(ValueError):
+            GetGameSessionsDTO.from_dict({"game_id": "100", "cursor": {"id": 1}})
+
+        with self.assertRaises(ValueError):
+            GetGameSessionsDTO.from_dict({"limit": 10})
+
+        for invalid in (
+            {"limit": 0},
+            {"limit": -1},
+            {"limit": True},
+            {"limit": "10"},
+            {"cursor": {"date_time": 1, "id": 1}},
+            {"cursor": {"date_time": "2023-01-01T09:00:00", "id": "1"}},
+            {"cursor": {"date_time": "2023-01-01T09:00:00", "id": True}},
+            {"cursor": ["2023-01-01T09:00:00", 1]},
+        ):
+            with self.subTest(request=invalid), self.assertRaises(ValueError):
+                GetGameSessionsDTO.from_dict({"game_id": "100", **invalid})
+
+        dto = GetGameSessionsDTO.from_dict(
+            {"game_id": "100", "cursor": {"date_time": "2023-01-01T09:00:00", "id": 1}}
+        )
+
+        self.assertEqual(dto.cursor_key(), ("2023-01-01T09:00:00", 1))
+
+
+class TestDailyStatistics(AbstractDatabaseTest):
+    def setUp(self) -> None:
+        super().setUp()
+        DbMigration(db=self.database).migrate()
+        self.time_tracking = TimeTracking(Dao(self.database))
+        self.games = Games(Dao(self.database))
+        self.statistics = Statistics(Dao(self.database))
+
+    def _add_session(self, game_id: str, game_name: str, start: datetime) -> None:
+        self.time_tracking.add_time(
+            start.timestamp(),
+            (start + timedelta(minutes=30)).timestamp(),
+            game_id,
+            game_name,
+        )
+
+    def _save_checksum(self, game_id: str, checksum: str) -> None:
+        self.games.save_game_checksum(
+            game_id, checksum, "SHA256", 16 * 1024 * 1024, None, None
+        )
+
+    def test_should_merge_games_sharing_a_checksum_per_day_under_first_game(self):
+        day = datetime(2023, 5, 1)
+        self._add_session("300", "Zelda BOTW (Switch)", day.replace(hour=9))
+        self._add_session("200", "Zelda BOTW (Emulated)", day.replace(hour=11))
+        self._add_session("200", "Zelda BOTW (Emulated)", day.replace(hour=8))
+        self._add_session("100", "Zelda BOTW", day.replace(hour=10))
+        self._add_session("400", "Doom", day.replace(hour=12))
+        self._add_session("400", "Doom", day.replace(hour=7))
+        self._save_checksum("100", CHECKSUM)
+        self._save_checksum("200", CHECKSUM)
+        self._save_checksum("300", "other")
+
+        result = self.statistics.daily_statistics_for_period(day.date(), day.date())
+
+        day_statistics = result.data[0]
+        self.assertEqual(day_statistics.total, 6 * 1800)
+        self.assertEqual(
+            [
+                (
+                    g.game.id,
+                    g.total_time,
+                    [s.date[11:16] for s in g.sessions],
+                    g.last_session.date,
+                )
+                for g in day_statistics.games
+            ],
+            [
+                ("100", 3 * 1800, ["11:00", "10:00", "08:00"], "2023-05-01T10:00:00"),
+                ("300", 1800, ["09:00"], "2023-05-01T09:00:00"),
+                ("400", 2 * 1800, ["07:00", "12:00"], "2023-05-01T12:00:00"),
+            ],
+        )
+
+    def test_should_not_merge_games_linked_only_through_another_game(self):
+        day = datetime(2023, 5, 1)
+        self._add_session("100", "Zelda BOTW", day.replace(hour=10))
+        self._add_session("200", "Zelda BOTW (Emulated)", day.replace(hour=11))
+        self._add_session("300", "Zelda BOTW (Switch)", day.replace(hour=9))
+        # NOTE: 100 and 300 only share a checksum through 200
+        self._save_checksum("100", CHECKSUM)
+        self._save_checksum("200", CHECKSUM)
+        self._save_checksum("200", "other")
+        self._save_checksum("300", "other")
+
+        result = self.statistics.daily_statistics_for_period(day.date(), day.date())
+        by_game = self.statistics.daily_statistics_for_period(
+            day.date(), day.date(), "100"
+        )
+
+        self.assertEqual(
+            [(g.game.id, g.total_time) for g in result.data[0].games],
+            [("100", 2 * 1800), ("300", 1800)],
+        )
+        self.assertEqual(
+            [(g.game.id, g.total_time) for g in by_game.data[0].games],
+            [("100", 2 * 1800)],
+        )
+
+    def test_should_report_games_sharing_a_checksum_with_requested_game(self):
+        day = datetime(2023, 5, 1)
+        self._add_session("100", "Zelda BOTW", day.replace(hour=10))
+        self._add_session("200", "Another Zelda", day.replace(hour=11))
+        self._add_session("400", "Doom", day.replace(hour=12))
+        self._save_checksum("100", CHECKSUM)
+        self._save_checksum("200", CHECKSUM)
+
+        result = self.statistics.daily_statistics_for_period(
+            day.date(), day.date(), "100"
+        )
+
+        self.assertEqual(
+            [
+                (g.game.id, g.total_time, len(g.sessions))
+                for g in result.data[0].games
+            ],
+            [("200", 3600, 2)],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
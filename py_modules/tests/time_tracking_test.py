@@ -1,8 +1,12 @@
 import dataclasses
+import os
+import random
+import time
 import unittest
 from datetime import datetime, timedelta
 from py_modules.db.dao import Dao
 from py_modules.db.migration import DbMigration
+from py_modules.dto.time.add_time import AddTimeDTO
 from py_modules.statistics import Statistics
 from py_modules.tests.helpers import AbstractDatabaseTest
 from py_modules.time_tracking import TimeTracking
@@ -408,7 +412,7 @@ class TestPlayTime(AbstractDatabaseTest):
         )
 
         result = self.playtime_statistics.per_game_overall_statistic()
-        self.assertEqual(result[0]["total_time"], 3600 + 1800)
+        self.assertEqual(result[0].total_time, 3600 + 1800)
 
     def test_should_apply_manual_time_for_games(self):
         now = datetime(2025, 1, 1, 9, 0)
@@ -450,7 +454,7 @@ class TestPlayTime(AbstractDatabaseTest):
             return data
 
         self.assertEqual(
-            remove_date_fields(result),
+            remove_date_fields([dataclasses.asdict(r) for r in result]),
             [
                 {
                     "game": {"id": "101", "name": "Zelda BOTW"},
@@ -560,7 +564,7 @@ class TestPlayTime(AbstractDatabaseTest):
 
         self.maxDiff = None
         self.assertEqual(
-            result,
+            [dataclasses.asdict(r) for r in result],
             [
                 {
                     "game": {"id": "3393530879", "name": "Monster Hunter 4 Ultimate"},
@@ -868,5 +872,269 @@ class TestPlayTime(AbstractDatabaseTest):
             ],
         )
 
+    def test_should_save_bulk_intervals_like_single_intervals(self):
+        now = datetime(2024, 3, 1, 22, 30)
+        intervals = [
+            (now, now + timedelta(hours=2), "100", "Zelda BOTW"),
+            (now + timedelta(hours=3), now + timedelta(hours=4), "100", "Zelda BOTW"),
+            (now + timedelta(days=1), now + timedelta(days=1, minutes=5), "200", "DOOM"),
+        ]
+
+        self.time_tracking.add_time_bulk(
+            [
+                AddTimeDTO.from_dict(
+                    {
+                        "started_at": started_at.timestamp(),
+                        "ended_at": ended_at.timestamp(),
+                        "game_id": game_id,
+                        "game_name": game_name,
+                    }
+                )
+                for started_at, ended_at, game_id, game_name in intervals
+            ]
+        )
+        bulk_rows = self._dump_time_tables()
+
+        with self.database.transactional() as connection:
+            for table in ("play_time", "overall_time", "play_time_daily", "game_dict"):
+                connection.execute(f"DELETE FROM {table}")
+
+        for started_at, ended_at, game_id, game_name in intervals:
+            self.time_tracking.add_time(
+                started_at.timestamp(), ended_at.timestamp(), game_id, game_name
+            )
+
+        self.assertEqual(bulk_rows, self._dump_time_tables())
+        self.assertEqual(len(bulk_rows["play_time"]), 4)
+        self.assertEqual(
+            bulk_rows["play_time_daily"],
+            [
+                ("2024-03-01", "100", 5400, 1),
+                ("2024-03-02", "100", 5400, 2),
+                ("2024-03-02", "200", 300, 1),
+            ],
+        )
+
+    def test_should_save_bulk_intervals_in_single_transaction(self):
+        now = datetime(2024, 3, 1, 10, 0)
+        generation = self.dao.write_generation
+
+        self.time_tracking.add_time_bulk(
+            [
+                AddTimeDTO.from_dict(
+                    {
+                        "started_at": (now + timedelta(hours=i)).timestamp(),
+                        "ended_at": (now + timedelta(hours=i, minutes=30)).timestamp(),
+                        "game_id": str(i % 3),
+                        "game_name": f"Game {i % 3}",
+                    }
+                )
+                for i in range(10)
+            ]
+        )
+
+        self.assertEqual(self.dao.write_generation, generation + 1)
+        self.assertEqual(
+            sorted((g.game_id, g.time) for g in self.dao.fetch_overall_playtime()),
+            [("0", 4 * 1800), ("1", 3 * 1800), ("2", 3 * 1800)],
+        )
+
+    def test_should_ignore_empty_bulk(self):
+        generation = self.dao.write_generation
+
+        self.time_tracking.add_time_bulk([])
+
+        self.assertEqual(self.dao.write_generation, generation)
+
+    def _dump_time_tables(self):
+        with self.database.readonly() as connection:
+            return {
+                "play_time": connection.execute(
+                    """
+                    SELECT date_time, duration, game_id, migrated, started_at_epoch, day_key
+                    FROM play_time ORDER BY date_time, game_id
+                    """
+                ).fetchall(),
+                "overall_time": connection.execute(
+                    "SELECT game_id, duration FROM overall_time ORDER BY game_id"
+                ).fetchall(),
+                "play_time_daily": connection.execute(
+                    """
+                    SELECT date, game_id, duration, sessions
+                    FROM play_time_daily ORDER BY date, game_id
+                    """
+                ).fetchall(),
+                "game_dict": connection.execute(
+                    "SELECT game_id, name FROM game_dict ORDER BY game_id"
+                ).fetchall(),
+            }
+
+    def test_should_split_multi_day_session_into_one_row_per_day(self):
+        started_at = datetime(2024, 3, 1, 20, 0)
+        ended_at = datetime(2024, 3, 4, 2, 0)
+
+        self.time_tracking.add_time(
+            started_at.timestamp(), ended_at.timestamp(), "100", "Zelda BOTW"
+        )
+
+        with self.database.readonly() as connection:
+            rows = connection.execute(
+                """
+                SELECT date_time, duration FROM play_time ORDER BY date_time
+                """
+            ).fetchall()
+            daily = connection.execute(
+                "SELECT date, duration FROM play_time_daily ORDER BY date"
+            ).fetchall()
+
+        self.assertEqual(
+            rows,
+            [
+                ("2024-03-01T20:00:00", 4 * 3600),
+                ("2024-03-02T00:00:00", 24 * 3600),
+                ("2024-03-03T00:00:00", 24 * 3600),
+                ("2024-03-04T00:00:00", 2 * 3600),
+            ],
+        )
+        self.assertEqual(
+            daily,
+            [
+                ("2024-03-01", 4 * 3600),
+                ("2024-03-02", 24 * 3600),
+                ("2024-03-03", 24 * 3600),
+                ("2024-03-04", 2 * 3600),
+            ],
+        )
+        self.assertEqual(self.dao.fetch_overall_playtime()[0].time, 54 * 3600)
+
+
+class TestIntervalSplitting(unittest.TestCase):
+    """
+    Property-style checks of `TimeTracking._split_interval` over seeded random
+    intervals, in time zones with and without DST.
+    """
+
+    TIME_ZONES = ["UTC", "Europe/Berlin", "America/New_York", "Australia/Sydney"]
+    CASES_PER_TIME_ZONE = 300
+    SEED = 20240331
+
+    def setUp(self) -> None:
+        self.previous_time_zone = os.environ.get("TZ")
+        self.time_tracking = TimeTracking(None)
+
+    def tearDown(self) -> None:
+        if self.previous_time_zone is None:
+            os.environ.pop("TZ", None)
+        else:
+            os.environ["TZ"] = self.previous_time_zone
+
+        time.tzset()
+
+    def _use_time_zone(self, time_zone: str) -> None:
+        os.environ["TZ"] = time_zone
+        time.tzset()
+
+    def _random_intervals(self, random_generator: random.Random):
+        # NOTE: Half of the intervals start close to a DST change
+        dst_changes = [
+            datetime(2024, 3, 10, 1, 0),
+            datetime(2024, 3, 31, 1, 0),
+            datetime(2024, 4, 7, 1, 0),
+            datetime(2024, 10, 6, 1, 0),
+            datetime(2024, 10, 27, 1, 0),
+            datetime(2024, 11, 3, 0, 0),
+        ]
+
+        for index in range(self.CASES_PER_TIME_ZONE):
+            if index % 2:
+                anchor = random_generator.choice(dst_changes)
+                started_at = (
+                    anchor - timedelta(hours=random_generator.uniform(0, 72))
+                ).timestamp()
+            else:
+                started_at = random_generator.uniform(
+                    datetime(2019, 1, 1).timestamp(), datetime(2026, 1, 1).timestamp()
+                )
+
+            duration = random_generator.choice(
+                [
+                    random_generator.uniform(0, 3600),
+                    random_generator.uniform(0, 3 * 24 * 3600),
+                    random_generator.uniform(0, 10 * 24 * 3600),
+                    float(random_generator.randint(0, 5 * 24 * 3600)),
+                ]
+            )
+
+            yield started_at, started_at + duration
+
+    def test_pieces_should_sum_up_to_original_duration(self):
+        random_generator = random.Random(self.SEED)
+
+        for time_zone in self.TIME_ZONES:
+            self._use_time_zone(time_zone)
+
+            for started_at, ended_at in self._random_intervals(random_generator):
+                with self.subTest(time_zone=time_zone, interval=(started_at, ended_at)):
+                    pieces = self.time_tracking._split_interval(
+                        started_at, ended_at, "1"
+                    )
+
+                    self.assertEqual(
+                        sum(duration for _, duration, _ in pieces),
+                        int(ended_at - started_at),
+                    )
+                    self.assertTrue(all(duration >= 0 for _, duration, _ in pieces))
+
+    def test_every_piece_should_cover_a_single_calendar_day(self):
+        random_generator = random.Random(self.SEED + 1)
+
+        for time_zone in self.TIME_ZONES:
+            self._use_time_zone(time_zone)
+
+            for started_at, ended_at in self._random_intervals(random_generator):
+                with self.subTest(time_zone=time_zone, interval=(started_at, ended_at)):
+                    pieces = self.time_tracking._split_interval(
+                        started_at, ended_at, "1"
+                    )
+                    days = [piece_start.date() for piece_start, _, _ in pieces]
+
+                    self.assertEqual(pieces[0][0], datetime.fromtimestamp(started_at))
+                    self.assertEqual(
+                        days,
+                        [days[0] + timedelta(days=i) for i in range(len(days))],
+                    )
+                    self.assertEqual(
+                        days[-1],
+                        datetime.fromtimestamp(max(started_at, ended_at - 1e-6)).date(),
+                    )
+
+                    for piece_start, _, _ in pieces[1:]:
+                        self.assertEqual(piece_start.time(), datetime.min.time())
+
+                    for piece, next_piece in zip(pieces, pieces[1:]):
+                        piece_start, duration, _ = piece
+                        self.assertLessEqual(
+                            piece_start.timestamp() + duration,
+                            next_piece[0].timestamp(),
+                        )
+
+    def test_should_follow_dst_day_length(self):
+        self._use_time_zone("Europe/Berlin")
+
+        started_at = datetime(2024, 3, 30, 12, 0).timestamp()
+        ended_at = datetime(2024, 4, 1, 12, 0).timestamp()
+
+        pieces = self.time_tracking._split_interval(started_at, ended_at, "1")
+
+        self.assertEqual(
+            [(start.isoformat(), duration) for start, duration, _ in pieces],
+            [
+                ("2024-03-30T12:00:00", 12 * 3600),
+                ("2024-03-31T00:00:00", 23 * 3600),
+                ("2024-04-01T00:00:00", 12 * 3600),
+            ],
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,11 @@
 from datetime import datetime
 import logging
+from typing import Dict, List, Tuple
 from py_modules.db.dao import Dao
+from py_modules.dto.time.add_time import AddTimeDTO
 from py_modules.helpers import end_of_day
 from py_modules.schemas.request import ApplyManualTimeCorrectionDTO
+from py_modules.session_journal import SessionJournal
 
 
 DATE_FORMAT = "%Y-%m-%d"
@@ -11,34 +14,127 @@ logger = logging.getLogger()
 
 class TimeTracking:
     dao: Dao
+    journal: SessionJournal | None
 
-    def __init__(self, dao: Dao) -> None:
+    def __init__(self, dao: Dao, journal: SessionJournal | None = None) -> None:
         self.dao = dao
+        self.journal = journal
 
     def add_time(self, started_at: int, ended_at: int, game_id: str, game_name: str):
-        self.dao.save_game_dict(game_id, game_name)
-        day_end_for_start_at = end_of_day(
-            datetime.fromtimestamp(started_at)
-        ).timestamp()
+        self.dao.save_play_time_bulk(
+            {game_id: game_name}, self._split_interval(started_at, ended_at, game_id)
+        )
 
-        intervals = []
+    def add_time_bulk(self, intervals: List[AddTimeDTO]):
+        """
+        Saves every interval in a single transaction. Used to flush intervals
+        queued by the frontend, e.g. after suspend/resume.
+        """
+        game_names: Dict[str, str] = {}
+        play_times: List[Tuple[datetime, int, str]] = []
 
-        if started_at < day_end_for_start_at and ended_at > day_end_for_start_at:
-            intervals.append((started_at, day_end_for_start_at + 1, game_id, game_name))
-            intervals.append(
-                (int(day_end_for_start_at + 1), ended_at, game_id, game_name)
+        for interval in intervals:
+            game_names[interval.game_id] = interval.game_name
+            play_times.extend(
+                self._split_interval(
+                    interval.started_at, interval.ended_at, interval.game_id
+                )
             )
-        else:
-            intervals.append((started_at, ended_at, game_id, game_name))
 
-        for interval in intervals:
-            (i_started_at, i_ended_at, i_game_id, _) = interval
+        if not play_times:
+            return
+
+        self.dao.save_play_time_bulk(game_names, play_times)
+
+    def start_session(self, game_id: str, game_name: str, started_at: float) -> bool:
+        return self._require_journal().start(game_id, game_name, started_at)
+
+    def heartbeat_session(self, game_id: str, at: float) -> bool:
+        return self._require_journal().heartbeat(game_id, at)
+
+    def end_session(self, game_id: str, ended_at: float) -> bool:
+        journal = self._require_journal()
+        session = journal.get(game_id)
+
+        if session is None:
+            return False
+
+        self.add_time(session.started_at, ended_at, game_id, session.game_name)
+        journal.end(game_id)
+
+        return True
+
+    def recover_sessions(self) -> int:
+        """
+        Saves sessions a previous run never ended, up to their last heartbeat.
+        Returns the number of recovered sessions.
+        """
+        journal = self._require_journal()
+        # NOTE: A crash right after `end_session` saved the time leaves the
+        # session in the journal, its first piece is then already stored
+        sessions = [
+            session
+            for session in journal.unfinished()
+            if not self.dao.has_play_time_started_at(
+                session.game_id, datetime.fromtimestamp(session.started_at)
+            )
+        ]
+        play_times: List[Tuple[datetime, int, str]] = []
+
+        for session in sessions:
+            if session.last_seen_at > session.started_at:
+                play_times.extend(
+                    self._split_interval(
+                        session.started_at, session.last_seen_at, session.game_id
+                    )
+                )
+
+        if play_times:
+            self.dao.save_play_time_bulk(
+                {session.game_id: session.game_name for session in sessions},
+                play_times,
+            )
+
+        journal.reset()
+
+        return len(sessions)
+
+    def _require_journal(self) -> SessionJournal:
+        if self.journal is None:
+            raise ValueError("Live sessions require a session journal")
+
+        return self.journal
+
+    def _split_interval(
+        self, started_at: float, ended_at: float, game_id: str
+    ) -> List[Tuple[datetime, int, str]]:
+        """
+        Splits the interval at every local midnight, so each piece belongs to
+        exactly one calendar day. Midnights come from `end_of_day`, so days
+        with a DST change are 23 or 25 hours long.
+
+        Durations are taken relative to `started_at` and truncated once, so
+        the pieces always sum up to `int(ended_at - started_at)`.
+        """
+        boundaries = [started_at]
+        next_midnight = end_of_day(datetime.fromtimestamp(started_at)).timestamp() + 1
+
+        while ended_at > next_midnight:
+            boundaries.append(next_midnight)
+            next_midnight = (
+                end_of_day(datetime.fromtimestamp(next_midnight)).timestamp() + 1
+            )
 
-            length = i_ended_at - i_started_at
+        boundaries.append(ended_at)
 
-            self.dao.save_play_time(
-                datetime.fromtimestamp(i_started_at), int(length), i_game_id
+        return [
+            (
+                datetime.fromtimestamp(piece_started_at),
+                int(piece_ended_at - started_at) - int(piece_started_at - started_at),
+                game_id,
             )
+            for piece_started_at, piece_ended_at in zip(boundaries, boundaries[1:])
+        ]
 
     def apply_manual_time_for_games(
         self, list_of_game_stats: ApplyManualTimeCorrectionDTO, source: str
@@ -4,14 +4,25 @@ export const APP_TYPE = {
 
 export const BACK_END_API = {
 	ADD_TIME: "add_time",
+	ADD_TIME_BULK: "add_time_bulk",
+	SESSION_START: "session_start",
+	SESSION_HEARTBEAT: "session_heartbeat",
+	SESSION_END: "session_end",
 	DAILY_STATISTICS_FOR_PERIOD: "daily_statistics_for_period",
 	PER_GAME_OVERALL_STATISTICS: "per_game_overall_statistics",
 	FETCH_PLAYTIME_INFORMATION: "fetch_playtime_information",
 	PER_GAME_OVERALL_STATISTICS_SHORT: "per_game_overall_statistics_short",
+	GET_GAME_SESSIONS: "get_game_sessions",
 	APPLY_MANUAL_TIME_CORRECTION: "apply_manual_time_correction",
 	GET_GAME: "get_game",
 	HAS_MIN_REQUIRED_PYTHON_VERSION: "has_min_required_python_version",
 	GET_FILE_SHA256: "get_file_sha256",
+	GET_FILE_DIGEST: "get_file_digest",
+	GET_FILE_FINGERPRINT: "get_file_fingerprint",
+	GET_FILES_SHA256_BULK: "get_files_sha256_bulk",
+	CANCEL_FILES_SHA256_BULK: "cancel_files_sha256_bulk",
+	SCAN_GAME_FILES: "scan_game_files",
+	CANCEL_GAME_FILES_SCAN: "cancel_game_files_scan",
 	GET_GAMES_DICTIONARY: "get_games_dictionary",
 	SAVE_GAME_CHECKSUM: "save_game_checksum",
 	REMOVE_GAME_CHECKSUM: "remove_game_checksum",
@@ -21,6 +32,7 @@ export const BACK_END_API = {
 	SAVE_GAME_CHECKSUM_BULK: "save_game_checksum_bulk",
 	REMOVE_ALL_CHECKSUMS: "remove_all_checksums",
 	LINK_GAME_TO_GAME_WITH_CHECKSUM: "link_game_to_game_with_checksum",
+	GET_DB_METRICS: "get_db_metrics",
 	GET_DECKY_HOME: "get_decky_home",
 } as const;
 